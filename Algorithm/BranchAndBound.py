@@ -0,0 +1,292 @@
+import time
+
+import numpy as np
+
+from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
+from Algorithm.GRASP import GRASP
+from SolutionResult import SolutionResult
+
+
+def _feasible_rows(levels, P, capacity=1.0):
+    """Todas las filas (dedicación por proyecto) con niveles válidos y suma <= capacidad."""
+    rows = []
+
+    def extend(prefix, remaining):
+        if len(prefix) == P:
+            rows.append(prefix)
+            return
+        for level in levels:
+            if level <= remaining + 1e-9:
+                extend(prefix + [level], remaining - level)
+
+    extend([], capacity)
+    return np.array(rows, dtype=float)
+
+
+class AffinityBound:
+    """
+    Cota superior de la eficiencia global para asignaciones parciales.
+
+    Las personas se fijan en orden de bloques de habilidad ('order'); con las primeras
+    d fijas y el resto libre, para cada proyecto l:
+
+        x^T S x = xf^T S xf + Σ_{i libre} x_i [2 (S xf)_i + (S xu)_i]
+
+    y, como cada habilidad k debe aportar exactamente rem_kl unidades libres,
+    (S xu)_i <= max(S_ii, 0) + Σ_k' (suma de los rem_k'l mayores S_ij con j libre en k'),
+    y Σ_{i en k} x_i h_i <= suma de los rem_kl mayores h_i (relajación greedy/fraccional).
+    Las sumas de los mejores S_ij se guardan por profundidad (prefijos ordenados) y
+    se calculan la primera vez que se pide cada profundidad: la cota raíz solo
+    construye la de profundidad 0, y el B&B deriva la de d + 1 desde la de d
+    rehaciendo únicamente el grupo de la persona que se fijó.
+    """
+    def __init__(self, problem):
+        self.problem = problem
+        S = problem.S
+        H = problem.H
+
+        # Bloques de habilidad; dentro de cada uno, los intercambiables quedan contiguos
+        self.order = np.lexsort((np.arange(H), problem.class_of_person, problem.skill_of_person)).astype(int)
+        self.group_of = problem.skill_of_person
+        max_group = max((len(g) for g in problem.skill_groups), default=0)
+        self.width = max_group + 2
+
+        # prefix[d][i, k', m] = suma de los m mayores S_ij con j libre (profundidad >= d) en k', j != i
+        # npos[d][i, k'] = cuántos de esos valores son positivos (pico de la suma)
+        self.prefix = {}
+        self.npos = {}
+
+        self.diag = np.maximum(np.diag(S), 0.0) if H else np.zeros(0)
+        self.T2 = problem.total_req_per_project ** 2
+        self.max_S = max(float(S.max()), 0.0) if H else 0.0
+
+    def _group_table(self, free, k):
+        """Prefijos y conteo de positivos de los S_ij con j libre en el grupo k: (H, W), (H,)."""
+        prefix = np.zeros((self.problem.H, self.width))
+        npos = np.zeros(self.problem.H, dtype=int)
+        members = free[self.group_of[free] == k]
+        if len(members) == 0:
+            return prefix, npos
+        values = self.problem.S[:, members].copy()
+        values[members, np.arange(len(members))] = -np.inf  # j != i
+        values = -np.sort(-values, axis=1)
+        npos[:] = (values > 0).sum(axis=1)
+        values[np.isinf(values)] = 0.0  # La propia persona ocupa el último lugar
+        cumulative = np.cumsum(values, axis=1)
+        prefix[:, 1:len(members) + 1] = cumulative
+        prefix[:, len(members) + 1:] = cumulative[:, -1:]
+        return prefix, npos
+
+    def tables(self, depth):
+        """Tablas (prefix, npos) de la profundidad 'depth', construidas bajo demanda."""
+        if depth not in self.prefix:
+            free = self.order[depth:]
+            if depth > 0 and depth - 1 in self.prefix:
+                # Solo cambia el grupo de la persona fijada en depth - 1
+                prefix, npos = self.prefix[depth - 1].copy(), self.npos[depth - 1].copy()
+                groups = [self.group_of[self.order[depth - 1]]]
+            else:
+                prefix = np.zeros((self.problem.H, self.problem.K, self.width))
+                npos = np.zeros((self.problem.H, self.problem.K), dtype=int)
+                groups = range(self.problem.K)
+            for k in groups:
+                prefix[:, k], npos[:, k] = self._group_table(free, k)
+            self.prefix[depth], self.npos[depth] = prefix, npos
+        return self.prefix[depth], self.npos[depth]
+
+    @staticmethod
+    def _topsum(prefix, n):
+        """
+        Suma fraccional de los n mayores valores dado su prefijo acumulado.
+        prefix: (..., W) con W-2 valores; n: con la forma de prefix[..., 0].
+        """
+        n = np.clip(n, 0, prefix.shape[-1] - 2)
+        f = np.floor(n + 1e-9).astype(int)
+        flat = prefix.reshape(-1, prefix.shape[-1])
+        rows = np.arange(flat.shape[0])
+        low = flat[rows, f.reshape(-1)]
+        high = flat[rows, f.reshape(-1) + 1]
+        return (low + (n.reshape(-1) - f.reshape(-1)) * (high - low)).reshape(n.shape)
+
+    def project_bounds(self, depth, alloc, SA, rem):
+        """Cota de x_l^T S x_l para cada proyecto (rem: requerimiento libre K x P)."""
+        fixed = (alloc * SA).sum(axis=0)
+        free = self.order[depth:]
+        if len(free) == 0:
+            return fixed
+
+        P = self.problem.P
+        prefix, npos = self.tables(depth)
+        prefix = prefix[free]                      # (F, K, W)
+        npos = npos[free]                          # (F, K)
+        own = self.group_of[free]
+        F = len(free)
+
+        # Unidades que aporta cada grupo k' a la vecindad de i, por proyecto: (F, K, P)
+        n = np.broadcast_to(rem[None, :, :], (F, self.problem.K, P)).copy()
+        # Su propio grupo aporta rem - x_i ∈ [rem - 1, rem]: tomar el máximo del intervalo
+        own_rem = rem[own]                                                      # (F, P)
+        n[np.arange(F), own] = np.clip(npos[np.arange(F), own][:, None],
+                                       np.maximum(own_rem - 1, 0), own_rem)
+        partners = self._topsum(np.broadcast_to(prefix[:, :, None, :], n.shape + (self.width,)), n)
+        h = 2 * SA[free] + self.diag[free][:, None] + partners.sum(axis=1)     # (F, P)
+
+        bounds = fixed.copy()
+        for k in range(self.problem.K):
+            values = h[own == k]
+            if len(values) == 0:
+                continue
+            values = -np.sort(-values, axis=0)                                 # (n_k, P)
+            cumulative = np.vstack([np.zeros((1, P)), np.cumsum(values, axis=0), values.sum(axis=0)[None]])
+            bounds += self._topsum(cumulative.T, rem[k])
+        return bounds
+
+    def efficiency_bound(self, depth, alloc, SA, rem):
+        """Cota superior de la eficiencia global Σ w_l e_l."""
+        Q = np.minimum(self.project_bounds(depth, alloc, SA, rem), self.max_S * self.T2)
+        e = np.where(self.T2 > 1e-12, 0.5 * (1 + Q / np.where(self.T2 > 1e-12, self.T2, 1.0)), 0.5)
+        return float(self.problem.w @ e)
+
+    def root_bound(self):
+        """Cota de la instancia completa (nada fijo)."""
+        p = self.problem
+        return self.efficiency_bound(0, np.zeros((p.H, p.P)), np.zeros((p.H, p.P)), p.R.astype(float))
+
+
+def efficiency_upper_bound(problem) -> float:
+    """
+    Cota superior de la eficiencia óptima de 'problem'. Una heurística que la
+    alcanza tiene un óptimo probado y puede detenerse.
+    """
+    return AffinityBound(problem).root_bound()
+
+
+class BranchAndBound(MTFP_BaseSolver):
+    """
+    Solver exacto para instancias pequeñas: ramifica persona a persona dentro de
+    cada bloque de habilidad (cada rama fija la fila completa de dedicaciones de
+    una persona) y poda con AffinityBound. Las ramas que no pueden cubrir el
+    requerimiento restante de su habilidad se descartan sin evaluar.
+
+    Simetrías: dentro de una clase de personas intercambiables (contiguas en el
+    orden) la fila de cada una debe ser lexicográficamente <= la de la anterior,
+    así se explora una sola asignación por clase de permutaciones equivalentes.
+
+    Con time_limit, deadline/stop_check o cancel(gen), al detenerse retorna el
+    incumbente y la brecha probada (cota - incumbente) / cota, donde la cota es la
+    mayor de los nodos abiertos (o la cota raíz si no se llegó a ramificar).
+    """
+    def iter_solve(self, time_limit=60.0, initial_solution=None, include_allocation=False, verbose=True):
+        start_time = time.time()
+        problem = self.problem
+        bound = AffinityBound(problem)
+        rows = _feasible_rows(problem.levels, problem.P)
+        S = problem.S
+
+        # Personas restantes del mismo grupo tras cada profundidad (para podar por factibilidad)
+        order = bound.order
+        left_in_group = np.array([np.sum(problem.skill_of_person[order[d + 1:]] == problem.skill_of_person[order[d]])
+                                  for d in range(problem.H)], dtype=int)
+        # La persona anterior en el orden es de su misma clase de simetría
+        same_class_as_prev = np.array([d > 0 and problem.class_of_person[order[d]] >= 0
+                                       and problem.class_of_person[order[d]] == problem.class_of_person[order[d - 1]]
+                                       for d in range(problem.H)], dtype=bool)
+
+        # Cota raíz antes del primer evento: una cancelación temprana reporta esa brecha
+        root_alloc = np.zeros((problem.H, problem.P))
+        root_rem = problem.R.astype(float)
+        root_bound = bound.efficiency_bound(0, root_alloc, root_alloc, root_rem)
+
+        # Incumbente inicial: el provisto o una corrida corta de GRASP (con el mismo plazo)
+        if initial_solution is None:
+            grasp = GRASP(problem, seed=self.rng.integers(2**31))
+            grasp.deadline, grasp.stop_check = self.deadline, self.stop_check
+            initial_solution = grasp.solve(n_constructions=20, ls_max_iterations=200, verbose=False).X
+        best_X, best_eff = None, -np.inf
+        if problem.is_feasible(initial_solution):
+            best_X, best_eff = initial_solution.copy(), self._get_efficiency_fast(initial_solution)
+            if (yield self._improvement_event(start_time, 0, best_eff, best_X, include_allocation)):
+                return self._result(best_X, best_eff, max(best_eff, root_bound), 0, False, start_time)
+
+        if verbose:
+            print(f"\n[B&B] Incumbente inicial: {best_eff:.4f}, cota raíz: {root_bound:.4f}")
+
+        # Nodo: (cota, profundidad, asignación, S @ asignación, requerimiento libre, índice de la última fila)
+        stack = [(root_bound, 0, root_alloc, root_alloc.copy(), root_rem, len(rows))]
+        nodes = 0
+        history = [best_eff]
+        # Detenido antes de agotar el árbol (tiempo, deadline/stop_check o cancelación):
+        # la cota pasa a ser la del nodo en curso y los nodos abiertos
+        stopped = False
+        node_bound = -np.inf
+
+        while stack:
+            if (time_limit is not None and time.time() - start_time >= time_limit) or self._past_deadline():
+                stopped = True
+                node_bound = -np.inf
+                break
+
+            node_bound, depth, alloc, SA, rem, last_row = stack.pop()
+            if node_bound <= best_eff + 1e-12:
+                continue
+            nodes += 1
+
+            if depth == problem.H:
+                eff = bound.efficiency_bound(depth, alloc, SA, rem)  # Exacta: no quedan libres
+                if eff > best_eff:
+                    best_X, best_eff = self._encode(alloc), eff
+                    history.append(best_eff)
+                    if verbose: print(f"[B&B] Nodo {nodes}: Nuevo récord = {best_eff:.4f}")
+                    if (yield self._improvement_event(start_time, nodes, best_eff, best_X, include_allocation)):
+                        stopped = True
+                        break
+                continue
+
+            person = order[depth]
+            k = problem.skill_of_person[person]
+            left = left_in_group[depth]
+
+            # Filas compatibles con el requerimiento restante de su habilidad
+            # (rows está en orden lexicográfico: romper simetría es acotar el índice)
+            limit = last_row + 1 if same_class_as_prev[depth] else len(rows)
+            remaining = rem[k] - rows[:limit]
+            ok = (np.all(remaining >= -1e-9, axis=1) & (remaining.sum(axis=1) <= left + 1e-9)
+                  & np.all(remaining <= left + 1e-9, axis=1))
+
+            children = []
+            for row_idx in np.flatnonzero(ok):
+                row = rows[row_idx]
+                child_alloc = alloc.copy()
+                child_alloc[person] = row
+                child_SA = SA + np.outer(S[:, person], row)
+                child_rem = rem.copy()
+                child_rem[k] -= row
+                child_bound = bound.efficiency_bound(depth + 1, child_alloc, child_SA, child_rem)
+                if child_bound > best_eff + 1e-12:
+                    children.append((child_bound, depth + 1, child_alloc, child_SA, child_rem, row_idx))
+
+            # Mejor hijo al tope de la pila (búsqueda en profundidad, primero el más prometedor)
+            children.sort(key=lambda c: c[0])
+            stack.extend(children)
+
+        open_bound = max([node_bound] + [n[0] for n in stack]) if stopped else -np.inf
+        upper = max(best_eff, open_bound)
+        return self._result(best_X, best_eff, upper, nodes, not stopped, start_time, history, verbose)
+
+    def _result(self, best_X, best_eff, upper, nodes, proven, start_time, history=None, verbose=False):
+        execution_time = time.time() - start_time
+        gap = (upper - best_eff) / upper if best_X is not None and upper > 0 else np.inf
+        if verbose:
+            status = "óptimo probado" if proven else f"brecha probada {gap * 100:.2f}%"
+            print(f"[B&B] Fin. Eficiencia: {best_eff:.4f}, cota: {upper:.4f} ({status}), "
+                  f"nodos: {nodes}, Tiempo: {execution_time:.2f}s")
+
+        if best_X is None:
+            raise ValueError("B&B no encontró una solución factible para la instancia")
+        final_eval = self.problem.evaluate_solution(best_X)
+        return SolutionResult.from_eval(
+            X=best_X, eval_result=final_eval, method="Branch and Bound",
+            history=history or [best_eff], execution_time=execution_time,
+            extra={"upper_bound": float(upper), "gap": float(gap), "proven_optimal": bool(proven),
+                   "nodes": nodes, "nfe": self.total_nfe()}
+        )
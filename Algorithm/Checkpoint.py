@@ -0,0 +1,49 @@
+import os
+import time
+import pickle
+
+
+def save_checkpoint(path, state):
+    """
+    Guarda el estado en disco de forma atómica (archivo temporal + rename),
+    así un proceso matado a mitad de escritura nunca deja un checkpoint corrupto.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """Retorna el estado guardado en 'path', o None si no existe."""
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def remove_checkpoint(path):
+    """Elimina el checkpoint al terminar la corrida (una nueva corrida parte de cero)."""
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+
+class CheckpointWriter:
+    """
+    Escribe snapshots periódicos: como máximo uno cada 'interval' segundos,
+    lo que acota el overhead de los checkpoints independientemente del tamaño
+    de la instancia o de la velocidad de las iteraciones.
+    """
+    def __init__(self, path, interval=60.0):
+        self.path = path
+        self.interval = interval
+        self.last_save = time.time()
+        self.n_saved = 0
+
+    def due(self) -> bool:
+        return time.time() - self.last_save >= self.interval
+
+    def save(self, state):
+        save_checkpoint(self.path, state)
+        self.last_save = time.time()
+        self.n_saved += 1
@@ -0,0 +1,215 @@
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Algorithm.MTFP import MTFP
+from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
+from Algorithm.LS import LS
+from Algorithm.TabuSearch import TabuSearch
+from Algorithm.VNS import VNS
+from SolutionResult import SolutionResult
+
+
+BLOCK_SOLVERS = {
+    "LS": LS,
+    "Tabu": TabuSearch,
+    "VNS": VNS,
+}
+
+
+def partition_instance(problem, n_blocks):
+    """
+    Particiona proyectos y personas en 'n_blocks' bloques.
+
+    1. Proyectos: reparto balanceado por requerimiento total (LPT greedy).
+    2. Cuotas: cada bloque recibe, por habilidad, al menos ceil(demanda) personas;
+       las personas sobrantes se reparten en proporción a la demanda.
+    3. Personas (comunidades del grafo S): en orden de grado positivo descendente,
+       cada persona va al bloque con cuota libre con el que tiene mayor afinidad
+       acumulada (S @ membresía, actualizado incrementalmente).
+
+    Retorna (project_blocks, people_blocks): listas de arrays de índices.
+    """
+    n_blocks = max(1, min(n_blocks, problem.P))
+
+    # --- 1. Proyectos ---
+    order = np.argsort(-problem.total_req_per_project, kind="stable")
+    load = np.zeros(n_blocks)
+    project_of_block = [[] for _ in range(n_blocks)]
+    for l in order:
+        b = int(np.argmin(load))
+        project_of_block[b].append(l)
+        load[b] += problem.total_req_per_project[l]
+    project_blocks = [np.array(sorted(p), dtype=int) for p in project_of_block]
+
+    # --- 2. Cuotas por (bloque, habilidad) ---
+    demand = np.array([problem.R[:, projects].sum(axis=1) for projects in project_blocks])  # (B, K)
+    quota = np.zeros((n_blocks, problem.K), dtype=int)
+    for k in range(problem.K):
+        n_k = len(problem.skill_groups[k])
+        base = np.ceil(demand[:, k] - 1e-9).astype(int)
+        if base.sum() > n_k:
+            # No alcanza: reparto proporcional (la reparación global completará)
+            base = np.floor(demand[:, k] * n_k / demand[:, k].sum()).astype(int)
+        spare = n_k - base.sum()
+        weights = demand[:, k] if demand[:, k].sum() > 0 else np.ones(n_blocks)
+        extra = np.floor(spare * weights / weights.sum()).astype(int)
+        remainder = spare - extra.sum()
+        extra[np.argsort(-(spare * weights / weights.sum() - extra), kind="stable")[:remainder]] += 1
+        quota[:, k] = base + extra
+
+    # --- 3. Personas por afinidad ---
+    positive_degree = (problem.S > 0).sum(axis=1)
+    affinity = np.zeros((problem.H, n_blocks))  # S @ membresía de cada bloque
+    people_of_block = [[] for _ in range(n_blocks)]
+    remaining = quota.astype(float)
+
+    for i in np.argsort(-positive_degree, kind="stable"):
+        k = problem.skill_of_person[i]
+        open_blocks = remaining[:, k] > 0
+        # Desempate: preferir el bloque con mayor fracción de cuota libre
+        score = affinity[i] + 1e-3 * remaining[:, k] / np.maximum(quota[:, k], 1)
+        score[~open_blocks] = -np.inf
+        b = int(np.argmax(score))
+        people_of_block[b].append(i)
+        remaining[b, k] -= 1
+        affinity[:, b] += problem.S[:, i]
+
+    people_blocks = [np.array(sorted(p), dtype=int) for p in people_of_block]
+    return project_blocks, people_blocks
+
+
+def build_subproblem(problem, people, projects):
+    """Sub-instancia MTFP restringida a un bloque de personas y proyectos."""
+    return MTFP(
+        n_people=len(people),
+        n_projects=len(projects),
+        n_skills=problem.K,
+        affinity_matrix=problem.S[np.ix_(people, people)],
+        requirements=problem.R[:, projects],
+        skill_of_person=problem.skill_of_person[people],
+        project_weights=problem.w[projects],
+        dedication_levels=problem.levels
+    )
+
+
+def _solve_block(task):
+    """Trabajador: resuelve un subproblema con uno de los solvers existentes."""
+    block_id, subproblem, algo_type, params, seed = task
+    start = time.time()
+    solver = BLOCK_SOLVERS[algo_type](subproblem, seed=seed)
+    result = solver.solve(verbose=False, **params)
+    return block_id, result.X, float(result.F), result.feasible, time.time() - start
+
+
+def run_decomposition(problem, n_blocks=None, block_size=200, algo_type="LS", algo_params=None,
+                      n_workers=None, polish_iterations=0, seed=42, verbose=True):
+    """
+    Solver por descomposición para instancias muy grandes:
+    particiona (partition_instance), resuelve los bloques en paralelo con LS/Tabu/VNS,
+    une las soluciones y repara en la frontera las habilidades cuyos
+    requerimientos quedaron sin cumplir.
+
+    polish_iterations > 0 agrega una LS corta sobre la instancia completa tras la unión.
+    """
+    if algo_type not in BLOCK_SOLVERS:
+        raise ValueError(f"Algoritmo no soportado '{algo_type}'. Opciones: {list(BLOCK_SOLVERS)}")
+    algo_params = algo_params or {}
+    if n_blocks is None:
+        n_blocks = max(1, int(round(problem.H / block_size)))
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+
+    start_time = time.time()
+
+    # 1. Partición
+    project_blocks, people_blocks = partition_instance(problem, n_blocks)
+    partition_time = time.time() - start_time
+    if verbose:
+        sizes = [f"{len(pe)}x{len(pr)}" for pe, pr in zip(people_blocks, project_blocks)]
+        print(f"\n[Decomposition] {len(project_blocks)} bloques (personas x proyectos): {sizes}")
+
+    # 2. Resolver subproblemas en paralelo
+    block_seeds = np.random.SeedSequence(seed).generate_state(len(project_blocks))
+    tasks = [
+        (b, build_subproblem(problem, people_blocks[b], project_blocks[b]), algo_type, algo_params, int(block_seeds[b]))
+        for b in range(len(project_blocks))
+    ]
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+        block_results = sorted(executor.map(_solve_block, tasks), key=lambda r: r[0])
+
+    # 3. Unir: cada bloque escribe su sub-matriz en la asignación global
+    alloc = np.zeros((problem.H, problem.P), dtype=int)
+    for b, X_sub, eff, feasible, elapsed in block_results:
+        sub_alloc = X_sub.reshape(len(people_blocks[b]), len(project_blocks[b]))
+        alloc[np.ix_(people_blocks[b], project_blocks[b])] = sub_alloc
+        if verbose:
+            print(f"[Decomposition] Bloque {b}: eficiencia {eff:.4f}, factible={feasible}, {elapsed:.2f}s")
+    X = alloc.reshape(-1)
+
+    # 4. Reparación de frontera: solo las habilidades con requerimientos incumplidos
+    repair = MTFP_BaseSolver(problem, seed=seed)
+    levels_alloc = problem.get_allocation_matrix(X)
+    delivered = np.array([levels_alloc[group].sum(axis=0) for group in problem.skill_groups])
+    broken_skills = np.where(np.any(np.abs(delivered - problem.R) > 1e-4, axis=1))[0]
+    for k in broken_skills:
+        X = repair._repair_skill_group(X, k)
+    if verbose and len(broken_skills):
+        print(f"[Decomposition] Reparadas {len(broken_skills)} habilidades en la frontera: {broken_skills.tolist()}")
+
+    # 5. Pulido opcional sobre la instancia completa
+    history = []
+    if polish_iterations > 0:
+        X, _, history = LS(problem, seed=seed).improve_solution(X, max_iterations=polish_iterations,
+                                                                return_history=True)
+
+    execution_time = time.time() - start_time
+    final_eval = problem.evaluate_solution(X)
+
+    if verbose:
+        print(f"[Decomposition] Fin. Eficiencia: {final_eval['efficiency']:.4f}, "
+              f"factible={final_eval['feasible']}, Tiempo: {execution_time:.2f}s")
+
+    return SolutionResult.from_eval(
+        X=X, eval_result=final_eval, method=f"Decomposition ({algo_type})",
+        history=history, execution_time=execution_time,
+        extra={
+            "n_blocks": len(project_blocks),
+            "block_sizes": [(len(pe), len(pr)) for pe, pr in zip(people_blocks, project_blocks)],
+            "block_efficiencies": [r[2] for r in block_results],
+            "repaired_skills": broken_skills.tolist(),
+            "partition_time": partition_time
+        }
+    )
+
+
+def compare_with_monolithic(problem, algo_type="LS", algo_params=None, seed=42, verbose=True,
+                            **decomposition_kwargs):
+    """
+    Reporta la brecha de calidad de la descomposición frente a resolver la
+    instancia completa con el mismo solver (solo para instancias donde ambos terminan).
+    """
+    algo_params = algo_params or {}
+
+    decomposed = run_decomposition(problem, algo_type=algo_type, algo_params=algo_params,
+                                   seed=seed, verbose=verbose, **decomposition_kwargs)
+    monolithic = BLOCK_SOLVERS[algo_type](problem, seed=seed).solve(verbose=False, **algo_params)
+
+    mono_eff, dec_eff = float(monolithic.F), float(decomposed.F)
+    report = {
+        "Monolithic_Eff": mono_eff,
+        "Decomposition_Eff": dec_eff,
+        "Gap": (mono_eff - dec_eff) / mono_eff if mono_eff else np.nan,
+        "Monolithic_Time": monolithic.execution_time,
+        "Decomposition_Time": decomposed.execution_time,
+        "Speedup": monolithic.execution_time / decomposed.execution_time,
+        "Decomposition_Feasible": bool(decomposed.feasible)
+    }
+
+    if verbose:
+        print(f"[Decomposition] Monolítico {mono_eff:.4f} ({monolithic.execution_time:.1f}s) vs "
+              f"descomposición {dec_eff:.4f} ({decomposed.execution_time:.1f}s): "
+              f"brecha {report['Gap'] * 100:.2f}%")
+    return report
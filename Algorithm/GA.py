@@ -1,12 +1,19 @@
 from pymoo.core.sampling import Sampling
 from pymoo.core.mutation import Mutation
 from pymoo.core.crossover import Crossover
+from pymoo.core.duplicate import DuplicateElimination
+from pymoo.core.evaluator import Evaluator
+from pymoo.core.individual import calc_cv
+import time
 import numpy as np
 from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
+from Algorithm.LS import LS
+from Algorithm.Checkpoint import CheckpointWriter, load_checkpoint, remove_checkpoint
 from pymoo.algorithms.soo.nonconvex.ga import GA
+from pymoo.core.callback import Callback
 from pymoo.optimize import minimize
 
-from SolutionResult import SolutionResult 
+from SolutionResult import SolutionResult, ImprovementEvent
 
 def run_mtfp_ga_standardized(problem, pop_size=100, n_gen=500, seed=42, verbose=True):
     """
@@ -53,16 +60,20 @@ class MTFPDecompositionSampling(Sampling):
     """
     Sampling (Inicialización) basado en la descomposición por habilidades del Paper.
     Usa MTFP_BaseSolver para generar soluciones iniciales factibles y diversas.
+    La aleatoriedad sale del random_state del algoritmo (sembrado con su seed y
+    guardado en el checkpoint), así la corrida es reproducible y reanudable.
     """
     
     def __init__(self, problem):
         super().__init__()
         self.problem = problem
         # Instanciamos el solver base como "fábrica" de soluciones
-        # No pasamos seed fija aquí para asegurar diversidad en cada llamada
         self.solver_factory = MTFP_BaseSolver(problem) 
     
-    def _do(self, problem, n_samples, **kwargs):
+    def _do(self, problem, n_samples, random_state=None, **kwargs):
+        if random_state is not None:
+            self.solver_factory.rng = random_state
+
         # Matriz de población vacía
         X = np.zeros((n_samples, problem.n_var), dtype=int)
         
@@ -79,6 +90,7 @@ class MTFPSkillMutation(Mutation):
     """
     Mutación que 'reinicia' una habilidad usando la heurística constructiva.
     Equivale a un movimiento aleatorio en el vecindario N^1.
+    Usa el random_state del algoritmo (ver MTFPDecompositionSampling).
     """
     def __init__(self, problem, prob=0.2):
         super().__init__()
@@ -88,16 +100,18 @@ class MTFPSkillMutation(Mutation):
         # (Asumiendo que tienes la clase MTFP_BaseSolver definida arriba)
         self.solver_helper = MTFP_BaseSolver(problem) 
 
-    def _do(self, problem, X, **kwargs):
+    def _do(self, problem, X, random_state=None, **kwargs):
+        rng = random_state if random_state is not None else self.solver_helper.rng
+        self.solver_helper.rng = rng
         n_matings, n_var = X.shape
         Y = X.copy()
         
         for k in range(n_matings):
-            if np.random.random() < self.prob:
+            if rng.random() < self.prob:
                 individual = X[k].copy()
                 
                 # Elegir UNA habilidad al azar para mutar
-                skill_to_mutate = np.random.randint(0, self.problem.K)
+                skill_to_mutate = rng.integers(0, self.problem.K)
                 
                 # Usar la lógica segura de reasignación
                 # Nota: _reassign_skill_group devuelve un nuevo array completo
@@ -120,7 +134,8 @@ class MTFPSkillCrossover(Crossover):
         self.prob = prob
         self.problem = problem
 
-    def _do(self, problem, X, **kwargs):
+    def _do(self, problem, X, random_state=None, **kwargs):
+        rng = random_state if random_state is not None else np.random.default_rng()
         n_parents, n_matings, n_var = X.shape
         Y = np.full((self.n_offsprings, n_matings, n_var), -1, dtype=int)
         
@@ -132,7 +147,7 @@ class MTFPSkillCrossover(Crossover):
             child_1, child_2 = parent_a.copy(), parent_b.copy()
             
             # Si ocurre el cruce
-            if np.random.random() < self.prob:
+            if rng.random() < self.prob:
                 # Iterar por cada Habilidad (Bloque)
                 for skill_idx in range(self.problem.K):
                     # Obtener las variables que pertenecen a esta habilidad
@@ -151,7 +166,7 @@ class MTFPSkillCrossover(Crossover):
                     
                     # Crossover Uniforme de BLOQUES
                     # 50% de probabilidad de intercambiar la configuración de ESTA habilidad
-                    if np.random.random() < 0.5:
+                    if rng.random() < 0.5:
                         # Intercambiar genes solo para esta habilidad
                         child_1[var_indices] = parent_b[var_indices]
                         child_2[var_indices] = parent_a[var_indices]
@@ -161,44 +176,255 @@ class MTFPSkillCrossover(Crossover):
         return Y
     
 
-def run_mtfp_ga(problem, pop_size=100, n_gen=500, seed=42, verbose=True):
+class ZobristDuplicateElimination(DuplicateElimination):
     """
-    Ejecuta el GA con operadores de descomposición y devuelve un SolutionResult.
+    Eliminación de duplicados por huella Zobrist: O(n) hashes y un conjunto,
+    en lugar de la matriz de distancias O(n² · n_var) de Pymoo. Se usa la huella
+    de la forma canónica, así dos soluciones que solo permutan personas
+    intercambiables también cuentan como duplicadas.
     """
-    
+    def __init__(self, problem):
+        super().__init__()
+        self.problem = problem
+
+    def _do(self, pop, other, is_duplicate):
+        fps = self.problem.canonical_fingerprints(pop.get("X"))
+        seen = set() if other is None else set(self.problem.canonical_fingerprints(other.get("X")).tolist())
+        for i, fp in enumerate(fps.tolist()):
+            if fp in seen:
+                is_duplicate[i] = True
+            elif other is None:
+                seen.add(fp)
+        return is_duplicate
+
+
+class MemeticEvaluator(Evaluator):
+    """
+    Evaluador de Pymoo para la variante memética: tras evaluar la descendencia
+    (producida por MTFPSkillCrossover/MTFPSkillMutation), una fracción 'rate'
+    elegida al azar recibe una mejora corta de 'ls_steps' vecinos N^1 con
+    LS.refine (evaluación incremental). La población inicial no se refina.
+
+    - lamarckian=True: el hijo se reemplaza por su versión refinada (X, F y G).
+    - lamarckian=False (Baldwiniano): el hijo conserva su genotipo y sus
+      restricciones, pero compite con la eficiencia de su versión refinada,
+      que se guarda como 'phenotype' (ver MemeticEvaluator.phenotype).
+
+    Cada vecino evaluado por la LS suma 1 a n_eval, así el presupuesto NFE del GA
+    memético es comparable con el del GA y los solvers de trayectoria.
+    """
+    def __init__(self, problem, rate=0.1, ls_steps=20, lamarckian=True, seed=None):
+        super().__init__()
+        self.rate = rate
+        self.ls_steps = ls_steps
+        self.lamarckian = lamarckian
+        self.local_search = LS(problem, seed=seed)
+        self.refinements = 0
+        self.improvements = 0
+        self.ls_nfe = 0
+
+    def _eval(self, problem, pop, evaluate_values_of, algorithm=None, **kwargs):
+        super()._eval(problem, pop, evaluate_values_of, **kwargs)
+        if algorithm is None or not algorithm.is_initialized or self.rate <= 0:
+            return
+
+        chosen = np.flatnonzero(algorithm.random_state.random(len(pop)) < self.rate)
+        improved, refined_X = [], []
+        for i in chosen:
+            ind = pop[i]
+            nfe_before = self.local_search.nfe
+            X, eff = self.local_search.refine(ind.X.astype(int), self.ls_steps, efficiency=-ind.F[0])
+            self.ls_nfe += self.local_search.nfe - nfe_before
+            self.refinements += 1
+            if eff > -ind.F[0]:
+                improved.append(i)
+                refined_X.append(X)
+                if not self.lamarckian:
+                    ind.F = np.array([-eff])
+                    ind.set("phenotype", X)
+        self.improvements += len(improved)
+
+        if self.lamarckian and improved:
+            # F ya es conocido por la LS; se evalúan las restricciones del nuevo genotipo
+            out = problem.evaluate(np.array(refined_X), return_values_of=evaluate_values_of,
+                                   return_as_dictionary=True)
+            for j, i in enumerate(improved):
+                pop[i].X = refined_X[j]
+                for key, val in out.items():
+                    if val is not None:
+                        pop[i].set(key, val[j])
+                pop[i].CV = np.array([calc_cv(G=pop[i].G, H=pop[i].H, config=pop[i].config)])
+
+    @staticmethod
+    def phenotype(ind):
+        """Asignación que alcanza la eficiencia del individuo: la refinada (Baldwiniano) o su X."""
+        X = ind.get("phenotype")
+        return ind.X if X is None else X
+
+    def eval(self, problem, pop, **kwargs):
+        ls_nfe = self.ls_nfe
+        pop = super().eval(problem, pop, **kwargs)
+        self.n_eval += self.ls_nfe - ls_nfe
+        return pop
+
+
+def iter_mtfp_ga(problem, pop_size=100, n_gen=500, seed=42, verbose=True, callback=None,
+                 include_allocation=False, checkpoint_path=None, checkpoint_interval=60.0,
+                 crossover_prob=0.9, mutation_prob=0.2, memetic_rate=0.0, memetic_steps=20, lamarckian=True):
+    """
+    Versión generadora del GA: emite un ImprovementEvent por cada generación en que
+    mejora el óptimo y retorna (StopIteration.value) el SolutionResult final.
+    Enviar True al generador (gen.send(True)) detiene el GA y retorna lo mejor hallado.
+
+    memetic_rate > 0 activa la variante memética (ver MemeticEvaluator): esa fracción
+    de la descendencia recibe memetic_steps vecinos de LS.refine, Lamarckiana o
+    Baldwiniana según 'lamarckian'. Los vecinos cuentan en el NFE reportado. En la
+    Baldwiniana, eventos y resultado reportan el fenotipo refinado del mejor individuo.
+
+    checkpoint_path (opcional): cada checkpoint_interval segundos guarda el algoritmo
+    de Pymoo (población, operadores, su random_state y el evaluador con sus contadores
+    de NFE y de la LS memética), el estado de np.random y la curva de convergencia.
+    Si el archivo existe, la corrida se reanuda desde ese punto y termina igual que
+    una corrida sin interrupciones con la misma seed.
+
+    callback (opcional): función llamada por Pymoo al final de cada generación
+    con el objeto algoritmo (p.ej. para reportar progreso o forzar la parada
+    con algorithm.termination.force_termination = True).
+    """
+    start_time = time.time()
+    memetic = memetic_rate > 0
+    method_name = "Memetic Algorithm" if memetic else "Genetic Algorithm"
+
     # 1. Configurar el Algoritmo con tus Clases Custom
     algorithm = GA(
         pop_size=pop_size,
         sampling=MTFPDecompositionSampling(problem),      # Tu sampling
-        crossover=MTFPSkillCrossover(problem, prob=0.9),  # Tu crossover
-        mutation=MTFPSkillMutation(problem, prob=0.2),    # Tu mutation
-        eliminate_duplicates=True
+        crossover=MTFPSkillCrossover(problem, prob=crossover_prob),  # Tu crossover
+        mutation=MTFPSkillMutation(problem, prob=mutation_prob),     # Tu mutation
+        eliminate_duplicates=ZobristDuplicateElimination(problem),
+        evaluator=MemeticEvaluator(problem, memetic_rate, memetic_steps, lamarckian, seed) if memetic else None
     )
     
     if verbose:
         print(f"\n[GA-Decomposition] Iniciando (Gen: {n_gen}, Pop: {pop_size})...")
 
-    # 2. Ejecutar Pymoo Minimize
+    # 2. Equivalente a pymoo.optimize.minimize, pero generación a generación
     # save_history=True es vital para graficar convergencia después
-    res = minimize(
+    algorithm.setup(
         problem,
-        algorithm,
-        ('n_gen', n_gen),
+        termination=('n_gen', n_gen),
         seed=seed,
         verbose=verbose,
         save_history=True,
-        return_least_infeasible=True
+        return_least_infeasible=True,
+        **({"callback": callback} if callback is not None else {})
     )
+
+    # Curva de convergencia compacta (mejor por generación), la misma que
+    # SolutionResult.from_pymoo_result extrae de res.history
+    convergence = []
+    checkpoint = CheckpointWriter(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+    resume = load_checkpoint(checkpoint_path)
+    if resume is not None:
+        if resume["solver"] != "GA":
+            raise ValueError(f"El checkpoint '{checkpoint_path}' es de {resume['solver']}, no del GA")
+        # La función de comparación del torneo (no serializable) se toma del GA recién creado
+        resume["algorithm"].mating.selection.func_comp = algorithm.mating.selection.func_comp
+        algorithm = resume["algorithm"]
+        algorithm.history = []
+        algorithm.callback = callback if callback is not None else Callback()
+        algorithm.start_time = time.time() - resume["elapsed"]
+        np.random.set_state(resume["np_random"])
+        convergence = resume["convergence"]
+        start_time -= resume["elapsed"]
+        if verbose:
+            print(f"[GA] Reanudando desde generación {algorithm.n_iter}...")
+
+    best_eff = max(convergence, default=-np.inf)
+    while algorithm.has_next():
+        if checkpoint is not None and algorithm.is_initialized and checkpoint.due():
+            # El historial (copias completas del algoritmo), el callback y la función
+            # de comparación del torneo (decorada por Pymoo, no serializable) no se guardan
+            selection = algorithm.mating.selection
+            saved_history, saved_callback, saved_comp = algorithm.history, algorithm.callback, selection.func_comp
+            algorithm.history, algorithm.callback, selection.func_comp = None, None, None
+            try:
+                checkpoint.save({
+                    "solver": "GA",
+                    "algorithm": algorithm,
+                    "np_random": np.random.get_state(),
+                    "convergence": convergence,
+                    "elapsed": time.time() - start_time
+                })
+            finally:
+                algorithm.history, algorithm.callback, selection.func_comp = saved_history, saved_callback, saved_comp
+
+        algorithm.next()
+
+        efficiency = -np.min(algorithm.opt.get("F"))
+        convergence.append(efficiency)
+        if efficiency > best_eff:
+            best_eff = efficiency
+            X_best = MemeticEvaluator.phenotype(algorithm.opt[0]).astype(int)
+            event = ImprovementEvent(
+                elapsed=time.time() - start_time,
+                nfe=algorithm.evaluator.n_eval,
+                efficiency=efficiency,
+                iteration=algorithm.n_iter - 1,
+                X=X_best,
+                allocation=problem.get_allocation_matrix(X_best) if include_allocation else None
+            )
+            if (yield event):
+                algorithm.termination.force_termination = True
+                break
+
+    res = algorithm.result()
+    if memetic and not lamarckian and res.opt is not None:
+        # Baldwiniano: F es la eficiencia del fenotipo refinado, así que se reporta
+        # esa asignación (reevaluada) y no el genotipo que la originó
+        res.X = MemeticEvaluator.phenotype(res.opt[0]).astype(int)
+        res.F, res.G = problem.evaluate(res.X[None], return_values_of=["F", "G"])
+        res.F, res.G = res.F[0], res.G[0]
+        res.CV = calc_cv(G=res.G)
+    if checkpoint is not None:
+        remove_checkpoint(checkpoint_path)
     
     # 3. Convertir al formato unificado SolutionResult
     # Usamos el método de clase que creamos anteriormente
     result = SolutionResult.from_pymoo_result(
         res, 
         problem, 
-        method_name="Genetic Algorithm"
+        method_name=method_name
     )
+    result.history = convergence  # Completa aunque la corrida se haya reanudado
+    result.extra["nfe"] = algorithm.evaluator.n_eval
+    if memetic:
+        result.extra.update({
+            "ls_nfe": algorithm.evaluator.ls_nfe,
+            "refinements": algorithm.evaluator.refinements,
+            "refinement_improvements": algorithm.evaluator.improvements
+        })
     
     if verbose:
         print(f"[GA] Fin. Eficiencia: {result.F:.4f}")
         
-    return result
\ No newline at end of file
+    return result
+
+
+def run_mtfp_ga(problem, pop_size=100, n_gen=500, seed=42, verbose=True, callback=None,
+                checkpoint_path=None, checkpoint_interval=60.0, crossover_prob=0.9, mutation_prob=0.2,
+                memetic_rate=0.0, memetic_steps=20, lamarckian=True):
+    """
+    Ejecuta el GA con operadores de descomposición y devuelve un SolutionResult.
+    Envoltorio bloqueante sobre iter_mtfp_ga.
+    """
+    gen = iter_mtfp_ga(problem, pop_size=pop_size, n_gen=n_gen, seed=seed,
+                       verbose=verbose, callback=callback,
+                       checkpoint_path=checkpoint_path, checkpoint_interval=checkpoint_interval,
+                       crossover_prob=crossover_prob, mutation_prob=mutation_prob,
+                       memetic_rate=memetic_rate, memetic_steps=memetic_steps, lamarckian=lamarckian)
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
@@ -0,0 +1,207 @@
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
+from Algorithm.LS import LS
+from Algorithm.TabuSearch import TabuSearch
+from Algorithm.VNS import VNS
+from SolutionResult import SolutionResult
+
+
+SEEDED_SOLVERS = {
+    "LS": LS,
+    "Tabu": TabuSearch,
+    "VNS": VNS,
+}
+
+
+class GRASP(MTFP_BaseSolver):
+    """
+    GRASP: construcción greedy aleatorizada + búsqueda local.
+
+    Cada requerimiento (habilidad, proyecto) se llena eligiendo al azar dentro de una
+    lista restringida de candidatos (RCL) ordenada por la ganancia incremental de
+    x_l^T S x_l al asignar el nivel 'a' a la persona i:
+
+        Δ_i = 2 (S x_l)_i a + S_ii a²
+
+    S x_l se mantiene incrementalmente (una columna de S por asignación), así cada
+    paso cuesta O(|grupo de habilidad|) en vez de una evaluación completa.
+    alpha = 0 es greedy puro; alpha = 1 es aleatorio puro.
+    """
+    def __init__(self, problem, seed=None, affinity_bias=0.0, upper_bound=None, cache_size=0):
+        super().__init__(problem, seed, affinity_bias, upper_bound, cache_size)
+        self.ls_engine = None  # LS de la fase de mejora (se crea en iter_solve si ls_max_iterations > 0)
+
+    def construct(self, alpha=0.3) -> np.ndarray:
+        problem = self.problem
+        levels = problem.levels
+        S = problem.S
+        alloc = np.zeros((problem.H, problem.P))
+        SA = np.zeros((problem.H, problem.P))  # S @ alloc, actualizado incrementalmente
+        spare = np.ones(problem.H)
+
+        # Orden aleatorio de los pares (habilidad, proyecto) con requerimiento
+        pairs = np.argwhere(problem.R > 0)
+        pairs = pairs[self.rng.permutation(len(pairs))]
+
+        for k, l in pairs:
+            people = problem.skill_groups[k]
+            need = problem.R[k, l]
+
+            while need > 1e-6:
+                # Mayor nivel que cabe en la capacidad libre y en lo que falta
+                fits = levels[None, :] <= np.minimum(spare[people], need)[:, None] + 1e-6
+                amount = np.where(fits, levels[None, :], 0.0).max(axis=1)
+                amount[alloc[people, l] > 0] = 0.0  # Una asignación por persona y proyecto
+                valid = amount > 0
+                if not np.any(valid):
+                    break
+
+                idx = np.where(valid)[0]
+                a = amount[idx]
+                gain = 2 * SA[people[idx], l] * a + S[people[idx], people[idx]] * a ** 2
+
+                # Lista restringida de candidatos
+                threshold = gain.max() - alpha * (gain.max() - gain.min())
+                rcl = idx[gain >= threshold - 1e-12]
+                pick = rcl[self.rng.integers(len(rcl))]
+                person, level = people[pick], amount[pick]
+
+                alloc[person, l] = level
+                SA[:, l] += S[:, person] * level
+                spare[person] -= level
+                need -= level
+
+        X = self._encode(alloc)
+
+        # La granularidad puede dejar requerimientos sin cubrir: reparar esas habilidades
+        delivered = np.array([alloc[group].sum(axis=0) for group in problem.skill_groups])
+        for k in np.where(np.any(np.abs(delivered - problem.R) > 1e-4, axis=1))[0]:
+            X = self._repair_skill_group(X, k)
+        return X
+
+    def iter_solve(self, n_constructions=50, alpha=0.3, ls_max_iterations=0,
+                   include_allocation=False, verbose=True):
+        start_time = time.time()
+        if verbose: print(f"\n[GRASP] {n_constructions} construcciones (alpha={alpha}, LS={ls_max_iterations})...")
+
+        if self.ls_engine is not None:
+            self.nfe += self.ls_engine.total_nfe()  # Evaluaciones de corridas anteriores
+        self.ls_engine = LS(self.problem, seed=self.rng.integers(2**31)) if ls_max_iterations > 0 else None
+        best_X, best_eff = None, -np.inf
+        history = []
+
+        for iteration in range(n_constructions):
+            # Al menos una construcción, aunque el plazo ya haya vencido
+            if best_X is not None and self._past_deadline():
+                break
+            X = self.construct(alpha)
+            if self.ls_engine is not None:
+                X, eff = self.ls_engine.improve_solution(X, max_iterations=ls_max_iterations)
+            else:
+                eff = self._get_efficiency_fast(X)
+
+            if eff > best_eff:
+                best_X, best_eff = X.copy(), eff
+                history.append(best_eff)
+                if verbose: print(f"[GRASP] Iter {iteration}: Nuevo récord = {best_eff:.4f}")
+                if (yield self._improvement_event(start_time, iteration, best_eff, best_X, include_allocation)):
+                    break
+            else:
+                history.append(best_eff)
+
+        execution_time = time.time() - start_time
+        final_eval = self.problem.evaluate_solution(best_X)
+
+        return SolutionResult.from_eval(
+            X=best_X, eval_result=final_eval, method="GRASP",
+            history=history, execution_time=execution_time,
+            extra={"nfe": self.total_nfe(), "alpha": alpha}
+        )
+
+
+    def total_nfe(self) -> int:
+        return self.nfe + (self.ls_engine.total_nfe() if self.ls_engine is not None else 0)
+
+
+def _grasp_worker(task):
+    """Trabajador: ejecuta un bloque de construcciones y retorna [(eficiencia, X), ...]."""
+    problem, n_constructions, alpha, seed = task
+    solver = GRASP(problem, seed=seed)
+    return [(solver._get_efficiency_fast(X), X) for X in (solver.construct(alpha) for _ in range(n_constructions))]
+
+
+def run_parallel_grasp(problem, n_constructions=200, alpha=0.3, n_seeds=5, n_workers=None, seed=42):
+    """
+    Construcciones GRASP en paralelo. Retorna las 'n_seeds' mejores soluciones
+    distintas como [(eficiencia, X), ...] ordenadas de mejor a peor.
+    """
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    chunks = np.array_split(np.arange(n_constructions), n_workers)
+    seeds = np.random.SeedSequence(seed).generate_state(n_workers)
+    tasks = [(problem, len(c), alpha, int(s)) for c, s in zip(chunks, seeds) if len(c)]
+
+    with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+        constructions = [item for chunk in executor.map(_grasp_worker, tasks) for item in chunk]
+
+    constructions.sort(key=lambda item: -item[0])
+    best, seen = [], set()
+    for eff, X in constructions:
+        key = X.tobytes()
+        if key not in seen:
+            seen.add(key)
+            best.append((eff, X))
+        if len(best) == n_seeds:
+            break
+    return best
+
+
+def run_grasp_seeded(problem, algo_type="LS", n_constructions=200, alpha=0.3, n_seeds=5,
+                     algo_params=None, n_workers=None, seed=42, verbose=True):
+    """
+    Semillas GRASP para las metaheurísticas: construye en paralelo, toma las
+    'n_seeds' mejores y lanza LS/Tabu/VNS desde cada una (initial_solution).
+    Retorna el mejor SolutionResult.
+    """
+    if algo_type not in SEEDED_SOLVERS:
+        raise ValueError(f"Algoritmo no soportado '{algo_type}'. Opciones: {list(SEEDED_SOLVERS)}")
+    algo_params = algo_params or {}
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+
+    start_time = time.time()
+    seeds = run_parallel_grasp(problem, n_constructions, alpha, n_seeds, n_workers, seed)
+    construction_time = time.time() - start_time
+    if verbose:
+        print(f"\n[GRASP] {n_constructions} construcciones en {construction_time:.2f}s. "
+              f"Semillas: {[round(float(e), 4) for e, _ in seeds]}")
+
+    tasks = [(algo_type, problem, X, seed + i, algo_params) for i, (_, X) in enumerate(seeds)]
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+        results = list(executor.map(_seeded_worker, tasks))
+
+    best = max(results, key=lambda r: float(r.F))
+    best.execution_time = time.time() - start_time
+    best.method = f"GRASP + {best.method}"
+    best.extra.update({
+        "grasp_seed_efficiencies": [float(e) for e, _ in seeds],
+        "seeded_efficiencies": [float(r.F) for r in results],
+        "construction_time": construction_time
+    })
+
+    if verbose:
+        print(f"[GRASP] Mejor tras {algo_type}: {float(best.F):.4f}, Tiempo: {best.execution_time:.2f}s")
+    return best
+
+
+def _seeded_worker(task):
+    algo_type, problem, X, seed, algo_params = task
+    solver = SEEDED_SOLVERS[algo_type](problem, seed=seed)
+    result = solver.solve(initial_solution=X, verbose=False, **algo_params)
+    result.extra["nfe"] = solver.total_nfe()
+    return result
@@ -9,7 +9,7 @@ class Greedy(MTFP_BaseSolver):
     Es determinista: siempre produce la misma solución para el mismo problema.
     """
     
-    def solve(self, verbose=False):
+    def iter_solve(self, include_allocation=False, verbose=False):
         start = time.time()
         
         allocation = np.zeros((self.problem.H, self.problem.P))
@@ -50,6 +50,9 @@ class Greedy(MTFP_BaseSolver):
         # Evaluar
         end = time.time()
         final_eval = self.problem.evaluate_solution(X)
+
+        # Constructivo de una sola pasada: un único evento con la solución final
+        yield self._improvement_event(start, 0, final_eval['efficiency'], X, include_allocation)
         
         return SolutionResult.from_eval(
             X, final_eval, 
@@ -14,21 +14,39 @@ class HillClimbing(MTFP_BaseSolver):
       usamos reasignación de habilidades completa (siempre factible).
     """
     
-    def solve(self, max_iterations=500, sample_size=20, verbose=True):
+    def iter_solve(self, max_iterations=500, sample_size=20, initial_solution=None, initial_version=None,
+                   include_allocation=False, checkpoint_path=None, checkpoint_interval=60.0, verbose=True):
         start_time = time.time()
+        resume = self._start_checkpointing(checkpoint_path, checkpoint_interval)
         
         if verbose:
             print(f"\n[Hill Climbing] Iniciando búsqueda (Max Iter: {max_iterations})")
             print(f"                Muestras por iteración: {sample_size}")
             print("="*60)
 
-        # 1. Solución Inicial (Usando la base constructiva)
-        current_X = self._construct_feasible_solution()
-        current_eff = self._get_efficiency_fast(current_X)
-        
-        history = [current_eff]
+        if resume is not None:
+            # Reanudar desde el checkpoint (el reloj continúa desde el tiempo ya consumido)
+            start_time -= resume["elapsed"]
+            current_X, current_eff = resume["current_X"], resume["current_eff"]
+            history = resume["history"]
+            first_iteration = resume["iteration"]
+        else:
+            # 1. Solución Inicial (base constructiva, provista o reparada en caliente)
+            current_X = self._initial_solution(initial_solution, initial_version)
+            current_eff = self._get_efficiency_fast(current_X)
+            
+            history = [current_eff]
+            first_iteration = 0
+        cancelled = yield self._improvement_event(start_time, first_iteration, current_eff, current_X, include_allocation)
         
-        for iteration in range(max_iterations):
+        for iteration in range(first_iteration, max_iterations):
+            if cancelled or self._past_deadline():
+                break
+
+            self._maybe_checkpoint(start_time, lambda: {
+                "iteration": iteration, "history": history,
+                "current_X": current_X, "current_eff": current_eff
+            })
             improved = False
             
             # Intentamos 'sample_size' vecinos aleatorios
@@ -49,6 +67,9 @@ class HillClimbing(MTFP_BaseSolver):
                     
                     if verbose:
                         print(f"[Hill Climbing] Iter {iteration}: Mejora a {current_eff:.4f}")
+                    cancelled = (yield self._improvement_event(
+                        start_time, iteration + 1, current_eff, current_X, include_allocation
+                    )) or self._reached_upper_bound(current_eff)
                     break # Salir del bucle de muestreo (First Improvement)
             
             history.append(current_eff)
@@ -59,6 +80,7 @@ class HillClimbing(MTFP_BaseSolver):
                     print(f"[Hill Climbing] Iter {iteration}: Estancado (Óptimo Local alcanzado).")
                 break
                 
+        self._finish_checkpointing()
         end_time = time.time()
         execution_time = end_time - start_time
         
@@ -0,0 +1,228 @@
+import time
+import queue
+import multiprocessing
+
+import numpy as np
+from pymoo.algorithms.soo.nonconvex.ga import GA
+from pymoo.core.population import Population
+
+from Algorithm.GA import MTFPDecompositionSampling, MTFPSkillCrossover, MTFPSkillMutation
+from SolutionResult import SolutionResult
+
+
+# Topologías de migración: función (isla, n_islas) -> lista de islas destino
+TOPOLOGIES = {
+    "none": lambda i, n: [],
+    "ring": lambda i, n: [(i + 1) % n] if n > 1 else [],
+    "bidirectional_ring": lambda i, n: sorted({(i - 1) % n, (i + 1) % n} - {i}),
+    "complete": lambda i, n: [j for j in range(n) if j != i],
+    "star": lambda i, n: [j for j in range(1, n)] if i == 0 else [0],
+}
+
+
+def _island_worker(island_id, problem, pop_size, n_gen, migration_interval, n_migrants,
+                   seed, inboxes, targets, result_queue):
+    """
+    Proceso de una isla: ejecuta un GA de Pymoo generación a generación y cada
+    'migration_interval' generaciones envía sus 'n_migrants' mejores individuos
+    a las islas destino e integra los inmigrantes que haya recibido.
+    """
+    algorithm = GA(
+        pop_size=pop_size,
+        sampling=MTFPDecompositionSampling(problem),
+        crossover=MTFPSkillCrossover(problem, prob=0.9),
+        mutation=MTFPSkillMutation(problem, prob=0.2),
+        eliminate_duplicates=True
+    )
+    algorithm.setup(problem, termination=('n_gen', n_gen), seed=seed, verbose=False)
+
+    inbox = inboxes[island_id]
+    history = []
+    n_immigrants = 0
+
+    while algorithm.has_next():
+        algorithm.next()
+        history.append(-np.min(algorithm.opt.get("F")))
+
+        if migration_interval and algorithm.n_iter % migration_interval == 0:
+            # --- Emigración: los mejores de la población actual ---
+            if targets:
+                order = np.argsort(algorithm.pop.get("F")[:, 0])[:n_migrants]
+                migrants = algorithm.pop.get("X")[order].astype(int)
+                for target in targets:
+                    inboxes[target].put(migrants)
+
+            # --- Inmigración (asíncrona): integrar lo que haya llegado ---
+            received = []
+            while True:
+                try:
+                    received.append(inbox.get_nowait())
+                except queue.Empty:
+                    break
+
+            if received:
+                # Sin duplicados entre sí ni con la población local (no se evalúan dos veces)
+                immigrants = algorithm.eliminate_duplicates.do(
+                    Population.new(X=np.vstack(received)), algorithm.pop)
+            if received and len(immigrants):
+                algorithm.evaluator.eval(problem, immigrants)
+                n_immigrants += len(immigrants)
+                # La supervivencia del GA reemplaza a los peores
+                algorithm.pop = algorithm.survival.do(
+                    problem,
+                    Population.merge(algorithm.pop, immigrants),
+                    n_survive=pop_size,
+                    algorithm=algorithm,
+                    random_state=algorithm.random_state
+                )
+
+    res = algorithm.result()
+    X_best = res.X[0] if res.X.ndim > 1 else res.X
+
+    # Los migrantes que nadie leyó no deben bloquear la salida del proceso
+    for q in inboxes:
+        q.cancel_join_thread()
+
+    result_queue.put({
+        "island": island_id,
+        "X": np.asarray(X_best, dtype=int),
+        "F": float(-np.min(res.F)),
+        "history": history,
+        "nfe": algorithm.evaluator.n_eval,
+        "immigrants": n_immigrants
+    })
+
+
+def _collect_island_results(processes, result_queue, poll_interval=1.0, verbose=True):
+    """
+    Lee un resultado por isla sin bloquearse para siempre: entre lecturas se
+    revisa el exitcode de cada proceso, y una isla que murió (segfault, OOM)
+    sin reportar se descarta. Retorna (resultados, islas caídas).
+    """
+    results, failed = {}, set()
+    while len(results) + len(failed) < len(processes):
+        try:
+            r = result_queue.get(timeout=poll_interval)
+            results[r["island"]] = r
+            continue
+        except queue.Empty:
+            pass
+        for i, proc in enumerate(processes):
+            # exitcode 0 sin resultado leído: el resultado ya está en la cola
+            if i not in results and i not in failed and proc.exitcode not in (None, 0):
+                failed.add(i)
+                if verbose:
+                    print(f"[Island-GA] ⚠️ Isla {i} terminó con código {proc.exitcode}; se descarta")
+    return [results[i] for i in sorted(results)], sorted(failed)
+
+
+def run_mtfp_island_ga(problem, n_islands=None, pop_size=100, n_gen=500,
+                       migration_interval=10, n_migrants=2, topology="ring",
+                       seed=42, verbose=True):
+    """
+    GA de modelo de islas: 'n_islands' procesos, cada uno con su propio GA
+    (mismos operadores de descomposición que run_mtfp_ga), que intercambian
+    individuos por colas (pipes) según la topología indicada.
+
+    pop_size es el tamaño de población POR isla. Una isla cuyo proceso muere se
+    descarta (extra['failed_islands']); si mueren todas se lanza RuntimeError.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topología desconocida '{topology}'. Opciones: {list(TOPOLOGIES)}")
+
+    if n_islands is None:
+        n_islands = multiprocessing.cpu_count()
+
+    start_time = time.time()
+
+    if verbose:
+        print(f"\n[Island-GA] {n_islands} islas ({topology}), Gen: {n_gen}, Pop/isla: {pop_size}, "
+              f"migración cada {migration_interval} gen ({n_migrants} individuos)")
+
+    island_seeds = np.random.SeedSequence(seed).generate_state(n_islands)
+
+    inboxes = [multiprocessing.Queue() for _ in range(n_islands)]
+    result_queue = multiprocessing.Queue()
+
+    processes = []
+    for i in range(n_islands):
+        proc = multiprocessing.Process(
+            target=_island_worker,
+            args=(i, problem, pop_size, n_gen, migration_interval, n_migrants,
+                  int(island_seeds[i]), inboxes, TOPOLOGIES[topology](i, n_islands), result_queue)
+        )
+        proc.start()
+        processes.append(proc)
+
+    # Recoger resultados ANTES del join (evita bloqueos por colas llenas)
+    island_results, failed_islands = _collect_island_results(processes, result_queue, verbose=verbose)
+    for proc in processes:
+        proc.join()
+    if not island_results:
+        raise RuntimeError(f"Todas las islas terminaron sin resultado (códigos: "
+                           f"{[proc.exitcode for proc in processes]})")
+
+    best = max(island_results, key=lambda r: r["F"])
+
+    # Historial global: mejor de todas las islas en cada generación
+    n_hist = min(len(r["history"]) for r in island_results)
+    history = np.max([r["history"][:n_hist] for r in island_results], axis=0).tolist()
+
+    execution_time = time.time() - start_time
+    final_eval = problem.evaluate_solution(best["X"])
+
+    if verbose:
+        print(f"[Island-GA] Fin. Eficiencia: {best['F']:.4f} (isla {best['island']}), "
+              f"Tiempo: {execution_time:.2f}s")
+
+    return SolutionResult.from_eval(
+        X=best["X"], eval_result=final_eval, method="Island GA",
+        history=history, execution_time=execution_time,
+        extra={
+            "n_islands": n_islands,
+            "topology": topology,
+            "migration_interval": migration_interval,
+            "n_migrants": n_migrants,
+            "nfe": sum(r["nfe"] for r in island_results),
+            "island_best": [r["F"] for r in island_results],
+            "immigrants": [r["immigrants"] for r in island_results],
+            "failed_islands": failed_islands
+        }
+    )
+
+
+def measure_island_speedup(problem, core_counts=(1, 2, 4, 8), total_pop_size=400, n_gen=200,
+                           seed=42, verbose=True, **island_kwargs):
+    """
+    Mide el speedup del GA de islas frente al número de núcleos (strong scaling):
+    la población total se reparte entre las islas, así el trabajo por generación
+    es constante y solo cambia el grado de paralelismo.
+
+    Retorna una lista de diccionarios (una fila por número de islas).
+    """
+    rows = []
+    base_time = None
+
+    for n in core_counts:
+        result = run_mtfp_island_ga(
+            problem, n_islands=n, pop_size=max(2, total_pop_size // n), n_gen=n_gen,
+            seed=seed, verbose=False, **island_kwargs
+        )
+        if base_time is None:
+            base_time = result.execution_time
+
+        # Speedup relativo a la primera configuración de core_counts
+        speedup = base_time / result.execution_time
+        rows.append({
+            "Islands": n,
+            "Time": result.execution_time,
+            "Speedup": speedup,
+            "Parallel_Efficiency": speedup * core_counts[0] / n,
+            "Efficiency": float(result.F),
+            "NFE": result.extra["nfe"]
+        })
+        if verbose:
+            print(f"[Island-GA] {n:>3} islas: {result.execution_time:8.2f}s  "
+                  f"speedup={speedup:5.2f}  eficiencia={float(result.F):.4f}")
+
+    return rows
@@ -7,21 +7,35 @@ class LS(MTFP_BaseSolver):
     Implementación de Local Search (LS).
     Explora el vecindario N^1 hasta alcanzar un óptimo local.
     """
-    def solve(self, max_iterations=5000, verbose=True):
+    def iter_solve(self, max_iterations=5000, initial_solution=None, initial_version=None,
+                   include_allocation=False, checkpoint_path=None, checkpoint_interval=60.0, verbose=True):
         start_time = time.time()
-        if verbose: print(f"\n[LS] Iniciando Búsqueda Local...")
-
-        # Solución inicial
-        current_X = self._construct_feasible_solution()
-        
-        # Ejecutar mejora
-        best_X, best_eff, history = self.improve_solution(
-            current_X, max_iterations=max_iterations, return_history=True
-        )
+        resume = self._start_checkpointing(checkpoint_path, checkpoint_interval)
+
+        if resume is not None:
+            # Reanudar: el reloj continúa desde el tiempo ya consumido
+            start_time -= resume["elapsed"]
+            current_X = resume["current_X"]
+            history = resume["history"]
+            if verbose: print(f"\n[LS] Reanudando desde iteración {resume['iteration']}...")
+        else:
+            if verbose: print(f"\n[LS] Iniciando Búsqueda Local...")
+            # Solución inicial (construida, provista o reparada en caliente)
+            current_X = self._initial_solution(initial_solution, initial_version)
+            history = []
 
+        # Ejecutar mejora, emitiendo un evento por cada nuevo mejor
+        best_X = current_X
+        for best_X, best_eff in self._iter_improve(current_X, max_iterations, history,
+                                                   resume=resume, start_time=start_time):
+            event = self._improvement_event(start_time, len(history) - 1, best_eff, best_X, include_allocation)
+            if (yield event):
+                break
+
+        self._finish_checkpointing()
         execution_time = time.time() - start_time
         final_eval = self.problem.evaluate_solution(best_X)
-        
+
         return SolutionResult.from_eval(
             X=best_X, eval_result=final_eval, method="Local Search",
             history=history, execution_time=execution_time
@@ -32,37 +46,118 @@ class LS(MTFP_BaseSolver):
         Subrutina pública: Toma una solución y la mejora usando Hill Climbing en N^1.
         Esta es la función que VNS llamará.
         """
+        history = []
+        for best_X, best_eff in self._iter_improve(solution, max_iterations, history):
+            pass
+
+        if return_history:
+            return best_X, best_eff, history
+        return best_X, best_eff
+
+    def refine(self, solution, max_iterations=20, efficiency=None):
+        """
+        Mejora corta de 'solution' en N^1 (primer vecino que mejora, como
+        improve_solution) con evaluación incremental: solo se recalcula el aporte
+        de la habilidad reasignada (MTFP.delta_efficiency). Cada vecino evaluado
+        suma 1 a nfe. 'efficiency' evita reevaluar la solución de partida si ya se conoce.
+        Retorna (best_X, best_eff).
+        """
+        if not self.problem.INCREMENTAL_OBJECTIVE:
+            # Objetivos sin evaluación delta (p.ej. MultiScenarioMTFP): evaluación completa
+            best_X, best_eff = solution.copy(), efficiency
+            if best_eff is None:
+                best_eff = self._get_efficiency_fast(best_X)
+            for _ in range(max_iterations):
+                if self._past_deadline():
+                    break
+                neighbor_X = self._reassign_skill_group(best_X, self.rng.integers(0, self.problem.K))
+                neighbor_eff = self._get_efficiency_fast(neighbor_X)
+                if neighbor_eff > best_eff:
+                    best_X, best_eff = neighbor_X, neighbor_eff
+            return best_X, best_eff
+
+        state = self.problem.incremental_state(solution)
         current_X = solution.copy()
-        current_eff = self._get_efficiency_fast(current_X)
-        
-        best_X = current_X.copy()
-        best_eff = current_eff
-        history = [best_eff]
-        
+        if efficiency is None:
+            self.nfe += 1
+            efficiency = self.problem.state_efficiency(state)
+        current_eff = efficiency
+
         for _ in range(max_iterations):
-            improved_step = False
-            
-            # Generar vecino N^1 (cambiar 1 habilidad al azar)
+            if self._past_deadline():
+                break
             skill_idx = self.rng.integers(0, self.problem.K)
             neighbor_X = self._reassign_skill_group(current_X, skill_idx)
-            neighbor_eff = self._get_efficiency_fast(neighbor_X)
-            
+            rows = self.problem.skill_groups[skill_idx]
+            self.nfe += 1
+            neighbor_eff, Q_new, A_rows = self.problem.delta_efficiency(state, rows, neighbor_X)
+
+            if neighbor_eff > current_eff:
+                self.problem.apply_delta(state, rows, A_rows, Q_new)
+                current_X, current_eff = neighbor_X, neighbor_eff
+                if self._reached_upper_bound(current_eff):
+                    break
+        return current_X, current_eff
+
+    def _iter_improve(self, solution, max_iterations, history, resume=None, start_time=None):
+        """
+        Núcleo de la mejora en N^1. Agrega el mejor valor de cada iteración a 'history'
+        y emite (best_X, best_eff) al inicio y cada vez que el mejor mejora.
+        'resume' es el estado de un checkpoint (continúa desde esa iteración).
+        """
+        if resume is not None:
+            current_X, current_eff = resume["current_X"], resume["current_eff"]
+            best_X, best_eff = resume["best_X"], resume["best_eff"]
+            first_iteration = resume["iteration"]
+        else:
+            current_X = solution.copy()
+            current_eff = self._get_efficiency_fast(current_X)
+
+            best_X = current_X.copy()
+            best_eff = current_eff
+            history.append(best_eff)
+            first_iteration = 0
+        yield best_X, best_eff
+
+        # Huella Zobrist de la solución actual (solo con caché de evaluaciones)
+        current_fp = self.problem.fingerprint(current_X) if self.cache_size > 0 else None
+
+        for iteration in range(first_iteration, max_iterations):
+            if self._past_deadline():
+                break
+
+            self._maybe_checkpoint(start_time, lambda: {
+                "iteration": iteration, "history": history,
+                "current_X": current_X, "current_eff": current_eff,
+                "best_X": best_X, "best_eff": best_eff
+            })
+
+            # Generar vecino N^1 (cambiar 1 habilidad al azar)
+            skill_idx = self.rng.integers(0, self.problem.K)
+            if self.cache_size > 0:
+                neighbor_X, neighbor_fp = self._reassign_with_fingerprint(current_X, current_fp, skill_idx)
+                neighbor_eff = self._get_efficiency_cached(neighbor_X, neighbor_fp)
+            else:
+                neighbor_X = self._reassign_skill_group(current_X, skill_idx)
+                neighbor_eff = self._get_efficiency_fast(neighbor_X)
+
             # Criterio Greedy (Hill Climbing)
             if neighbor_eff > current_eff:
                 current_X = neighbor_X
                 current_eff = neighbor_eff
-                improved_step = True
-                
+                if self.cache_size > 0:
+                    current_fp = neighbor_fp
+
                 if current_eff > best_eff:
                     best_X = current_X.copy()
                     best_eff = current_eff
-            
-            if return_history:
-                history.append(best_eff)
-            
+                    history.append(best_eff)
+                    yield best_X, best_eff
+                    if self._reached_upper_bound(best_eff):
+                        return  # Óptimo probado: alcanzó la cota superior
+                    continue
+
+            history.append(best_eff)
+
             # Opcional: Si exploramos mucho sin mejorar, podríamos salir antes
             # pero el paper sugiere iteraciones fijas o hasta convergencia.
-        
-        if return_history:
-            return best_X, best_eff, history
-        return best_X, best_eff
\ No newline at end of file
@@ -1,3 +1,4 @@
+import hashlib
 import numpy as np
 from pymoo.core.problem import Problem
 from typing import Optional
@@ -17,6 +18,9 @@ class MTFP(Problem):
     - Each person has exactly one skill
     """
     
+    ZOBRIST_SEED = 0x5EED  # Fixed: equal solutions get equal fingerprints across processes
+    INCREMENTAL_OBJECTIVE = True  # _evaluate is the plain MTFP objective (see incremental_state)
+
     def __init__(self,
                  n_people: int,
                  n_projects: int,
@@ -25,7 +29,9 @@ class MTFP(Problem):
                  requirements: np.ndarray,
                  skill_of_person: np.ndarray,
                  project_weights: Optional[np.ndarray] = None,
-                 dedication_levels: Optional[np.ndarray] = None):
+                 dedication_levels: Optional[np.ndarray] = None,
+                 candidate_list_size: int = 10,
+                 integer_kernel: bool = True):
         """
         Initialize the MTFP problem.
         
@@ -47,6 +53,11 @@ class MTFP(Problem):
             Weights w_l for each project (default: equal weights)
         dedication_levels : Optional[np.ndarray]
             Allowed dedication levels (default: [0, 0.25, 0.5, 0.75, 1.0])
+        candidate_list_size : int
+            Length k of the per-person affinity candidate lists (top-k of S)
+        integer_kernel : bool
+            Use the exact integer evaluation path when levels, S and R lie on a
+            fixed grid (see _build_integer_kernel); otherwise evaluate in float
         """
         # Store dimensions
         self.H = int(n_people)
@@ -71,11 +82,14 @@ class MTFP(Problem):
             self.w = np.asarray(project_weights, dtype=float)
             self.w = self.w / self.w.sum()  # Normalize to sum to 1 as in paper
         
-        # Create skill groups for efficient constraint calculation
-        self.skill_groups = [np.where(self.skill_of_person == k)[0] for k in range(self.K)]
+        # Derived state (skill groups, requirement totals, candidate lists, ...)
+        self.candidate_list_size = int(candidate_list_size)
+        self.integer_kernel = bool(integer_kernel)
+        self._refresh_derived_state()
         
-        # Calculate total requirement per project (for efficiency denominator)
-        self.total_req_per_project = np.sum(self.R, axis=0)
+        # Change log for incremental re-optimization (see add_person, remove_person, ...)
+        self.version = 0
+        self._change_log = []
         
         # Number of variables: H * P (allocation of each person to each project)
         n_var = self.H * self.P
@@ -97,6 +111,475 @@ class MTFP(Problem):
         super().__init__(n_var=n_var, n_obj=n_obj, n_constr=n_constr,
                          xl=xl, xu=xu, type_var=np.int64)
     
+    def _refresh_derived_state(self):
+        """
+        (Re)compute every structure derived from S, R and skill_of_person.
+        Called on construction; instance updates (add_person, patch_affinity, ...)
+        only refresh the rows, columns and skills they touch.
+        """
+        # Create skill groups for efficient constraint calculation
+        self.skill_groups = [np.where(self.skill_of_person == k)[0] for k in range(self.K)]
+        
+        # Calculate total requirement per project (for efficiency denominator)
+        self.total_req_per_project = np.sum(self.R, axis=0)
+        
+        # Ranked affinity candidate lists (strongest relations first)
+        self.positive_candidates, self.negative_candidates = self._build_candidate_lists()
+        
+        # Exact integer evaluation data (None when the instance is not on a grid)
+        self.grid_units = self._build_integer_kernel() if self.integer_kernel else None
+        
+        self.zobrist = self._build_zobrist()
+        
+        # Interchangeable people (same skill, same relations): see _build_symmetry_classes
+        self._build_symmetry_classes()
+
+    def _build_zobrist(self) -> np.ndarray:
+        """
+        Zobrist table: one random 64-bit key per (person, project, level); level 0
+        has key 0, so a fingerprint is the XOR of the keys of the assigned cells.
+        Keys are drawn row by row from a fixed seed, so person i keeps its keys
+        whatever H is.
+        """
+        keys = np.random.default_rng(self.ZOBRIST_SEED).integers(
+            0, np.iinfo(np.uint64).max, size=(self.H, self.P, len(self.levels)),
+            dtype=np.uint64, endpoint=True)
+        keys[:, :, 0] = 0
+        return keys
+
+    def _build_integer_kernel(self):
+        """
+        Integer representation for instances on a fixed grid: when every level is a
+        multiple of 1/q (q = 4 for quarter units), S is integral and fits in int8, and
+        q*R is integral, allocations become small integers a = q*x and
+
+            x_l^T S x_l = (1/q^2) a_l^T S a_l
+
+        is computed exactly. Returns q, or None to fall back to float64.
+        """
+        for q in (1, 2, 4, 8, 16):
+            units = self.levels * q
+            if np.all(np.abs(units - np.round(units)) < 1e-9):
+                break
+        else:
+            return None
+        
+        R_units = self.R * q
+        if (np.any(np.abs(R_units - np.round(R_units)) > 1e-9)
+                or np.any(np.abs(self.S - np.round(self.S)) > 1e-9)
+                or (self.S.size and np.abs(self.S).max() > 127)):
+            return None
+        
+        self.level_units = np.round(units).astype(np.int16)
+        self.S_int = np.round(self.S).astype(np.int8)
+        self.R_units = np.round(R_units).astype(np.int64)
+        self.T_units = self.R_units.sum(axis=0)
+        self._build_skill_order()
+        return q
+
+    def _build_skill_order(self):
+        """People sorted by skill, to sum deliveries per skill with one reduceat."""
+        self._skill_order = np.argsort(self.skill_of_person, kind='stable')
+        counts = np.bincount(self.skill_of_person, minlength=self.K)
+        self._skill_starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[counts > 0]
+        self._staffed_skills = np.where(counts > 0)[0]
+
+    def _on_integer_grid(self, S_values=(), R_values=()) -> bool:
+        """Whether new S / R entries keep the instance on the integer kernel's grid."""
+        S_values = np.asarray(S_values, dtype=float)
+        R_units = np.asarray(R_values, dtype=float) * self.grid_units
+        return bool(np.all(np.abs(S_values - np.round(S_values)) <= 1e-9)
+                    and np.all(np.abs(S_values) <= 127)
+                    and np.all(np.abs(R_units - np.round(R_units)) <= 1e-9))
+
+    def _drop_integer_kernel(self):
+        """An update left the grid: evaluate in float64 from now on."""
+        self.grid_units = None
+        self._build_symmetry_classes()  # Twin candidates were read from S_int
+
+    def _build_symmetry_classes(self, chunk_size: int = 1024, skills=None):
+        """
+        Equivalence classes of interchangeable people: same skill, same S_ii and
+        identical S rows/columns outside the pair (i, j). Swapping the rows of two
+        such people in a solution leaves objective and constraints unchanged.
+        
+        For each candidate value c of S_ij, rows are hashed with the diagonal set
+        to c: rows i and j then match exactly when they are twins with S_ij = c.
+        Candidate values are read from the integer kernel; without it, only
+        c = 0 (people with no relation between them) is checked.
+        
+        Twins always share a skill, so classes are built per skill group in
+        O(|group| * H); 'skills' rebuilds only those groups and keeps the rest.
+        """
+        if skills is None or not hasattr(self, '_skill_classes'):
+            self._skill_classes = [[] for _ in range(self.K)]
+            skills = range(self.K)
+        
+        # Twins must be twins under every affinity matrix the objective uses
+        matrices = self._affinity_matrices()
+        for k in skills:
+            people = self.skill_groups[k]
+            classes = []
+            if len(people) > 1:
+                values = np.unique(self.S_int[people]) if self.grid_units is not None else np.array([0.0])
+                for c in values:
+                    groups = {}
+                    for start in range(0, len(people), chunk_size):
+                        rows = people[start:start + chunk_size]
+                        blocks = []
+                        for M in matrices:
+                            block = M[rows].copy()
+                            block[np.arange(len(rows)), rows] = c
+                            blocks.append(block)
+                        block = blocks[0] if len(blocks) == 1 else np.concatenate(blocks, axis=1)
+                        for i, row in zip(rows, block):
+                            key = (tuple(float(M[i, i]) for M in matrices),
+                                   hashlib.blake2b(row.tobytes(), digest_size=16).digest())
+                            groups.setdefault(key, []).append(i)
+                    classes.extend(np.array(members, dtype=int) for members in groups.values() if len(members) > 1)
+            self._skill_classes[k] = classes
+        self._index_symmetry_classes()
+
+    def _split_symmetry_classes(self, person: int, skills):
+        """
+        After adding 'person', twins in other groups stay twins only if they relate
+        equally to the new person: adding a column can split classes, never merge them.
+        """
+        relation = np.stack([M[:, person] for M in self._affinity_matrices()], axis=1)
+        for k in skills:
+            split = []
+            for members in self._skill_classes[k]:
+                _, label = np.unique(relation[members], axis=0, return_inverse=True)
+                label = label.ravel()
+                split.extend(members[label == v] for v in np.unique(label) if np.sum(label == v) > 1)
+            self._skill_classes[k] = split
+
+    def _index_symmetry_classes(self):
+        self.symmetry_classes = [c for k in range(self.K) for c in self._skill_classes[k]]
+        class_of = np.full(self.H, -1, dtype=int)
+        for idx, members in enumerate(self.symmetry_classes):
+            class_of[members] = idx
+        self.class_of_person = class_of  # -1: no interchangeable partner
+        # Members sorted by (class, index), per skill, for vectorized canonical forms
+        self._sym_members = [np.concatenate(self._skill_classes[k] or [np.zeros(0, dtype=int)])
+                             for k in range(self.K)]
+
+    def _affinity_matrices(self):
+        """Affinity matrices that enter the objective (one here; one per scenario in MultiScenarioMTFP)."""
+        return [self.S]
+
+    def canonical_form(self, X: np.ndarray, skills=None) -> np.ndarray:
+        """
+        Canonical representative of a solution under permutations of interchangeable
+        people: inside each symmetry class, rows are sorted in descending
+        lexicographic order. Equivalent solutions share the same canonical form
+        (and fingerprint). 'skills' restricts the work to those skill groups.
+        """
+        X = np.array(X, dtype=int)
+        if not self.symmetry_classes:
+            return X
+        alloc = X.reshape(self.H, self.P)
+        for k in (range(self.K) if skills is None else skills):
+            members = self._sym_members[k]
+            if len(members) == 0:
+                continue
+            rows = alloc[members]
+            keys = [-rows[:, p] for p in reversed(range(self.P))] + [self.class_of_person[members]]
+            alloc[members] = rows[np.lexsort(keys)]
+        return X
+
+    def canonical_fingerprints(self, X: np.ndarray) -> np.ndarray:
+        """Fingerprints of the canonical forms of a population (n_pop, n_var)."""
+        X = np.asarray(X, dtype=int).reshape(-1, self.n_var)
+        if not self.symmetry_classes:
+            return self.fingerprints(X)
+        return self.fingerprints(np.array([self.canonical_form(x) for x in X]))
+
+    def fingerprint(self, X: np.ndarray) -> int:
+        """Zobrist fingerprint of a solution (64-bit XOR of its assigned cells)."""
+        idx = np.asarray(X, dtype=int).reshape(self.H, self.P)
+        cells = self.zobrist[np.arange(self.H)[:, None], np.arange(self.P)[None, :], idx]
+        return int(np.bitwise_xor.reduce(cells, axis=None))
+
+    def fingerprints(self, X: np.ndarray) -> np.ndarray:
+        """Fingerprints of a population (n_pop, n_var) as uint64."""
+        idx = np.asarray(X, dtype=int).reshape(-1, self.H, self.P)
+        cells = self.zobrist[np.arange(self.H)[None, :, None], np.arange(self.P)[None, None, :], idx]
+        return np.bitwise_xor.reduce(cells.reshape(len(idx), -1), axis=1)
+
+    def update_fingerprint(self, fingerprint: int, X_old: np.ndarray, X_new: np.ndarray, rows) -> int:
+        """
+        Incremental update in O(len(rows) * P): only the rows (people) that a move
+        may have changed are re-hashed, e.g. one skill group for _reassign_skill_group.
+        """
+        rows = np.asarray(rows, dtype=int)
+        if len(rows) == 0:
+            return fingerprint
+        old = np.asarray(X_old, dtype=int).reshape(self.H, self.P)[rows]
+        new = np.asarray(X_new, dtype=int).reshape(self.H, self.P)[rows]
+        cols = np.arange(self.P)[None, :]
+        delta = self.zobrist[rows[:, None], cols, old] ^ self.zobrist[rows[:, None], cols, new]
+        return fingerprint ^ int(np.bitwise_xor.reduce(delta, axis=None))
+
+    def _decode_units(self, X: np.ndarray) -> np.ndarray:
+        """Decision variables -> integer allocation a = q*x, shape (n_pop, H, P)."""
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        idx = np.clip(np.round(X), 0, len(self.levels) - 1).astype(int)
+        return self.level_units[idx.reshape((X.shape[0], self.H, self.P))]
+
+    def quadratic_units(self, units: np.ndarray) -> np.ndarray:
+        """
+        Exact a_l^T S a_l per project (int64) for an integer allocation (H, P).
+        Only the team of each project (non-zero rows) enters the product.
+        """
+        Q = np.zeros(self.P, dtype=np.int64)
+        for l in range(self.P):
+            team = np.flatnonzero(units[:, l])
+            if len(team):
+                a = units[team, l].astype(np.int64)
+                Q[l] = a @ self.S_int[np.ix_(team, team)].astype(np.int64) @ a
+        return Q
+
+    def delivered_units(self, units: np.ndarray) -> np.ndarray:
+        """Exact Σ_{i in skill k} a_il per (skill, project), shape (K, P)."""
+        delivered = np.zeros((self.K, self.P), dtype=np.int64)
+        if len(self._skill_starts):
+            delivered[self._staffed_skills] = np.add.reduceat(
+                units[self._skill_order].astype(np.int64), self._skill_starts, axis=0)
+        return delivered
+
+    def _build_candidate_lists(self, chunk_size: int = 1024):
+        """
+        Per person, the indices of the k strongest positive and k strongest negative
+        relations in S (self excluded), sorted by strength and padded with -1.
+        Rows are processed in chunks so no H x H temporary is allocated.
+        """
+        k = min(self.candidate_list_size, max(self.H - 1, 0))
+        positive = np.full((self.H, k), -1, dtype=int)
+        negative = np.full((self.H, k), -1, dtype=int)
+        if k == 0:
+            return positive, negative
+        
+        for start in range(0, self.H, chunk_size):
+            rows = np.arange(start, min(start + chunk_size, self.H))
+            positive[rows], negative[rows] = self._rank_candidates(rows, k)
+        
+        return positive, negative
+
+    def _rank_candidates(self, rows: np.ndarray, k: int):
+        """Positive and negative candidate lists (len(rows), k) of the given people."""
+        block = self.S[rows].copy()
+        block[np.arange(len(rows)), rows] = 0.0  # Exclude self-affinity
+        
+        lists = []
+        for signed in (block, -block):
+            top = np.argpartition(-signed, k - 1, axis=1)[:, :k]
+            strength = np.take_along_axis(signed, top, axis=1)
+            order = np.argsort(-strength, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            strength = np.take_along_axis(strength, order, axis=1)
+            lists.append(np.where(strength > 0, top, -1))
+        return lists
+
+    def _update_candidate_lists(self, rows, chunk_size: int = 1024):
+        """Recompute only the candidate lists of 'rows' (people whose S row changed)."""
+        k = min(self.candidate_list_size, max(self.H - 1, 0))
+        if k != self.positive_candidates.shape[1]:
+            self.positive_candidates, self.negative_candidates = self._build_candidate_lists(chunk_size)
+            return
+        rows = np.unique(np.asarray(list(rows), dtype=int))
+        if k == 0 or len(rows) == 0:
+            return
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            self.positive_candidates[chunk], self.negative_candidates[chunk] = self._rank_candidates(chunk, k)
+
+    def candidate_affinity(self, people: np.ndarray, team_mask: np.ndarray) -> np.ndarray:
+        """
+        Affinity of each person in `people` to a team (boolean mask over H), using only
+        their candidate lists: sum of S over listed relations that are on the team.
+        Costs O(len(people) * k) instead of O(len(people) * H).
+        """
+        people = np.asarray(people, dtype=int)
+        on_team = np.append(np.asarray(team_mask, dtype=bool), False)  # index -1 -> padding
+        score = np.zeros(len(people))
+        for candidates in (self.positive_candidates[people], self.negative_candidates[people]):
+            valid = candidates >= 0
+            strength = np.where(valid, self.S[people[:, None], np.where(valid, candidates, 0)], 0.0)
+            score += (strength * on_team[candidates]).sum(axis=1)
+        return score
+
+    def _resize(self):
+        """Update the pymoo problem dimensions after adding/removing people."""
+        self.n_var = self.H * self.P
+        self.n_ieq_constr = self.H + self.K * self.P
+        self.data['n_constr'] = self.n_ieq_constr
+        self.xl = np.zeros(self.n_var, dtype=int)
+        self.xu = np.full(self.n_var, len(self.levels) - 1, dtype=int)
+
+    def _record_change(self, op: str, skills, **info):
+        self.version += 1
+        self._change_log.append({'version': self.version, 'op': op, 'skills': set(skills), **info})
+
+    # ------------------------------------------------------------------
+    # Instance updates (in place). Each update bumps self.version; use
+    # changes_since(version) / transfer_solution(X, version) to carry a
+    # solution from an older version of the instance to the current one.
+    # ------------------------------------------------------------------
+    def add_person(self, skill: int, affinities: Optional[np.ndarray] = None,
+                   self_affinity: float = 1.0) -> int:
+        """
+        Add a person with the given skill. 'affinities' (H,) are the S entries
+        with the current people (symmetric, default 0). Returns the new index.
+        """
+        row = np.zeros(self.H) if affinities is None else np.asarray(affinities, dtype=float)
+        if row.shape != (self.H,):
+            raise ValueError(f"affinities must have shape ({self.H},), got {row.shape}")
+        
+        S = np.zeros((self.H + 1, self.H + 1))
+        S[:self.H, :self.H] = self.S
+        S[self.H, :self.H] = row
+        S[:self.H, self.H] = row
+        S[self.H, self.H] = self_affinity
+        self.S = S
+        self.skill_of_person = np.append(self.skill_of_person, int(skill))
+        self.H += 1
+        self._resize()
+        
+        person = self.H - 1
+        related = np.flatnonzero(row)
+        self.skill_groups[skill] = np.append(self.skill_groups[skill], person)
+        padding = np.full((1, self.positive_candidates.shape[1]), -1, dtype=int)
+        self.positive_candidates = np.vstack([self.positive_candidates, padding])
+        self.negative_candidates = np.vstack([self.negative_candidates, padding])
+        self._update_candidate_lists(np.append(related, person))
+        self.zobrist = self._build_zobrist()
+        if self.grid_units is not None:
+            if self._on_integer_grid(S_values=np.append(row, self_affinity)):
+                S_int = np.zeros((self.H, self.H), dtype=np.int8)
+                S_int[:-1, :-1] = self.S_int
+                S_int[-1] = S_int[:, -1] = np.round(S[-1]).astype(np.int8)
+                self.S_int = S_int
+                self._build_skill_order()
+            else:
+                self._drop_integer_kernel()
+        # The new person's group is rebuilt; elsewhere twins can only split
+        self._split_symmetry_classes(person, self._skills_related_to(person) - {int(skill)})
+        self._build_symmetry_classes(skills=[int(skill)])
+        
+        self._record_change('add_person', [int(skill)], person=person)
+        return person
+
+    def remove_person(self, person: int):
+        """Remove a person. People with a larger index shift down by one."""
+        skill = int(self.skill_of_person[person])
+        affected = self._skills_related_to(person)
+        in_lists = np.flatnonzero((self.positive_candidates == person).any(axis=1)
+                                  | (self.negative_candidates == person).any(axis=1))
+        keep = np.arange(self.H) != person
+        self._restrict_affinities(keep)
+        self.skill_of_person = self.skill_of_person[keep]
+        self.H -= 1
+        self._resize()
+        
+        def shift(idx):
+            idx = idx[idx != person]
+            return np.where(idx > person, idx - 1, idx)
+        
+        self.skill_groups = [shift(g) for g in self.skill_groups]
+        self._skill_classes = [[shift(c) for c in classes] for classes in self._skill_classes]
+        for lists in (self.positive_candidates, self.negative_candidates):
+            lists[lists > person] -= 1
+        self.positive_candidates = self.positive_candidates[keep]
+        self.negative_candidates = self.negative_candidates[keep]
+        # Lists that held the removed person need a new k-th candidate
+        self._update_candidate_lists(shift(in_lists))
+        self.zobrist = self._build_zobrist()
+        if self.grid_units is not None:
+            self.S_int = self.S_int[np.ix_(keep, keep)]
+            self._build_skill_order()
+        self._build_symmetry_classes(skills=affected)
+        
+        self._record_change('remove_person', [skill], person=int(person))
+
+    def _restrict_affinities(self, keep: np.ndarray):
+        """Keep only the people selected by the mask 'keep' in every affinity matrix."""
+        self.S = self.S[np.ix_(keep, keep)]
+
+    def _skills_related_to(self, person: int) -> set:
+        """The person's skill and the skills of everyone with a non-zero relation to them."""
+        related = np.zeros(self.H, dtype=bool)
+        for M in self._affinity_matrices():
+            related |= M[:, person] != 0
+        return {int(self.skill_of_person[person])} | set(self.skill_of_person[related].tolist())
+
+    def update_requirement(self, skill: int, project: int, value: float):
+        """Set r_kl (required person-time of a skill for a project)."""
+        self.R[skill, project] = value
+        self.total_req_per_project[project] = self.R[:, project].sum()
+        if self.grid_units is not None:
+            if self._on_integer_grid(R_values=[value]):
+                self.R_units[skill, project] = round(value * self.grid_units)
+                self.T_units[project] = self.R_units[:, project].sum()
+            else:
+                self._drop_integer_kernel()
+        self._record_change('update_requirement', [int(skill)])
+
+    def patch_affinity(self, entries):
+        """
+        Patch S entries. 'entries' is an iterable of (i, j, value); the matrix
+        is kept symmetric. Requirements do not change, so every solution stays
+        feasible: no skill is reported by changes_since, only the objective moves.
+        """
+        people = set()
+        values = []
+        for i, j, value in entries:
+            self.S[i, j] = value
+            self.S[j, i] = value
+            people.update((int(i), int(j)))
+            values.append(value)
+        
+        self._update_candidate_lists(people)
+        if self.grid_units is not None:
+            if self._on_integer_grid(S_values=values):
+                rows = np.array(sorted(people), dtype=int)
+                self.S_int[rows] = np.round(self.S[rows]).astype(np.int8)
+                self.S_int[:, rows] = np.round(self.S[:, rows]).astype(np.int8)
+            else:
+                self._drop_integer_kernel()
+        # Only rows i and j changed: twins can only appear or vanish in their groups
+        self._build_symmetry_classes(skills={int(self.skill_of_person[i]) for i in people})
+        self._record_change('patch_affinity', [], people=sorted(people))
+
+    def changes_since(self, version: int) -> set:
+        """
+        Skills whose feasibility may be affected by the updates made after
+        'version' (people added/removed, requirements changed).
+        """
+        affected = set()
+        for change in self._change_log:
+            if change['version'] > version:
+                affected |= change['skills']
+        return affected
+
+    def transfer_solution(self, X: np.ndarray, version: int) -> np.ndarray:
+        """
+        Map a solution of an older version of the instance to the current
+        layout (dropping removed people, adding new people with no allocation).
+        The result may be infeasible for the affected skills; see
+        MTFP_BaseSolver.warm_start_solution for the repair.
+        """
+        alloc = np.asarray(X, dtype=int).reshape(-1, self.P)
+        for change in self._change_log:
+            if change['version'] <= version:
+                continue
+            if change['op'] == 'remove_person':
+                alloc = np.delete(alloc, change['person'], axis=0)
+            elif change['op'] == 'add_person':
+                alloc = np.vstack([alloc, np.zeros((1, self.P), dtype=int)])
+        return alloc.reshape(-1)
+    
     def _decode(self, X: np.ndarray) -> np.ndarray:
         """
         Convert decision variables (indices) to allocation matrix.
@@ -131,6 +614,10 @@ class MTFP(Problem):
         
         Note: pymoo minimizes, so we return -efficiency for maximization.
         """
+        if self.grid_units is not None:
+            self._evaluate_integer(X, out)
+            return
+        
         n_pop = X.shape[0]
         allocation = self._decode(X)  # Shape: (n_pop, H, P)
         
@@ -150,6 +637,31 @@ class MTFP(Problem):
         out["F"] = F
         out["G"] = G
     
+    def _evaluate_integer(self, X: np.ndarray, out: dict, epsilon: float = 1e-4):
+        """
+        Exact integer version of _evaluate. Same outputs and constraint layout;
+        violations are exact multiples of 1/q, so epsilon only keeps the sign
+        convention (g <= 0 feasible) identical to the float path.
+        """
+        q = self.grid_units
+        units = self._decode_units(X)
+        n_pop = units.shape[0]
+        
+        F = np.zeros((n_pop, 1))
+        G = np.zeros((n_pop, self.n_constr))
+        T2 = self.T_units ** 2
+        
+        for p in range(n_pop):
+            Q = self.quadratic_units(units[p])
+            e = np.where(T2 > 0, 0.5 * (1.0 + Q / np.where(T2 > 0, T2, 1)), 0.5)
+            F[p, 0] = -(self.w @ e)
+            
+            G[p, :self.H] = (units[p].sum(axis=1) - q) / q
+            G[p, self.H:] = np.abs(self.delivered_units(units[p]) - self.R_units).reshape(-1) / q - epsilon
+        
+        out["F"] = F
+        out["G"] = G
+
     def _calculate_global_efficiency(self, allocation: np.ndarray) -> float:
         """
         Calculate global efficiency E = Σ_l w_l * e_l.
@@ -221,7 +733,11 @@ class MTFP(Problem):
         return self._decode(X.reshape(1, -1))[0] if X.ndim == 1 else self._decode(X)
     
     def is_feasible(self, X: np.ndarray, tol: float = 1e-4) -> bool:
-        """Check if solution is feasible."""
+        """Check if solution is feasible (exact on the integer grid; tol is for float)."""
+        if self.grid_units is not None:
+            units = self._decode_units(X)[0]
+            return bool(np.all(units.sum(axis=1) <= self.grid_units)
+                        and np.array_equal(self.delivered_units(units), self.R_units))
         allocation = self.get_allocation_matrix(X)
         constraints = self._calculate_constraints(allocation, epsilon=tol)
         return np.all(constraints <= 0)
@@ -263,6 +779,440 @@ class MTFP(Problem):
             'requirements_per_project': self.total_req_per_project
         }
 
+    def incremental_state(self, X: np.ndarray) -> dict:
+        """
+        State for delta evaluation of moves that rewrite a few rows (people) of a
+        solution, e.g. one skill group: the allocation A (in grid units when the
+        integer kernel is active, so every product below is exact), SA = S @ A and
+        Q_l = a_l^T S a_l. See delta_efficiency / apply_delta.
+        """
+        if self.grid_units is not None:
+            A = self._decode_units(np.asarray(X))[0].astype(float)
+            T2 = (self.T_units ** 2).astype(float)
+        else:
+            A = self._decode(np.asarray(X))[0]
+            T2 = np.where(np.abs(self.total_req_per_project) < 1e-12, 0.0, self.total_req_per_project ** 2)
+        SA = self.S @ A
+        return {'A': A, 'SA': SA, 'Q': np.einsum('hp,hp->p', A, SA), 'T2': T2}
+
+    def _efficiency_from_quadratic(self, Q: np.ndarray, T2: np.ndarray) -> float:
+        e = np.where(T2 > 0, 0.5 * (1.0 + Q / np.where(T2 > 0, T2, 1)), 0.5)
+        return float(self.w @ e)
+
+    def state_efficiency(self, state: dict) -> float:
+        """Global efficiency of the solution held by an incremental state."""
+        return self._efficiency_from_quadratic(state['Q'], state['T2'])
+
+    def delta_efficiency(self, state: dict, rows, X_new: np.ndarray):
+        """
+        Efficiency of X_new, which equals the state's solution outside 'rows'.
+        With D = A_new - A on those rows:
+        
+            Q_l' = Q_l + 2 D_l·(SA)_rows,l + D_l^T S_rows,rows D_l
+        
+        in O(|rows|^2 P) instead of a full evaluation. Returns
+        (efficiency, Q_new, A_rows_new); pass the last two to apply_delta to commit.
+        """
+        rows = np.asarray(rows, dtype=int)
+        idx = np.asarray(X_new, dtype=int).reshape(self.H, self.P)[rows]
+        A_rows = (self.level_units[idx].astype(float) if self.grid_units is not None else self.levels[idx])
+        D = A_rows - state['A'][rows]
+        Q_new = state['Q'] + 2.0 * np.einsum('hp,hp->p', D, state['SA'][rows]) \
+            + np.einsum('hp,hp->p', D, self.S[np.ix_(rows, rows)] @ D)
+        return self._efficiency_from_quadratic(Q_new, state['T2']), Q_new, A_rows
+
+    def apply_delta(self, state: dict, rows, A_rows_new: np.ndarray, Q_new: np.ndarray):
+        """Commit a move scored by delta_efficiency: SA += S[:, rows] @ D in O(H |rows| P)."""
+        rows = np.asarray(rows, dtype=int)
+        D = A_rows_new - state['A'][rows]
+        state['SA'] += self.S[:, rows] @ D
+        state['A'][rows] = A_rows_new
+        state['Q'] = Q_new
+
+    def marginal_analysis(self, X: np.ndarray, SA: Optional[np.ndarray] = None) -> dict:
+        """
+        Vectorized what-if analysis for every (person, project) pair at once.
+        
+        With A the allocation, SA = S @ A (computed once, or passed in to reuse
+        a cached product) and a = A_il, removing person i from project l changes
+        the quadratic term by  -2·a·(SA)_il + S_ii·a².  Moving that same time to
+        a substitute j of the same skill adds  2·a·((SA)_jl - S_ji·a) + S_jj·a²,
+        feasible when j has a spare capacity ≥ a and A_jl + a is a valid level.
+        
+        Returns dictionary with (H x P) arrays:
+        - marginal_contribution: e_l - e_l(without i on l)
+        - removal_delta / removal_delta_global: change in e_l / in E if i leaves l
+        - best_substitute: best same-skill replacement j for i on l (-1 if none)
+        - substitute_delta / substitute_delta_global: change in e_l / in E when
+          i's time on l is handed to best_substitute (NaN if none)
+        """
+        A = self.get_allocation_matrix(X)
+        if SA is None:
+            SA = self.S @ A
+        
+        diag = np.diag(self.S)
+        scale = np.zeros(self.P)
+        has_req = np.abs(self.total_req_per_project) >= 1e-12
+        scale[has_req] = 0.5 / self.total_req_per_project[has_req] ** 2
+        
+        # 1. Removal of i from l (zero where i is not assigned to l)
+        removal_num = -2.0 * A * SA + diag[:, None] * A ** 2
+        removal_delta = removal_num * scale
+        
+        # 2. Best same-skill substitute, one skill block at a time
+        best_substitute = np.full((self.H, self.P), -1, dtype=int)
+        substitute_num = np.full((self.H, self.P), np.nan)
+        spare = 1.0 - A.sum(axis=1)
+        max_level = self.levels[-1]
+        # On an evenly spaced grid starting at 0 (the default levels) any sum
+        # of levels up to the maximum is itself a level
+        step = self.levels[1] - self.levels[0] if len(self.levels) > 1 else 0.0
+        uniform_grid = self.levels[0] == 0 and np.allclose(np.diff(self.levels), step)
+        
+        for people in self.skill_groups:
+            if len(people) < 2:
+                continue
+            
+            for l in range(self.P):
+                # Only people currently on l have something to hand over
+                givers = people[A[people, l] > 0]
+                if len(givers) == 0:
+                    continue
+                a = A[givers, l]
+                target = A[people, l][None, :] + a[:, None]
+                feasible = ((spare[people][None, :] >= a[:, None] - 1e-9) & (target <= max_level + 1e-9)
+                            & (givers[:, None] != people[None, :]))
+                if not uniform_grid:
+                    feasible &= np.isclose(target[..., None], self.levels).any(axis=-1)
+                
+                gain = (2.0 * a[:, None] * (SA[people, l][None, :] - self.S[np.ix_(givers, people)] * a[:, None])
+                        + diag[people][None, :] * (a ** 2)[:, None])
+                gain = np.where(feasible, gain, -np.inf)
+                
+                best = np.argmax(gain, axis=1)
+                best_gain = gain[np.arange(len(givers)), best]
+                found = np.isfinite(best_gain)
+                
+                best_substitute[givers[found], l] = people[best[found]]
+                substitute_num[givers[found], l] = removal_num[givers[found], l] + best_gain[found]
+        
+        substitute_delta = substitute_num * scale
+        
+        return {
+            'marginal_contribution': -removal_delta,
+            'removal_delta': removal_delta,
+            'removal_delta_global': removal_delta * self.w,
+            'best_substitute': best_substitute,
+            'substitute_delta': substitute_delta,
+            'substitute_delta_global': substitute_delta * self.w
+        }
+
+
+class MultiScenarioMTFP(MTFP):
+    """
+    One organisation under N scenarios: variants of the requirements R (e.g. next
+    quarter's demand) and/or of the sociometric matrix S (e.g. sampled answers of an
+    uncertain survey), solved together as a single robust problem.
+    
+    Everything that does not depend on the scenario is built once from the nominal
+    instance and shared: skill groups, candidate lists, Zobrist keys, the integer
+    grid, repairs and constraints (nominal R unless feasibility='all'). One
+    allocation is evaluated on all scenarios with a single batched product over
+    its team rows:
+    
+        Q[s, l] = a_l^T S_s a_l          (N x P, one matmul over the stacked S_s)
+        E[s]    = Σ_l w_l · 0.5 · (1 + Q[s, l] / T[s, l]^2)
+    
+    When only R varies, Q is computed once and shared by all scenarios. The
+    objective seen by pymoo and by every solver (through _evaluate) is the robust
+    efficiency: the probability-weighted mean ('expected') or the minimum
+    ('worst') of E over the scenarios.
+    
+    Instance updates (add_person, remove_person, update_requirement,
+    patch_affinity) apply to the nominal instance and to every scenario.
+    """
+    INCREMENTAL_OBJECTIVE = False  # The robust objective has no delta evaluation
+
+    def __init__(self,
+                 base: MTFP,
+                 requirements: Optional[np.ndarray] = None,
+                 affinities: Optional[np.ndarray] = None,
+                 probabilities: Optional[np.ndarray] = None,
+                 objective: str = "expected",
+                 feasibility: str = "nominal"):
+        """
+        Parameters:
+        -----------
+        base : MTFP
+            Nominal instance (people, skills, levels, weights, nominal S and R)
+        requirements : Optional[np.ndarray] (N x K x P)
+            Requirement scenarios (default: the nominal R in every scenario)
+        affinities : Optional[np.ndarray] (N x H x H)
+            Affinity scenarios (default: the nominal S in every scenario)
+        probabilities : Optional[np.ndarray] (N,)
+            Scenario probabilities for the expected objective (default: uniform)
+        objective : str
+            'expected' or 'worst'
+        feasibility : str
+            'nominal': requirement constraints use the nominal R;
+            'all': |delivered - r_kl| <= ε must hold in every scenario
+        """
+        if objective not in ("expected", "worst"):
+            raise ValueError(f"objective must be 'expected' or 'worst', got '{objective}'")
+        if feasibility not in ("nominal", "all"):
+            raise ValueError(f"feasibility must be 'nominal' or 'all', got '{feasibility}'")
+        if requirements is None and affinities is None:
+            raise ValueError("at least one of requirements or affinities is required")
+        
+        # Copied: instance updates modify the stacks in place
+        R_stack = None if requirements is None else np.array(requirements, dtype=float)
+        S_stack = None if affinities is None else np.array(affinities, dtype=float)
+        n = len(R_stack) if R_stack is not None else len(S_stack)
+        if R_stack is not None and R_stack.shape != (n, base.K, base.P):
+            raise ValueError(f"requirements must have shape (N, {base.K}, {base.P}), got {R_stack.shape}")
+        if S_stack is not None and S_stack.shape != (n, base.H, base.H):
+            raise ValueError(f"affinities must have shape ({n}, {base.H}, {base.H}), got {S_stack.shape}")
+        
+        self.n_scenarios = n
+        self.objective = objective
+        self.feasibility = feasibility
+        self.R_scenarios = np.repeat(base.R[None], n, axis=0) if R_stack is None else R_stack
+        self.S_scenarios = S_stack  # None: every scenario shares the nominal S
+        if probabilities is None:
+            self.probabilities = np.full(n, 1.0 / n)
+        else:
+            self.probabilities = np.asarray(probabilities, dtype=float)
+            self.probabilities = self.probabilities / self.probabilities.sum()
+        
+        super().__init__(base.H, base.P, base.K, base.S.copy(), base.R.copy(), base.skill_of_person.copy(),
+                         project_weights=base.w, dedication_levels=base.levels,
+                         candidate_list_size=base.candidate_list_size, integer_kernel=base.integer_kernel)
+
+    def _affinity_matrices(self):
+        if getattr(self, "S_scenarios", None) is None:
+            return [self.S]
+        return [self.S] + list(self.S_scenarios)
+
+    def _refresh_derived_state(self):
+        super()._refresh_derived_state()
+        self._refresh_scenario_state()
+
+    def _refresh_scenario_state(self):
+        """Scenario kernel data; rebuilt after every update (H, R or the grid scale may change)."""
+        # Allocations are scored in grid units (a = q*x) when the nominal instance
+        # is on a grid: products of small integers are exact in float64 and match
+        # MTFP._evaluate_integer bit for bit on the nominal scenario
+        scale = self.grid_units if self.grid_units is not None else 1
+        T = self.R_scenarios.sum(axis=1) * scale  # (N, P)
+        self._scenario_inv_T2 = np.divide(1.0, T ** 2, out=np.zeros_like(T), where=np.abs(T) >= 1e-12)
+        self._scenario_R = self.R_scenarios * scale
+        self._skill_onehot = (self.skill_of_person[None, :] == np.arange(self.K)[:, None]).astype(float)
+        # Stacked S scenarios as (N*H, H): row s*H + i is row i of scenario s
+        self._S_rows = None if self.S_scenarios is None else self.S_scenarios.reshape(-1, self.H)
+
+    # ------------------------------------------------------------------
+    # Instance updates: the nominal instance is updated as in MTFP and the
+    # change is carried to every scenario. A scenario keeps its own deviation
+    # from the nominal data unless explicit per-scenario values are given.
+    # ------------------------------------------------------------------
+    def add_person(self, skill: int, affinities: Optional[np.ndarray] = None,
+                   self_affinity: float = 1.0, scenario_affinities: Optional[np.ndarray] = None) -> int:
+        """
+        MTFP.add_person on every scenario. 'scenario_affinities' (N x H) gives the
+        new person's relations in each S scenario (default: the nominal ones).
+        """
+        row = np.zeros(self.H) if affinities is None else np.asarray(affinities, dtype=float)
+        if self.S_scenarios is not None:
+            rows = np.repeat(row[None], self.n_scenarios, axis=0) if scenario_affinities is None \
+                else np.asarray(scenario_affinities, dtype=float)
+            if rows.shape != (self.n_scenarios, self.H):
+                raise ValueError(f"scenario_affinities must have shape ({self.n_scenarios}, {self.H}), got {rows.shape}")
+            S = np.zeros((self.n_scenarios, self.H + 1, self.H + 1))
+            S[:, :self.H, :self.H] = self.S_scenarios
+            S[:, self.H, :self.H] = rows
+            S[:, :self.H, self.H] = rows
+            S[:, self.H, self.H] = self_affinity
+            # Grown first: the symmetry classes read every scenario's new column
+            self.S_scenarios = S
+        elif scenario_affinities is not None:
+            raise ValueError("scenario_affinities requires affinity scenarios")
+        
+        person = super().add_person(skill, affinities, self_affinity)
+        self._refresh_scenario_state()
+        return person
+
+    def remove_person(self, person: int):
+        """MTFP.remove_person on every scenario."""
+        super().remove_person(person)
+        self._refresh_scenario_state()
+
+    def _restrict_affinities(self, keep: np.ndarray):
+        super()._restrict_affinities(keep)
+        if self.S_scenarios is not None:
+            self.S_scenarios = self.S_scenarios[:, keep][:, :, keep]
+
+    def update_requirement(self, skill: int, project: int, value: float,
+                           scenario_values: Optional[np.ndarray] = None):
+        """
+        Set the nominal r_kl. Each scenario's r_kl moves by the same amount, or is
+        set to 'scenario_values' (N,) when given.
+        """
+        if scenario_values is None:
+            self.R_scenarios[:, skill, project] += value - self.R[skill, project]
+        else:
+            scenario_values = np.asarray(scenario_values, dtype=float)
+            if scenario_values.shape != (self.n_scenarios,):
+                raise ValueError(f"scenario_values must have shape ({self.n_scenarios},), got {scenario_values.shape}")
+            self.R_scenarios[:, skill, project] = scenario_values
+        super().update_requirement(skill, project, value)
+        self._refresh_scenario_state()
+
+    def patch_affinity(self, entries):
+        """
+        Patch nominal S entries (i, j, value); each S scenario's s_ij moves by the
+        same amount, so the sampled deviations are kept.
+        """
+        entries = list(entries)
+        if self.S_scenarios is not None:
+            S = self.S.copy()
+            for i, j, value in entries:
+                delta = value - S[i, j]
+                S[i, j] = S[j, i] = value
+                self.S_scenarios[:, i, j] += delta
+                if i != j:
+                    self.S_scenarios[:, j, i] += delta
+        super().patch_affinity(entries)
+        self._refresh_scenario_state()
+
+    def _scaled_allocation(self, X: np.ndarray) -> np.ndarray:
+        """Allocation (n_pop, H, P) in the units used by the scenario kernel."""
+        if self.grid_units is not None:
+            return self._decode_units(X).astype(float)
+        return self._decode(X)
+
+    def _scenario_kernel(self, A: np.ndarray):
+        """
+        Efficiency per scenario (N,) and delivered (K, P) of one scaled allocation A (H, P).
+        Only people with some allocation (the union of all teams) enter the product.
+        """
+        team = np.flatnonzero(A.any(axis=1))
+        A_t = A[team]
+        if self.S_scenarios is None:
+            Q = np.einsum('hp,hp->p', A_t, self.S[np.ix_(team, team)] @ A_t)[None, :]
+        else:
+            # Team rows of every scenario in one gather, then a single (N*t x t) @ (t x P)
+            rows = (np.arange(self.n_scenarios)[:, None] * self.H + team[None, :]).ravel()
+            SA = (self._S_rows[rows][:, team] @ A_t).reshape(self.n_scenarios, len(team), self.P)
+            Q = np.einsum('hp,nhp->np', A_t, SA)                # (N, P)
+        E = (0.5 + 0.5 * Q * self._scenario_inv_T2) @ self.w
+        return E, self._skill_onehot @ A
+
+    def _robust(self, E: np.ndarray) -> float:
+        return float(E.min()) if self.objective == "worst" else float(E @ self.probabilities)
+
+    def evaluate_scenarios(self, X: np.ndarray) -> dict:
+        """
+        Evaluate a population (n_pop, n_var) or one solution on every scenario.
+        
+        Returns dictionary with:
+        - efficiency: (n_pop, N) efficiency per scenario
+        - robust_efficiency: (n_pop,) expected or worst-case efficiency
+        - requirement_violation: (n_pop, N) max |delivered - r_kl| per scenario
+        - capacity_violation: (n_pop,) max over people of Σ_l x_il - 1 (≤ 0 feasible)
+        """
+        A = self._scaled_allocation(np.asarray(X))
+        scale = self.grid_units if self.grid_units is not None else 1
+        n_pop = A.shape[0]
+        E = np.zeros((n_pop, self.n_scenarios))
+        violation = np.zeros((n_pop, self.n_scenarios))
+        for p in range(n_pop):
+            E[p], delivered = self._scenario_kernel(A[p])
+            violation[p] = np.abs(delivered[None] - self._scenario_R).max(axis=(1, 2)) / scale
+        return {
+            'efficiency': E,
+            'robust_efficiency': np.array([self._robust(e) for e in E]),
+            'requirement_violation': violation,
+            'capacity_violation': (A.sum(axis=2) - scale).max(axis=1) / scale
+        }
+
+    def _evaluate(self, X: np.ndarray, out: dict, *args, epsilon: float = 1e-4, **kwargs):
+        """Robust objective (negated for pymoo) with the MTFP constraint layout."""
+        scale = self.grid_units if self.grid_units is not None else 1
+        A = self._scaled_allocation(X)
+        n_pop = A.shape[0]
+        
+        F = np.zeros((n_pop, 1))
+        G = np.zeros((n_pop, self.n_constr))
+        for p in range(n_pop):
+            E, delivered = self._scenario_kernel(A[p])
+            F[p, 0] = -self._robust(E)
+            
+            G[p, :self.H] = (A[p].sum(axis=1) - scale) / scale
+            if self.feasibility == "all":
+                gap = np.abs(delivered[None] - self._scenario_R).max(axis=0)
+            else:
+                gap = np.abs(delivered - self.R * scale)
+            G[p, self.H:] = gap.reshape(-1) / scale - epsilon
+        
+        out["F"] = F
+        out["G"] = G
+
+    def is_feasible(self, X: np.ndarray, tol: float = 1e-4) -> bool:
+        out = {}
+        self._evaluate(np.asarray(X).reshape(1, -1), out, epsilon=tol)
+        return bool(np.all(out["G"] <= 1e-9))
+
+    def evaluate_solution(self, X: np.ndarray) -> dict:
+        """
+        MTFP.evaluate_solution on the nominal instance, plus the scenario results.
+        'efficiency' is the robust efficiency; the nominal one is kept apart.
+        """
+        result = super().evaluate_solution(X)
+        scenarios = self.evaluate_scenarios(np.asarray(X).reshape(1, -1))
+        result['nominal_efficiency'] = result['efficiency']
+        result['efficiency'] = float(scenarios['robust_efficiency'][0])
+        result['scenario_efficiencies'] = scenarios['efficiency'][0]
+        result['scenario_requirement_violations'] = scenarios['requirement_violation'][0]
+        if self.feasibility == "all":
+            result['feasible'] = bool(result['feasible'] and np.all(scenarios['requirement_violation'][0] <= 1e-4))
+        return result
+
+    def scenario(self, s: int) -> MTFP:
+        """Scenario s as a standalone MTFP instance."""
+        S = self.S if self.S_scenarios is None else self.S_scenarios[s]
+        return MTFP(self.H, self.P, self.K, S.copy(), np.array(self.R_scenarios[s]), self.skill_of_person.copy(),
+                    project_weights=self.w, dedication_levels=self.levels,
+                    candidate_list_size=self.candidate_list_size, integer_kernel=self.integer_kernel)
+
+
+def sample_scenarios(problem: MTFP, n_scenarios: int, requirement_noise: float = 0.0,
+                     affinity_flip: float = 0.0, seed: Optional[int] = None):
+    """
+    Random scenario stacks around a nominal instance.
+    
+    - requirement_noise: each r_kl moves by a normal step of this std (in person-time),
+      rounded to the smallest dedication level step and clipped at 0
+    - affinity_flip: probability that each off-diagonal relation i-j is redrawn
+      uniformly from {-1, 0, +1} (symmetric, diagonal kept)
+    
+    Returns (requirements, affinities); either is None when its noise is 0.
+    """
+    rng = np.random.default_rng(seed)
+    requirements = affinities = None
+    if requirement_noise > 0:
+        step = np.min(np.diff(problem.levels)) if len(problem.levels) > 1 else 1.0
+        noise = rng.normal(0.0, requirement_noise, size=(n_scenarios,) + problem.R.shape)
+        requirements = np.maximum(0.0, np.round((problem.R + noise) / step) * step)
+    if affinity_flip > 0:
+        iu = np.triu_indices(problem.H, k=1)
+        affinities = np.repeat(problem.S[None], n_scenarios, axis=0)
+        for S in affinities:
+            flip = rng.random(len(iu[0])) < affinity_flip
+            values = rng.integers(-1, 2, size=int(flip.sum())).astype(float)
+            S[iu[0][flip], iu[1][flip]] = values
+            S[iu[1][flip], iu[0][flip]] = values
+    return requirements, affinities
+
 
 def create_mtfp_problem(n_people: int = 20, 
                                n_projects: int = 3, 
@@ -326,6 +1276,39 @@ def create_mtfp_problem(n_people: int = 20,
     )
     return problem, skill_names, project_names, skill_counts, S, R
 
+def zobrist_collision_rate(problem: MTFP, n_solutions: int = 200000, bits: int = 64,
+                           seed: Optional[int] = None) -> dict:
+    """
+    Empirical collision test for the Zobrist fingerprints: hashes a large random
+    population, truncated to `bits` bits, and compares the number of colliding
+    pairs of distinct solutions against the birthday-bound expectation n^2 / 2^(bits+1).
+    """
+    rng = np.random.default_rng(seed)
+    mask = np.uint64((1 << bits) - 1) if bits < 64 else np.uint64(np.iinfo(np.uint64).max)
+    
+    seen = {}
+    collisions = duplicates = 0
+    batch = 10000
+    for start in range(0, n_solutions, batch):
+        X = rng.integers(0, len(problem.levels), size=(min(batch, n_solutions - start), problem.n_var))
+        for x, h in zip(X, problem.fingerprints(X) & mask):
+            key = hashlib.blake2b(x.tobytes(), digest_size=16).digest()  # Independent identity
+            previous = seen.setdefault(int(h), key)
+            if previous is not key:
+                if previous == key:
+                    duplicates += 1  # Same solution drawn twice: not a collision
+                else:
+                    collisions += 1
+    
+    distinct = n_solutions - duplicates
+    return {
+        'n_solutions': n_solutions,
+        'bits': bits,
+        'collisions': collisions,
+        'expected_collisions': distinct * (distinct - 1) / 2 ** (bits + 1),
+        'collision_rate': collisions / max(distinct, 1)
+    }
+
 def explain_mtfp_problem(problem, skill_names, project_names, skill_counts, S, R):
     """
     Print a visual explanation for an existing MTFP problem instance.
@@ -1,13 +1,176 @@
 import numpy as np
 import time
 
+from SolutionResult import ImprovementEvent
+from Algorithm.Checkpoint import CheckpointWriter, load_checkpoint, remove_checkpoint
+
 class MTFP_BaseSolver:
     """
     Implementa la heurística constructiva basada en la descomposición por habilidades
+
+    API de ejecución:
+    - iter_solve(...): generador que emite un ImprovementEvent por cada mejora y
+      retorna (StopIteration.value) el SolutionResult final. El consumidor puede
+      cancelar con cancel(gen), que detiene la búsqueda y retorna lo mejor hallado.
+    - aiter_solve(...): versión async-generator de iter_solve; al terminar, el
+      SolutionResult final queda en solver.last_result.
+    - solve(...): envoltorio bloqueante que consume iter_solve.
+
+    Checkpoints: con checkpoint_path, los iter_solve guardan cada checkpoint_interval
+    segundos un snapshot del estado del bucle (soluciones, memorias, historial y
+    estado del RNG). Si el archivo existe al iniciar, la corrida se reanuda desde
+    él y sigue exactamente la misma trayectoria que una corrida sin interrupción.
+
+    affinity_bias: probabilidad (0..1) de que _reassign_skill_group ordene los
+    candidatos de cada proyecto por afinidad con el equipo actual (listas de
+    candidatos de MTFP) en vez de usar el orden aleatorio. Con 0 (por defecto)
+    el comportamiento es el original.
+
+    cache_size: tamaño de la caché de evaluaciones indexada por la huella Zobrist de
+    la solución (ver _get_efficiency_cached); 0 la desactiva.
+
+    upper_bound: cota superior de la eficiencia (p. ej. efficiency_upper_bound de
+    BranchAndBound). Si se entrega, la búsqueda se detiene al alcanzarla, ya que
+    la solución es óptima.
+
+    deadline: instante absoluto (time.time()) tras el cual los iter_solve terminan
+    con lo mejor hallado; lo fija quien ejecuta el solver (p. ej. solver_service).
+
+    stop_check: función sin argumentos que los bucles consultan en cada iteración
+    (junto al deadline); si retorna True el iter_solve termina con lo mejor hallado.
+    Permite a un coordinador (MultiStart, Portfolio) detener una trayectoria entre
+    eventos sin trocearla en corridas separadas.
     """
-    def __init__(self, problem, seed=None):
+    def __init__(self, problem, seed=None, affinity_bias=0.0, upper_bound=None, cache_size=0):
         self.problem = problem
         self.rng = np.random.default_rng(seed)
+        self.affinity_bias = affinity_bias
+        self.upper_bound = upper_bound
+        self.deadline = None
+        self.stop_check = None
+        # Caché de evaluaciones por huella Zobrist (cache_size=0 la desactiva)
+        self.cache_size = cache_size
+        self.eval_cache = {}
+        self.cache_hits = 0
+        self.nfe = 0  # Número de evaluaciones de la función objetivo
+        self.last_result = None  # SolutionResult de la última corrida de aiter_solve
+        self._checkpoint = None
+
+    def iter_solve(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def solve(self, *args, **kwargs):
+        """Ejecuta iter_solve hasta el final y retorna el SolutionResult."""
+        gen = self.iter_solve(*args, **kwargs)
+        while True:
+            try:
+                next(gen)
+            except StopIteration as stop:
+                return stop.value
+
+    @staticmethod
+    def cancel(gen):
+        """
+        Cancela un iter_solve en curso (debe estar detenido en un evento)
+        y retorna el SolutionResult con la mejor solución hallada hasta ahora.
+        """
+        try:
+            gen.send(True)
+        except StopIteration as stop:
+            return stop.value
+        gen.close()
+        return None
+
+    async def aiter_solve(self, *args, **kwargs):
+        """
+        Versión asíncrona: cada paso del generador corre en el executor por defecto,
+        así el event loop no se bloquea. Cerrar el async-generator cierra la búsqueda.
+        Un async-generator no puede retornar un valor: el SolutionResult final que
+        retorna iter_solve queda en self.last_result (None si se cerró antes).
+        """
+        import asyncio  # Solo los servicios asíncronos pagan su importación
+
+        loop = asyncio.get_running_loop()
+        gen = self.iter_solve(*args, **kwargs)
+        done = object()
+
+        def step():
+            try:
+                return next(gen), None
+            except StopIteration as stop:
+                return done, stop.value
+
+        self.last_result = None
+        try:
+            while True:
+                event, result = await loop.run_in_executor(None, step)
+                if event is done:
+                    self.last_result = result
+                    break
+                yield event
+        finally:
+            try:
+                gen.close()
+            except ValueError:
+                pass  # El paso en curso sigue en el hilo del executor
+
+    def _start_checkpointing(self, checkpoint_path, checkpoint_interval):
+        """Activa los snapshots periódicos y retorna el estado a reanudar (o None)."""
+        self._checkpoint = CheckpointWriter(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+        state = load_checkpoint(checkpoint_path)
+        if state is not None:
+            if state["solver"] != type(self).__name__:
+                raise ValueError(f"El checkpoint '{checkpoint_path}' es de {state['solver']}, "
+                                 f"no de {type(self).__name__}")
+            self._set_random_state(state["random_state"])
+        return state
+
+    def _maybe_checkpoint(self, start_time, make_state):
+        """
+        Guarda un snapshot si ya pasó el intervalo. Debe llamarse al INICIO de una
+        iteración (antes de consumir números aleatorios) para que la reanudación sea exacta.
+        """
+        if self._checkpoint is not None and self._checkpoint.due():
+            state = make_state()
+            state.update({
+                "solver": type(self).__name__,
+                "elapsed": time.time() - start_time,
+                "random_state": self._get_random_state()
+            })
+            self._checkpoint.save(state)
+
+    def _finish_checkpointing(self):
+        if self._checkpoint is not None:
+            remove_checkpoint(self._checkpoint.path)
+            self._checkpoint = None
+
+    def _get_random_state(self):
+        return {"rng": self.rng.bit_generator.state, "nfe": self.nfe}
+
+    def _set_random_state(self, random_state):
+        self.rng.bit_generator.state = random_state["rng"]
+        self.nfe = random_state["nfe"]
+
+    def _improvement_event(self, start_time, iteration, efficiency, X, include_allocation=False):
+        """Construye el evento de mejora que emiten los iter_solve()."""
+        return ImprovementEvent(
+            elapsed=time.time() - start_time,
+            nfe=self.total_nfe(),
+            efficiency=efficiency,
+            iteration=iteration,
+            X=X,
+            allocation=self.problem.get_allocation_matrix(X) if include_allocation else None
+        )
+
+    def _past_deadline(self) -> bool:
+        """Condición de término externa: plazo vencido o stop_check() verdadero."""
+        if self.stop_check is not None and self.stop_check():
+            return True
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def _reached_upper_bound(self, efficiency, tol=1e-9) -> bool:
+        """Test de término anticipado: la eficiencia alcanzó la cota superior (óptimo probado)."""
+        return self.upper_bound is not None and efficiency >= self.upper_bound - tol
 
     def _construct_feasible_solution(self) -> np.ndarray:
         """Genera una solución inicial factible desde cero."""
@@ -16,6 +179,82 @@ class MTFP_BaseSolver:
             sol = self._reassign_skill_group(sol, k)
         return sol
 
+    def _initial_solution(self, initial_solution=None, initial_version=None) -> np.ndarray:
+        """
+        Solución de partida de los iter_solve: construida desde cero, la provista por
+        el llamador o, si viene de una versión anterior de la instancia
+        (initial_version != problem.version), una reoptimización en caliente.
+        """
+        if initial_solution is None:
+            return self._construct_feasible_solution()
+        if initial_version is not None and initial_version != self.problem.version:
+            return self.warm_start_solution(initial_solution, initial_version)
+        return initial_solution.copy()
+
+    def warm_start_solution(self, previous_solution, version) -> np.ndarray:
+        """
+        Lleva una solución de la versión 'version' de la instancia a la actual:
+        reubica las filas (personas agregadas/eliminadas) y repara SOLO los grupos
+        de habilidad afectados por los cambios; el resto queda intacto.
+        """
+        X = self.problem.transfer_solution(previous_solution, version)
+        for skill_idx in sorted(self.problem.changes_since(version)):
+            X = self._repair_skill_group(X, skill_idx)
+        return X
+
+    def _repair_skill_group(self, solution: np.ndarray, skill_idx: int) -> np.ndarray:
+        """
+        Reparación mínima de un grupo de habilidad: conserva las asignaciones
+        existentes y ajusta nivel a nivel hasta cumplir r_kl en cada proyecto.
+        - Exceso: se reduce a quien menos afinidad tiene con el equipo (S x_l)_i.
+        - Déficit: se agrega a quien tiene capacidad y más afinidad con el equipo.
+        Si no se logra la factibilidad exacta, se reconstruye el grupo completo.
+        """
+        alloc = self.problem.get_allocation_matrix(solution)
+        people = self.problem.skill_groups[skill_idx]
+        levels = self.problem.levels
+        S = self.problem.S
+        
+        if len(people) == 0:
+            return self._reassign_skill_group(solution, skill_idx)
+        
+        for l in range(self.problem.P):
+            req = self.problem.R[skill_idx, l]
+            delivered = alloc[people, l].sum()
+            
+            # Exceso: bajar un nivel a la persona de menor afinidad con el equipo
+            while delivered > req + 1e-6:
+                on_project = people[alloc[people, l] > 0]
+                affinity = S[on_project] @ alloc[:, l]
+                person = on_project[np.argmin(affinity)]
+                level_idx = np.searchsorted(levels, alloc[person, l] - 1e-9)
+                lower = levels[level_idx - 1]
+                if alloc[person, l] - lower > delivered - req + 1e-6:
+                    break  # Bajar un nivel dejaría el proyecto por debajo de r_kl
+                delivered -= alloc[person, l] - lower
+                alloc[person, l] = lower
+            
+            # Déficit: subir un nivel a la persona con capacidad y mayor afinidad
+            while delivered < req - 1e-6:
+                current = alloc[people, l]
+                level_idx = np.searchsorted(levels, current - 1e-9)
+                can_grow = level_idx < len(levels) - 1
+                step = np.where(can_grow, levels[np.minimum(level_idx + 1, len(levels) - 1)] - current, np.inf)
+                spare = 1.0 - alloc[people].sum(axis=1)
+                fits = can_grow & (step <= spare + 1e-6) & (step <= req - delivered + 1e-6)
+                if not np.any(fits):
+                    break
+                affinity = np.where(fits, S[people] @ alloc[:, l], -np.inf)
+                best = np.argmax(affinity)
+                alloc[people[best], l] += step[best]
+                delivered += step[best]
+            
+            if abs(delivered - req) > 1e-6:
+                # La granularidad de los niveles no permitió reparar: reconstruir el grupo
+                return self._reassign_skill_group(self._encode(alloc), skill_idx)
+        
+        return self._encode(alloc)
+
 
     def _reassign_skill_group(self, solution: np.ndarray, skill_idx: int) -> np.ndarray:
         """
@@ -39,6 +278,7 @@ class MTFP_BaseSolver:
         # Lista de candidatos base (se baraja para estocasticidad)
         candidates = list(people_idxs)
         self.rng.shuffle(candidates)
+        shuffled = np.array(candidates, dtype=int)
         
         for p_idx in range(self.problem.P):
             req = self.problem.R[skill_idx, p_idx]
@@ -46,6 +286,14 @@ class MTFP_BaseSolver:
             
             current_fill = 0.0
             
+            # Sesgo por afinidad: primero quienes tienen relaciones positivas con el
+            # equipo ya formado en este proyecto (empates conservan el orden aleatorio)
+            if self.affinity_bias > 0 and len(shuffled) and self.rng.random() < self.affinity_bias:
+                score = self.problem.candidate_affinity(shuffled, alloc_matrix[:, p_idx] > 0)
+                candidates = shuffled[np.argsort(-score, kind='stable')].tolist()
+            else:
+                candidates = shuffled.tolist()
+            
             # Intentamos llenar el requerimiento con los candidatos disponibles
             # Barajamos de nuevo para cada proyecto para evitar sesgos de orden? 
             # El paper no especifica, pero barajar solo una vez al inicio (como tenías)
@@ -80,18 +328,46 @@ class MTFP_BaseSolver:
                     # Actualizar capacidad restante
                     remaining_capacity[person_idx] -= best_level
 
-        # 4. Codificar de vuelta
-        return self._encode(alloc_matrix)
+        # 4. Codificar de vuelta, en forma canónica para las personas intercambiables
+        # del grupo (soluciones equivalentes quedan representadas por una sola)
+        return self.problem.canonical_form(self._encode(alloc_matrix), skills=[skill_idx])
     
 
 
     def _get_efficiency_fast(self, X_indices):
         """Evaluación rápida (solo escalar F)."""
+        self.nfe += 1
         X_reshaped = X_indices.reshape(1, -1)
         out = {}
         self.problem._evaluate(X_reshaped, out)
         return -out["F"][0, 0] # Convertir minimización a maximización
 
+    def _get_efficiency_cached(self, X_indices, fingerprint):
+        """
+        Evaluación con caché por huella Zobrist: una solución ya visitada no se
+        vuelve a evaluar (ni cuenta en nfe). Al llenarse, la caché se vacía.
+        """
+        if self.cache_size <= 0:
+            return self._get_efficiency_fast(X_indices)
+        eff = self.eval_cache.get(fingerprint)
+        if eff is not None:
+            self.cache_hits += 1
+            return eff
+        if len(self.eval_cache) >= self.cache_size:
+            self.eval_cache.clear()
+        eff = self.eval_cache[fingerprint] = self._get_efficiency_fast(X_indices)
+        return eff
+
+    def _reassign_with_fingerprint(self, solution, fingerprint, skill_idx):
+        """_reassign_skill_group que además actualiza la huella en O(|grupo| * P)."""
+        neighbor = self._reassign_skill_group(solution, skill_idx)
+        return neighbor, self.problem.update_fingerprint(
+            fingerprint, solution, neighbor, self.problem.skill_groups[skill_idx])
+
+    def total_nfe(self) -> int:
+        """Evaluaciones totales del solver (incluye motores internos si los hay)."""
+        return self.nfe
+
     def _encode(self, alloc_matrix: np.ndarray) -> np.ndarray:
         """Helper: Matriz -> Índices"""
         X_flat = []
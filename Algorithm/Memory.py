@@ -0,0 +1,134 @@
+import os
+import sys
+import pickle
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _read_status_kb(field):
+    """Valor (kB) de un campo de /proc/self/status (Linux), o None."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reinicia el pico de RSS del proceso (Linux >= 4.0, escribiendo 5 en clear_refs).
+    En un worker reutilizado permite medir el pico de cada tarea y no el de toda su vida.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """Pico de memoria residente del proceso en MB (desde el último reset si fue posible)."""
+    hwm = _read_status_kb("VmHWM")
+    if hwm is not None:
+        return hwm / 1024.0
+    if resource is None:
+        return None
+    # ru_maxrss: kB en Linux, bytes en macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024.0 ** 2) if sys.platform == "darwin" else maxrss / 1024.0
+
+
+def available_memory_mb():
+    """Memoria disponible del sistema en MB (MemAvailable de /proc/meminfo), o None."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024.0 ** 2)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def payload_mb(obj):
+    """Tamaño serializado (pickle) de un objeto en MB: lo que viaja de vuelta al proceso padre."""
+    return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)) / (1024.0 ** 2)
+
+
+class MemoryTracker:
+    """
+    Mide la memoria de un bloque de código:
+
+        with MemoryTracker(trace=True) as mem:
+            result = solver.solve(...)
+        result.extra.update(mem.report())
+
+    - peak_rss_mb: pico de RSS del proceso durante el bloque (reinicia el pico al entrar
+      cuando el sistema lo permite; si no, es el pico de la vida del proceso).
+    - tracemalloc_peak_mb / top_allocations (trace=True): pico de memoria asignada por
+      Python y las 'top' líneas que más memoria retienen al final del bloque.
+      tracemalloc agrega un costo de tiempo notable, por eso es opcional.
+    """
+    def __init__(self, trace=False, top=5):
+        self.trace = trace
+        self.top = top
+        self.peak_reset = False
+        self.stats = {}
+
+    def __enter__(self):
+        self.peak_reset = reset_peak_rss()
+        self._started_trace = self.trace and not tracemalloc.is_tracing()
+        if self._started_trace:
+            tracemalloc.start()
+        if self.trace:
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats["peak_rss_mb"] = peak_rss_mb()
+        self.stats["peak_rss_per_task"] = self.peak_reset
+        if self.trace:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ])
+            _, peak = tracemalloc.get_traced_memory()
+            self.stats["tracemalloc_peak_mb"] = peak / (1024.0 ** 2)
+            self.stats["top_allocations"] = [
+                f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno} "
+                f"{stat.size / (1024.0 ** 2):.2f} MB ({stat.count} bloques)"
+                for stat in snapshot.statistics("lineno")[:self.top]
+            ]
+            if self._started_trace:
+                tracemalloc.stop()
+        return False
+
+    def report(self):
+        return dict(self.stats)
+
+
+def estimate_task_memory_mb(algo_type, problem, params):
+    """
+    Estimación gruesa de la memoria de una tarea del benchmark (MB), para que el
+    planificador limite cuántas tareas pesadas corren a la vez.
+
+    El GA guarda el historial completo (save_history=True): una copia del algoritmo
+    con población y descendencia (~2 x pop_size soluciones de H*P enteros) por generación.
+    """
+    solution_mb = problem.H * problem.P * 8 / (1024.0 ** 2)
+    instance_mb = (problem.H * problem.H * 8) / (1024.0 ** 2)
+    if algo_type == "GA":
+        return instance_mb + 2 * params["pop_size"] * solution_mb * (params["n_gen"] + 1)
+    # Trayectorias: un puñado de soluciones más la historia de eficiencias
+    return instance_mb + 10 * solution_mb
@@ -0,0 +1,211 @@
+import time
+import queue
+import multiprocessing
+
+import numpy as np
+
+from Algorithm.LS import LS
+from Algorithm.TabuSearch import TabuSearch
+from Algorithm.VNS import VNS
+from SolutionResult import SolutionResult
+
+
+TRAJECTORY_SOLVERS = {
+    "LS": LS,
+    "Tabu": TabuSearch,
+    "VNS": VNS,
+}
+
+# Qué hace un trabajador cuando su trayectoria queda a más de 'gap' del incumbente:
+# - "adopt": continúa desde la mejor solución global
+# - "cancel": abandona la trayectoria y toma un nuevo arranque
+# - "independent": ignora al incumbente (equivale a N corridas independientes)
+POLICIES = ("adopt", "cancel", "independent")
+
+
+def _multistart_worker(worker_id, problem, algo_type, algo_params, seed, n_starts,
+                       trajectory_iterations, sync_iterations, policy, gap,
+                       target_efficiency, deadline, start_time,
+                       shared_eff, shared_X, start_counter, stop_event, event_queue):
+    """
+    Trabajador: toma arranques del contador compartido hasta agotarlos. Cada
+    trayectoria es UN iter_solve del solver (conserva su memoria tabú, su k de VNS,
+    etc.); publica cada mejora en el incumbente global (memoria compartida) y, cada
+    'sync_iterations' iteraciones, lo compara con su mejor valor mediante stop_check.
+    Si queda a más de 'gap', la trayectoria se detiene: con "adopt" continúa como un
+    nuevo iter_solve desde el incumbente (con las iteraciones restantes), con
+    "cancel" se abandona.
+    """
+    stats = {"worker": worker_id, "starts": 0, "adopted": 0, "cancelled": 0, "nfe": 0}
+
+    def should_stop():
+        return stop_event.is_set() or (deadline is not None and time.time() >= deadline)
+
+    def publish(eff, X):
+        """Registra una mejora propia; retorna la eficiencia del incumbente."""
+        with shared_eff.get_lock():
+            if eff > shared_eff.value and problem.is_feasible(X):
+                shared_eff.value = eff
+                shared_X[:] = np.asarray(X, dtype=int).tolist()
+                event_queue.put(("improvement", time.time() - start_time, eff))
+            return shared_eff.value
+
+    while not should_stop():
+        # Reclamar un arranque del presupuesto global
+        with start_counter.get_lock():
+            start_id = start_counter.value
+            if start_id >= n_starts:
+                break
+            start_counter.value += 1
+
+        stats["starts"] += 1
+        solver = TRAJECTORY_SOLVERS[algo_type](problem, seed=seed + start_id)
+        initial_X = solver._construct_feasible_solution()
+        trajectory = {"iterations": 0, "best": -np.inf, "behind": False}
+
+        def stop_check():
+            # Una llamada por iteración del solver
+            trajectory["iterations"] += 1
+            if should_stop() or trajectory["iterations"] > trajectory_iterations:
+                return True
+            if policy != "independent" and trajectory["iterations"] % sync_iterations == 0:
+                trajectory["behind"] = shared_eff.value - trajectory["best"] > gap
+                return trajectory["behind"]
+            return False
+
+        solver.stop_check = stop_check
+        while True:
+            trajectory["behind"] = False
+            remaining = trajectory_iterations - trajectory["iterations"]
+            if remaining <= 0:
+                break
+            gen = solver.iter_solve(max_iterations=remaining, initial_solution=initial_X,
+                                    verbose=False, **algo_params)
+            while True:
+                try:
+                    event = next(gen)
+                except StopIteration:
+                    break
+                trajectory["best"] = max(trajectory["best"], event.efficiency)
+                incumbent_eff = publish(event.efficiency, event.X)
+                if target_efficiency is not None and incumbent_eff >= target_efficiency:
+                    stop_event.set()
+                if should_stop():
+                    solver.cancel(gen)
+                    break
+
+            # --- Cooperación: la trayectoria quedó atrás del incumbente ---
+            if not trajectory["behind"] or should_stop():
+                break
+            if policy == "cancel":
+                stats["cancelled"] += 1
+                break
+            stats["adopted"] += 1
+            with shared_eff.get_lock():
+                initial_X = np.array(shared_X[:], dtype=int)
+                trajectory["best"] = shared_eff.value
+
+        stats["nfe"] += solver.total_nfe()
+
+    event_queue.put(("done", worker_id, stats))
+
+
+def run_parallel_multistart(problem, algo_type="LS", n_starts=30, n_workers=None,
+                            trajectory_iterations=5000, sync_iterations=250,
+                            algo_params=None, policy="adopt", gap=0.0,
+                            target_efficiency=None, max_time_seconds=None,
+                            seed=42, poll_interval=1.0, verbose=True):
+    """
+    Multi-arranque paralelo cooperativo: 'n_starts' trayectorias de LS/Tabu/VNS
+    repartidas entre 'n_workers' procesos que comparten el mejor global.
+
+    Cada trayectoria tiene 'trajectory_iterations' iteraciones del solver
+    (igual que una corrida independiente) y se compara con el incumbente cada
+    'sync_iterations'. Todo se detiene al alcanzar 'target_efficiency' o
+    'max_time_seconds'. Un trabajador cuyo proceso muere se descarta
+    (extra['failed_workers']).
+    """
+    if algo_type not in TRAJECTORY_SOLVERS:
+        raise ValueError(f"Algoritmo no soportado '{algo_type}'. Opciones: {list(TRAJECTORY_SOLVERS)}")
+    if policy not in POLICIES:
+        raise ValueError(f"Política desconocida '{policy}'. Opciones: {list(POLICIES)}")
+
+    if n_workers is None:
+        n_workers = multiprocessing.cpu_count()
+    algo_params = algo_params or {}
+
+    start_time = time.time()
+    deadline = start_time + max_time_seconds if max_time_seconds else None
+
+    if verbose:
+        print(f"\n[MultiStart] {algo_type}: {n_starts} arranques en {n_workers} procesos "
+              f"(política: {policy}, sincronización cada {sync_iterations} iteraciones)")
+
+    # Estado compartido: incumbente global + contador de arranques + señal de parada
+    shared_eff = multiprocessing.Value('d', -np.inf)
+    shared_X = multiprocessing.Array('i', problem.n_var, lock=False)
+    start_counter = multiprocessing.Value('i', 0)
+    stop_event = multiprocessing.Event()
+    event_queue = multiprocessing.Queue()
+
+    processes = []
+    for w in range(n_workers):
+        proc = multiprocessing.Process(
+            target=_multistart_worker,
+            args=(w, problem, algo_type, algo_params, seed, n_starts, trajectory_iterations,
+                  sync_iterations, policy, gap, target_efficiency, deadline, start_time,
+                  shared_eff, shared_X, start_counter, stop_event, event_queue)
+        )
+        proc.start()
+        processes.append(proc)
+
+    # Consumir eventos hasta que todos los trabajadores terminen
+    history = []
+    worker_stats = []
+    failed_workers = set()
+    while len(worker_stats) + len(failed_workers) < n_workers:
+        try:
+            event = event_queue.get(timeout=poll_interval)
+        except queue.Empty:
+            # Un trabajador que murió (segfault, OOM) no enviará su "done"
+            reported = {stats["worker"] for stats in worker_stats}
+            for w, proc in enumerate(processes):
+                if w not in reported and w not in failed_workers and proc.exitcode not in (None, 0):
+                    failed_workers.add(w)
+                    if verbose:
+                        print(f"[MultiStart] ⚠️ Trabajador {w} terminó con código {proc.exitcode}; se descarta")
+            continue
+        if event[0] == "improvement":
+            history.append(event[2])
+            if verbose:
+                print(f"[MultiStart] {event[1]:7.2f}s: Nuevo récord = {event[2]:.4f}")
+        else:
+            worker_stats.append(event[2])
+
+    for proc in processes:
+        proc.join()
+
+    execution_time = time.time() - start_time
+    if shared_eff.value == -np.inf:
+        raise RuntimeError("Ningún trabajador del multi-arranque reportó una solución factible")
+    best_X = np.array(shared_X[:], dtype=int)
+    final_eval = problem.evaluate_solution(best_X)
+
+    if verbose:
+        print(f"[MultiStart] Fin. Eficiencia: {final_eval['efficiency']:.4f}, "
+              f"Tiempo: {execution_time:.2f}s")
+
+    return SolutionResult.from_eval(
+        X=best_X, eval_result=final_eval, method=f"Parallel Multi-Start {algo_type}",
+        history=history, execution_time=execution_time,
+        extra={
+            "n_workers": n_workers,
+            "policy": policy,
+            "starts": sum(s["starts"] for s in worker_stats),
+            "adopted": sum(s["adopted"] for s in worker_stats),
+            "cancelled": sum(s["cancelled"] for s in worker_stats),
+            "nfe": sum(s["nfe"] for s in worker_stats),
+            "failed_workers": sorted(failed_workers),
+            "target_reached": bool(target_efficiency is not None and final_eval['efficiency'] >= target_efficiency)
+        }
+    )
@@ -0,0 +1,193 @@
+import time
+import queue
+import multiprocessing
+
+import numpy as np
+
+from Algorithm.LS import LS
+from Algorithm.TabuSearch import TabuSearch
+from Algorithm.VNS import VNS
+from SolutionResult import SolutionResult
+
+
+PORTFOLIO_SOLVERS = {
+    "LS": LS,
+    "Tabu": TabuSearch,
+    "VNS": VNS,
+}
+
+# Presupuestos por defecto (~50.000 NFE por miembro, como en run_parallel_benchmark).
+DEFAULT_MEMBERS = {
+    "LS": {"max_iterations": 50000},
+    "Tabu": {"max_iterations": 2500},
+    "VNS": {"max_iterations": 1000, "ls_max_iterations": 50},
+    "GA": {"pop_size": 100, "n_gen": 500},
+}
+
+
+def _portfolio_member(name, problem, params, seed, deadline, start_time, stop_event, event_queue):
+    """
+    Ejecuta UN miembro del portafolio. Reporta cada mejora propia como
+    ("progress", nombre, t, eficiencia, X) y al terminar envía ("done", nombre, resultado).
+    Los solvers de trayectoria corren como un único iter_solve (su estado vive toda la
+    carrera); la señal de parada se consulta en cada iteración vía stop_check.
+    """
+    params = dict(params)
+    best = {"eff": -np.inf}
+
+    def should_stop():
+        return stop_event.is_set() or (deadline is not None and time.time() >= deadline)
+
+    def report(eff, X):
+        if eff > best["eff"]:
+            best["eff"] = eff
+            event_queue.put(("progress", name, time.time() - start_time, eff, np.asarray(X, dtype=int)))
+
+    try:
+        if name == "GA":
+            from Algorithm.GA import run_mtfp_ga  # Pymoo solo si el portafolio incluye el GA
+
+            def ga_callback(algorithm):
+                report(float(-np.min(algorithm.opt.get("F"))), algorithm.opt.get("X")[0])
+                if should_stop():
+                    algorithm.termination.force_termination = True
+
+            result = run_mtfp_ga(problem, seed=seed, verbose=False, callback=ga_callback, **params)
+        else:
+            solver = PORTFOLIO_SOLVERS[name](problem, seed=seed)
+            solver.deadline = deadline
+            solver.stop_check = stop_event.is_set
+
+            gen = solver.iter_solve(verbose=False, **params)
+            while True:
+                try:
+                    event = next(gen)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                report(event.efficiency, event.X)
+                if should_stop():
+                    result = solver.cancel(gen)
+                    break
+            result.execution_time = time.time() - start_time
+            result.extra.setdefault("nfe", solver.total_nfe())
+
+        event_queue.put(("done", name, result.to_serializable_dict()))
+
+    except Exception as e:
+        print(f"❌ Error en miembro {name} del portafolio: {e}")
+        event_queue.put(("done", name, None))
+
+
+def run_portfolio(problem, members=None, max_time_seconds=None, target_efficiency=None,
+                  seed=42, grace_seconds=10.0, on_improvement=None, verbose=True):
+    """
+    Portafolio de algoritmos: ejecuta los solvers en paralelo (un proceso cada uno)
+    sobre la misma instancia, con un plazo común.
+
+    - Transmite el mejor global a medida que mejora (on_improvement(t, nombre, eficiencia, X)).
+    - Al alcanzar 'target_efficiency' o el plazo, cancela al resto de miembros;
+      si alguno no responde en 'grace_seconds', se termina el proceso.
+    - Retorna el SolutionResult del miembro ganador. En extra["portfolio_traces"]
+      queda la traza anytime [(t, eficiencia), ...] de cada miembro.
+
+    members: dict {nombre: params} con nombres en LS, Tabu, VNS, GA
+             (por defecto DEFAULT_MEMBERS).
+    """
+    if members is None:
+        members = DEFAULT_MEMBERS
+    members = {name: {**DEFAULT_MEMBERS.get(name, {}), **(params or {})} for name, params in members.items()}
+    for name in members:
+        if name != "GA" and name not in PORTFOLIO_SOLVERS:
+            raise ValueError(f"Miembro desconocido '{name}'. Opciones: {list(DEFAULT_MEMBERS)}")
+
+    start_time = time.time()
+    deadline = start_time + max_time_seconds if max_time_seconds else None
+
+    if verbose:
+        print(f"\n[Portfolio] Miembros: {list(members)}, Plazo: {max_time_seconds}s, Objetivo: {target_efficiency}")
+
+    stop_event = multiprocessing.Event()
+    event_queue = multiprocessing.Queue()
+
+    processes = {}
+    for name, params in members.items():
+        proc = multiprocessing.Process(
+            target=_portfolio_member,
+            args=(name, problem, params, seed, deadline, start_time, stop_event, event_queue)
+        )
+        proc.start()
+        processes[name] = proc
+
+    traces = {name: [] for name in members}
+    finals = {}
+    best_eff, best_X, winner = -np.inf, None, None
+    kill_at = None
+
+    while len(finals) < len(members):
+        # Parada por plazo: avisar a todos y dar un margen antes de matar procesos
+        if stop_event.is_set() or (deadline is not None and time.time() >= deadline):
+            stop_event.set()
+            if kill_at is None:
+                kill_at = time.time() + grace_seconds
+            elif time.time() >= kill_at:
+                break
+
+        try:
+            event = event_queue.get(timeout=0.1)
+        except queue.Empty:
+            # Un miembro que murió (segfault, OOM) no enviará su "done": se descarta
+            for name, proc in processes.items():
+                if name not in finals and proc.exitcode not in (None, 0):
+                    finals[name] = None
+                    if verbose:
+                        print(f"[Portfolio] ⚠️ Miembro {name} terminó con código {proc.exitcode}; se descarta")
+            continue
+
+        if event[0] == "progress":
+            _, name, t, eff, X = event
+            traces[name].append((t, eff))
+            if eff > best_eff:
+                best_eff, best_X, winner = eff, X, name
+                if verbose:
+                    print(f"[Portfolio] {t:7.2f}s: {name} lidera con {eff:.4f}")
+                if on_improvement is not None:
+                    on_improvement(t, name, eff, X)
+            if target_efficiency is not None and best_eff >= target_efficiency:
+                stop_event.set()
+        else:
+            _, name, data = event
+            finals[name] = data
+
+    for name, proc in processes.items():
+        if name not in finals and proc.is_alive():
+            if verbose:
+                print(f"[Portfolio] Terminando miembro {name} (no respondió a la cancelación)")
+            proc.terminate()
+        proc.join()
+
+    execution_time = time.time() - start_time
+
+    if best_X is None:
+        raise RuntimeError("Ningún miembro del portafolio reportó una solución "
+                           f"(miembros: {list(members)}, plazo: {max_time_seconds}s)")
+
+    # Resultado del ganador: el que reportó el mejor valor durante la carrera
+    if finals.get(winner) is not None:
+        result = SolutionResult.from_serializable_dict(finals[winner])
+    else:
+        result = SolutionResult.from_eval(
+            X=best_X, eval_result=problem.evaluate_solution(best_X), method=winner
+        )
+    result.execution_time = execution_time
+    result.extra.update({
+        "portfolio_winner": winner,
+        "portfolio_traces": traces,
+        "portfolio_member_best": {name: (trace[-1][1] if trace else None) for name, trace in traces.items()},
+        "target_reached": bool(target_efficiency is not None and best_eff >= target_efficiency)
+    })
+
+    if verbose:
+        print(f"[Portfolio] Ganador: {winner} ({best_eff:.4f}), Tiempo: {execution_time:.2f}s")
+
+    return result
@@ -3,26 +3,45 @@ from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
 from SolutionResult import SolutionResult
 
 class RandomSearch(MTFP_BaseSolver):
-    def solve(self, budget_nfe=50000, verbose=False):
+    def iter_solve(self, budget_nfe=50000, include_allocation=False,
+                   checkpoint_path=None, checkpoint_interval=60.0, verbose=False):
         start = time.time()
+        resume = self._start_checkpointing(checkpoint_path, checkpoint_interval)
         
         best_X = None
         best_eff = -1.0
         history = []
+        first_sample = 0
+
+        if resume is not None:
+            start -= resume["elapsed"]
+            best_X, best_eff = resume["best_X"], resume["best_eff"]
+            history, first_sample = resume["history"], resume["iteration"]
         
-        for _ in range(budget_nfe):
+        for i in range(first_sample, budget_nfe):
+            if best_X is not None and self._past_deadline():
+                break  # Al menos una muestra, aunque el plazo ya haya vencido
+            self._maybe_checkpoint(start, lambda: {
+                "iteration": i, "history": history, "best_X": best_X, "best_eff": best_eff
+            })
+
             # Generar solución aleatoria válida
             curr_X = self._construct_feasible_solution()
             curr_eff = self._get_efficiency_fast(curr_X)
             
-            if curr_eff > best_eff:
+            improved = curr_eff > best_eff
+            if improved:
                 best_eff = curr_eff
                 best_X = curr_X.copy()
             
             # En Random Search, el historial suele ser "el mejor hasta ahora"
             history.append(best_eff)
+
+            if improved and (yield self._improvement_event(start, i, best_eff, best_X, include_allocation)):
+                break
             
+        self._finish_checkpointing()
         return SolutionResult.from_eval(
             best_X, self.problem.evaluate_solution(best_X), 
             "Random Search", history, time.time() - start
-        )
\ No newline at end of file
+        )
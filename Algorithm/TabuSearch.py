@@ -13,10 +13,16 @@ class TabuSearch(MTFP_BaseSolver):
     - Atributo Tabú: Índice de la habilidad modificada (no se puede volver a tocar por N turnos).
     - Criterio de Aspiración: Permite movimiento tabú si mejora el óptimo global.
     - Reinicio: Estrategia de reinicio cíclico para diversificación.
+    - Memoria de soluciones (opcional, solution_tabu_size > 0): huellas Zobrist de las
+      últimas soluciones visitadas; volver a una de ellas también es tabú.
+      extra["revisits"] cuenta las visitas repetidas (detección de ciclos).
     """
     
-    def solve(self, max_iterations=1000, tabu_size=None, n_candidates=None, verbose=True):
+    def iter_solve(self, max_iterations=1000, tabu_size=None, n_candidates=None,
+                   solution_tabu_size=0, initial_solution=None, initial_version=None,
+                   include_allocation=False, checkpoint_path=None, checkpoint_interval=60.0, verbose=True):
         start_time = time.time()
+        resume = self._start_checkpointing(checkpoint_path, checkpoint_interval)
         
         if tabu_size is None:
             tabu_size = max(1, self.problem.K // 2)
@@ -40,23 +46,51 @@ class TabuSearch(MTFP_BaseSolver):
             print(f"             Tabu Size: {tabu_size}, Candidates per iter: {n_candidates}")
             print("="*60)
 
-        # 1. Solución Inicial
-        current_X = self._construct_feasible_solution()
-        current_eff = self._get_efficiency_fast(current_X)
-        
-        best_X = current_X.copy()
-        best_eff = current_eff
-        
-        # Estructuras de Memoria
-        tabu_list = []  # Lista de índices de habilidades prohibidas
-        history = [best_eff]
+        if resume is not None:
+            # Reanudar desde el checkpoint (el reloj continúa desde el tiempo ya consumido)
+            start_time -= resume["elapsed"]
+            current_X, current_eff = resume["current_X"], resume["current_eff"]
+            best_X, best_eff = resume["best_X"], resume["best_eff"]
+            tabu_list, history = resume["tabu_list"], resume["history"]
+            solution_memory, visited = resume["solution_memory"], resume["visited"]
+            first_iteration = resume["iteration"]
+            if verbose: print(f"[Tabu] Reanudando desde iteración {first_iteration}...")
+        else:
+            # 1. Solución Inicial (construida, provista o reparada en caliente)
+            current_X = self._initial_solution(initial_solution, initial_version)
+            current_eff = self._get_efficiency_fast(current_X)
+            
+            best_X = current_X.copy()
+            best_eff = current_eff
+            
+            # Estructuras de Memoria
+            tabu_list = []  # Lista de índices de habilidades prohibidas
+            solution_memory = []  # Huellas de las últimas soluciones visitadas
+            visited = {}  # Huella -> número de visitas (detección de ciclos)
+            history = [best_eff]
+            first_iteration = 0
+ 
+        # Las huellas solo se mantienen si alguna estructura las usa
+        track = solution_tabu_size > 0 or self.cache_size > 0
+        current_fp = self.problem.fingerprint(current_X) if track else None
+        cancelled = yield self._improvement_event(start_time, first_iteration, best_eff, best_X, include_allocation)
         
-        for iteration in range(max_iterations):
+        for iteration in range(first_iteration, max_iterations):
+            if cancelled or self._past_deadline():
+                break
+
+            self._maybe_checkpoint(start_time, lambda: {
+                "iteration": iteration, "history": history, "tabu_list": tabu_list,
+                "solution_memory": solution_memory, "visited": visited,
+                "current_X": current_X, "current_eff": current_eff,
+                "best_X": best_X, "best_eff": best_eff
+            })
             
             # --- Generación de Vecindario (Candidate List) ---
             best_neighbor_X = None
             best_neighbor_eff = -np.inf
             best_move_skill = None
+            best_neighbor_fp = None
             
             # Generamos 'n_candidates' vecinos posibles
             # Intentamos explorar diferentes habilidades
@@ -64,11 +98,15 @@ class TabuSearch(MTFP_BaseSolver):
             
             for skill_idx in candidate_skills:
                 # 2. Generar vecino usando el operador seguro de la clase base
-                neighbor_X = self._reassign_skill_group(current_X, skill_idx)
-                neighbor_eff = self._get_efficiency_fast(neighbor_X)
+                if track:
+                    neighbor_X, neighbor_fp = self._reassign_with_fingerprint(current_X, current_fp, skill_idx)
+                    neighbor_eff = self._get_efficiency_cached(neighbor_X, neighbor_fp)
+                else:
+                    neighbor_X, neighbor_fp = self._reassign_skill_group(current_X, skill_idx), None
+                    neighbor_eff = self._get_efficiency_fast(neighbor_X)
                 
                 # 3. Verificar estatus Tabú y Criterio de Aspiración
-                is_tabu = skill_idx in tabu_list
+                is_tabu = skill_idx in tabu_list or (solution_tabu_size > 0 and neighbor_fp in solution_memory)
                 is_aspiration = neighbor_eff > best_eff
                 
                 if not is_tabu or is_aspiration:
@@ -77,11 +115,13 @@ class TabuSearch(MTFP_BaseSolver):
                         best_neighbor_X = neighbor_X
                         best_neighbor_eff = neighbor_eff
                         best_move_skill = skill_idx
+                        best_neighbor_fp = neighbor_fp
 
             # --- Movimiento ---
             if best_neighbor_X is not None:
                 current_X = best_neighbor_X
                 current_eff = best_neighbor_eff
+                current_fp = best_neighbor_fp
                 
                 # Actualizar Mejor Global
                 if current_eff > best_eff:
@@ -89,11 +129,21 @@ class TabuSearch(MTFP_BaseSolver):
                     best_eff = current_eff
                     if verbose:
                         print(f"[Tabu] Iter {iteration}: Nuevo récord = {best_eff:.4f}")
+                    cancelled = (yield self._improvement_event(
+                        start_time, iteration + 1, best_eff, best_X, include_allocation
+                    )) or self._reached_upper_bound(best_eff)
 
                 # Actualizar Lista Tabú
                 tabu_list.append(best_move_skill)
                 if len(tabu_list) > tabu_size:
                     tabu_list.pop(0)
+
+                # Memoria de soluciones
+                if solution_tabu_size > 0:
+                    visited[current_fp] = visited.get(current_fp, 0) + 1
+                    solution_memory.append(current_fp)
+                    if len(solution_memory) > solution_tabu_size:
+                        solution_memory.pop(0)
             
             # --- Estrategia de Reinicio (Diversificación) ---
             # Similar a tu código original: cada 200 iteraciones, reiniciamos desde otro punto
@@ -101,10 +151,13 @@ class TabuSearch(MTFP_BaseSolver):
                 if verbose: print(f"[Tabu] Iter {iteration}: Reinicio estocástico...")
                 current_X = self._construct_feasible_solution()
                 current_eff = self._get_efficiency_fast(current_X)
+                current_fp = self.problem.fingerprint(current_X) if track else None
                 tabu_list = [] # Limpiar memoria
+                solution_memory = []
 
             history.append(best_eff)
 
+        self._finish_checkpointing()
         end_time = time.time()
         execution_time = end_time - start_time
         
@@ -121,5 +174,7 @@ class TabuSearch(MTFP_BaseSolver):
             eval_result=final_eval,
             method="Tabu Search",
             history=history,
-            execution_time=execution_time
+            execution_time=execution_time,
+            extra={"nfe": self.total_nfe(), "revisits": sum(c - 1 for c in visited.values()),
+                   "cache_hits": self.cache_hits}
         )
\ No newline at end of file
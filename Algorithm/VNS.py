@@ -10,29 +10,48 @@ class VNS(MTFP_BaseSolver):
     Implementación de VNS.
     Usa 'Shaking' para diversificar y 'MTFP_LS' para intensificar.
     """
-    def __init__(self, problem, seed=None):
-        super().__init__(problem, seed)
+    def __init__(self, problem, seed=None, affinity_bias=0.0, upper_bound=None, cache_size=0):
+        super().__init__(problem, seed, affinity_bias, upper_bound, cache_size)
         # Composición: VNS tiene un LS para la fase de mejora
-        self.ls_engine = LS(problem, seed)
+        self.ls_engine = LS(problem, seed, affinity_bias, cache_size=cache_size)
 
-    def solve(self, max_iterations=1000, ls_max_iterations=50,  max_time_seconds=None, verbose=True):
+    def iter_solve(self, max_iterations=1000, ls_max_iterations=50,  max_time_seconds=None,
+                   initial_solution=None, initial_version=None,
+                   include_allocation=False, checkpoint_path=None, checkpoint_interval=60.0, verbose=True):
         start_time = time.time()
-        if verbose: print(f"\n[VNS] Iniciando VNS (usa LS interna)...")
+        resume = self._start_checkpointing(checkpoint_path, checkpoint_interval)
 
-        # 1. Inicialización
-        current_X = self._construct_feasible_solution()
-        current_eff = self._get_efficiency_fast(current_X)
-        
-        best_X = current_X.copy()
-        best_eff = current_eff
-        history = [best_eff]
-        
-        k = 1 # Tamaño del vecindario inicial
-        iteration = 0
+        if resume is not None:
+            # Reanudar desde el checkpoint (el reloj continúa desde el tiempo ya consumido)
+            start_time -= resume["elapsed"]
+            current_X, current_eff = resume["current_X"], resume["current_eff"]
+            best_X, best_eff = resume["best_X"], resume["best_eff"]
+            history, k, iteration = resume["history"], resume["k"], resume["iteration"]
+            if verbose: print(f"\n[VNS] Reanudando desde iteración {iteration} (k={k})...")
+        else:
+            if verbose: print(f"\n[VNS] Iniciando VNS (usa LS interna)...")
+
+            # 1. Inicialización (construida, provista o reparada en caliente)
+            current_X = self._initial_solution(initial_solution, initial_version)
+            current_eff = self._get_efficiency_fast(current_X)
+            
+            best_X = current_X.copy()
+            best_eff = current_eff
+            history = [best_eff]
+            
+            k = 1 # Tamaño del vecindario inicial
+            iteration = 0
+        cancelled = yield self._improvement_event(start_time, iteration, best_eff, best_X, include_allocation)
         
-        while iteration < max_iterations:
-            if max_time_seconds and (time.time() - start_time) > max_time_seconds:
+        while iteration < max_iterations and not cancelled:
+            if (max_time_seconds and (time.time() - start_time) > max_time_seconds) or self._past_deadline():
                 break
+
+            self._maybe_checkpoint(start_time, lambda: {
+                "iteration": iteration, "k": k, "history": history,
+                "current_X": current_X, "current_eff": current_eff,
+                "best_X": best_X, "best_eff": best_eff
+            })
                 
             # --- FASE 1: Shaking (Perturbación) ---
             # Generar vecino en N^k (cambiar k habilidades)
@@ -58,6 +77,9 @@ class VNS(MTFP_BaseSolver):
                     best_eff = current_eff
                     if verbose:
                         print(f"[VNS] Iter {iteration} (k={k}): Nuevo récord = {best_eff:.4f}")
+                    cancelled = (yield self._improvement_event(
+                        start_time, iteration + 1, best_eff, best_X, include_allocation
+                    )) or self._reached_upper_bound(best_eff)
             else:
                 # No mejora: Expandimos el vecindario
                 k += 1
@@ -68,6 +90,7 @@ class VNS(MTFP_BaseSolver):
             history.append(best_eff)
             iteration += 1
 
+        self._finish_checkpointing()
         execution_time = time.time() - start_time
         final_eval = self.problem.evaluate_solution(best_X)
         
@@ -77,6 +100,17 @@ class VNS(MTFP_BaseSolver):
             extra={"final_k": k}
         )
 
+    def total_nfe(self) -> int:
+        return self.nfe + self.ls_engine.nfe
+
+    def _get_random_state(self):
+        # La LS interna tiene su propio RNG: ambos forman parte del snapshot
+        return {**super()._get_random_state(), "ls_engine": self.ls_engine._get_random_state()}
+
+    def _set_random_state(self, random_state):
+        super()._set_random_state(random_state)
+        self.ls_engine._set_random_state(random_state["ls_engine"])
+
     def _shake(self, solution: np.ndarray, k: int) -> np.ndarray:
         """
         Operador de Shaking: Cambia k habilidades aleatorias simultáneamente.
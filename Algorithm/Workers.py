@@ -0,0 +1,198 @@
+import pickle
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Módulos que necesita un worker para correr cualquier solver de trayectoria.
+# Ninguno importa matplotlib, pandas ni la parte de algoritmos de pymoo.
+SOLVER_MODULES = [
+    "numpy",
+    "SolutionResult",
+    "Algorithm.MTFP",
+    "Algorithm.MTFP_BaseSolver",
+    "Algorithm.LS",
+    "Algorithm.TabuSearch",
+    "Algorithm.VNS",
+    "Algorithm.HillClimbing",
+    "Algorithm.RandomSearch",
+    "Algorithm.Greedy",
+    "Algorithm.GRASP",
+]
+
+
+def solver_context(preload=None):
+    """
+    Contexto de multiprocessing para los pools de solvers.
+
+    Con 'forkserver' (Linux/macOS) un proceso servidor importa una sola vez los
+    módulos de 'preload' y cada worker nace como un fork de él: arranque rápido,
+    sin heredar el estado del proceso padre (matplotlib, hilos, etc.).
+    En plataformas sin forkserver (Windows) se usa 'spawn'.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(SOLVER_MODULES if preload is None else preload)
+    return ctx
+
+
+def solver_executor(max_workers=None, preload=None, **kwargs):
+    """ProcessPoolExecutor cuyos workers arrancan desde el forkserver con los solvers precargados."""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=solver_context(preload), **kwargs)
+
+
+# ============================================================================
+# POOL PERSISTENTE: un solo pool para todos los experimentos
+# ============================================================================
+
+# Caché por proceso worker: clave de instancia -> objeto MTFP ya deserializado
+# (con sus submatrices, listas de candidatos y kernels precalculados)
+_WORKER_INSTANCES = OrderedDict()
+_WORKER_CACHE_SIZE = 4
+
+
+def _set_worker_cache_size(size):
+    global _WORKER_CACHE_SIZE
+    _WORKER_CACHE_SIZE = size
+
+
+def _attach_instance(key, shm_name, size):
+    """Instancia 'key' del proceso actual; la primera vez se lee de la memoria compartida."""
+    problem = _WORKER_INSTANCES.get(key)
+    if problem is not None:
+        _WORKER_INSTANCES.move_to_end(key)
+        return problem, True
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        problem = pickle.loads(bytes(shm.buf[:size]))
+    finally:
+        shm.close()
+    _WORKER_INSTANCES[key] = problem
+    while len(_WORKER_INSTANCES) > _WORKER_CACHE_SIZE:
+        _WORKER_INSTANCES.popitem(last=False)
+    return problem, False
+
+
+def _call_with_instance(func, key, shm_name, size, args):
+    problem, _ = _attach_instance(key, shm_name, size)
+    return func(problem, *args)
+
+
+class WarmPool:
+    """
+    Pool de procesos de larga vida compartido por varios experimentos.
+
+    - Los workers arrancan una sola vez (solver_executor) y conservan sus módulos.
+    - Cada instancia se publica una vez en memoria compartida; las tareas viajan
+      solo con su clave y cada worker la deserializa la primera vez que la usa y
+      la mantiene en una caché LRU propia (worker_cache_size instancias).
+    - Todas las tareas van a una misma cola: el siguiente experimento empieza
+      mientras terminan los rezagados del anterior.
+
+    - Las tareas pesadas en memoria pueden encolarse con submit_budgeted: solo se
+      envían al executor mientras la suma de sus costos estimados no supere
+      memory_budget_mb (las livianas siguen usando submit sin restricción).
+
+    Uso:
+        with WarmPool(max_workers=8) as pool:
+            futures = [pool.submit(func, problem, *args) for ...]  # func(problem, *args)
+    """
+    def __init__(self, max_workers=None, worker_cache_size=4, preload=None, memory_budget_mb=None):
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.executor = solver_executor(self.max_workers, preload=preload,
+                                        initializer=_set_worker_cache_size, initargs=(worker_cache_size,))
+        self._instances = {}  # id(problem) -> (problema, clave, memoria compartida, tamaño)
+        self.memory_budget_mb = memory_budget_mb
+        self._memory_in_use = 0.0
+        self._memory_queue = deque()  # (costo, future externo, args para executor.submit)
+        self._memory_lock = threading.Lock()
+
+    def publish(self, problem):
+        """Copia la instancia a memoria compartida (una vez) y retorna su clave."""
+        entry = self._instances.get(id(problem))
+        if entry is None:
+            payload = pickle.dumps(problem, protocol=pickle.HIGHEST_PROTOCOL)
+            key = hashlib.blake2b(payload, digest_size=16).hexdigest()
+            shm = shared_memory.SharedMemory(create=True, size=len(payload))
+            shm.buf[:len(payload)] = payload
+            # Se guarda la referencia al problema para que su id no se reutilice
+            entry = (problem, key, shm, len(payload))
+            self._instances[id(problem)] = entry
+        return entry[1]
+
+    def submit(self, func, problem, *args):
+        """Encola func(problem, *args); 'func' debe ser una función de módulo (serializable)."""
+        self.publish(problem)
+        _, key, shm, size = self._instances[id(problem)]
+        return self.executor.submit(_call_with_instance, func, key, shm.name, size, args)
+
+    def submit_budgeted(self, cost_mb, func, problem, *args):
+        """
+        Como submit, pero la tarea espera (en orden de llegada) hasta que su costo de
+        memoria estimado quepa en memory_budget_mb. Una tarea más grande que todo el
+        presupuesto corre sola, para no bloquear la cola para siempre.
+        """
+        if self.memory_budget_mb is None:
+            return self.submit(func, problem, *args)
+        self.publish(problem)
+        _, key, shm, size = self._instances[id(problem)]
+        outer = Future()
+        with self._memory_lock:
+            self._memory_queue.append((cost_mb, outer, (_call_with_instance, func, key, shm.name, size, args)))
+        self._drain_memory_queue()
+        return outer
+
+    def _drain_memory_queue(self):
+        ready = []
+        with self._memory_lock:
+            while self._memory_queue:
+                cost, outer, call = self._memory_queue[0]
+                if self._memory_in_use > 0 and self._memory_in_use + cost > self.memory_budget_mb:
+                    break
+                self._memory_queue.popleft()
+                self._memory_in_use += cost
+                ready.append((cost, outer, call))
+        for cost, outer, call in ready:
+            inner = self.executor.submit(*call)
+            inner.add_done_callback(lambda f, cost=cost, outer=outer: self._memory_task_done(f, cost, outer))
+
+    def _memory_task_done(self, inner, cost, outer):
+        with self._memory_lock:
+            self._memory_in_use -= cost
+        if inner.cancelled():
+            outer.cancel()
+        elif inner.exception() is not None:
+            outer.set_exception(inner.exception())
+        else:
+            outer.set_result(inner.result())
+        self._drain_memory_queue()
+
+    def release(self, problem):
+        """Libera la memoria compartida de una instancia cuyas tareas ya terminaron."""
+        entry = self._instances.pop(id(problem), None)
+        if entry is not None:
+            entry[2].close()
+            entry[2].unlink()
+
+    def shutdown(self, wait=True):
+        with self._memory_lock:
+            while self._memory_queue:
+                self._memory_queue.popleft()[1].cancel()
+        self.executor.shutdown(wait=wait)
+        for problem_id in list(self._instances):
+            entry = self._instances.pop(problem_id)
+            entry[2].close()
+            entry[2].unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
@@ -0,0 +1,83 @@
+"""Tests de la cota AffinityBound y del Branch and Bound exacto."""
+import time
+
+import numpy as np
+import pytest
+
+from Algorithm.MTFP import create_mtfp_problem
+from Algorithm.BranchAndBound import AffinityBound, BranchAndBound, efficiency_upper_bound
+from Algorithm.LS import LS
+
+
+@pytest.fixture
+def tiny_problem():
+    return create_mtfp_problem(n_people=8, n_projects=2, n_skills=2, seed=3)[0]
+
+
+def test_root_bound_builds_only_depth_zero(medium_problem):
+    bound = AffinityBound(medium_problem)
+    assert bound.prefix == {}
+    value = bound.root_bound()
+    assert list(bound.prefix) == [0]
+    assert value == efficiency_upper_bound(medium_problem)
+
+
+def test_derived_tables_match_tables_built_from_scratch(medium_problem):
+    chained = AffinityBound(medium_problem)
+    for depth in range(medium_problem.H + 1):
+        prefix, npos = chained.tables(depth)
+        scratch_prefix, scratch_npos = AffinityBound(medium_problem).tables(depth)
+        assert np.array_equal(prefix, scratch_prefix)
+        assert np.array_equal(npos, scratch_npos)
+
+
+def test_branch_and_bound_is_exact_and_below_the_bound(tiny_problem):
+    result = BranchAndBound(tiny_problem, seed=0).solve(time_limit=60.0, verbose=False)
+    assert result.feasible and result.extra["proven_optimal"]
+    optimum = float(result.F)
+    assert optimum <= efficiency_upper_bound(tiny_problem) + 1e-9
+    for seed in range(3):
+        heuristic = LS(tiny_problem, seed=seed).solve(max_iterations=300, verbose=False)
+        assert float(heuristic.F) <= optimum + 1e-9
+
+
+def open_search(seed=1):
+    """B&B sobre una instancia que no se resuelve en milisegundos, desde un incumbente débil."""
+    problem = create_mtfp_problem(n_people=20, n_projects=3, n_skills=2, seed=seed)[0]
+    solver = BranchAndBound(problem, seed=0)
+    initial = LS(problem, seed=0)._construct_feasible_solution()
+    return problem, solver, solver.iter_solve(time_limit=60.0, initial_solution=initial, verbose=False)
+
+
+def test_cancel_mid_search_reports_a_bounded_gap():
+    problem, solver, gen = open_search()
+    next(gen)  # Incumbente inicial
+    event = next(gen)  # Primer récord hallado en el árbol
+    result = BranchAndBound.cancel(gen)
+    assert result.extra["proven_optimal"] is False
+    assert result.extra["upper_bound"] >= float(result.F) == event.efficiency
+    assert result.extra["gap"] > 0
+
+
+def test_cancel_at_the_first_event_reports_the_root_bound():
+    problem, solver, gen = open_search()
+    event = next(gen)
+    result = BranchAndBound.cancel(gen)
+    assert result.extra["proven_optimal"] is False and result.extra["nodes"] == 0
+    assert result.extra["upper_bound"] == pytest.approx(efficiency_upper_bound(problem))
+    assert result.extra["gap"] > 0 and float(result.F) == event.efficiency
+
+
+def test_deadline_ends_the_search_like_a_timeout():
+    problem, solver, gen = open_search()
+    solver.deadline = time.time() + 0.3
+    start = time.time()
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            result = stop.value
+            break
+    assert time.time() - start < 10.0  # time_limit=60: solo el deadline lo detiene
+    assert result.extra["proven_optimal"] is False
+    assert result.extra["upper_bound"] >= float(result.F)
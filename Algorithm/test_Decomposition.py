@@ -0,0 +1,43 @@
+"""Tests del solver por descomposición (partición, unión/reparación y brecha)."""
+import numpy as np
+import pytest
+
+from Algorithm.MTFP import create_mtfp_problem
+from Algorithm.Decomposition import partition_instance, run_decomposition, compare_with_monolithic
+
+
+@pytest.fixture
+def large_problem():
+    return create_mtfp_problem(n_people=100, n_projects=6, n_skills=4, seed=2)[0]
+
+
+@pytest.mark.parametrize("n_blocks", [1, 2, 3])
+def test_partition_covers_everything_once(large_problem, n_blocks):
+    project_blocks, people_blocks = partition_instance(large_problem, n_blocks)
+    assert len(project_blocks) == len(people_blocks) == n_blocks
+    assert np.array_equal(np.sort(np.concatenate(project_blocks)), np.arange(large_problem.P))
+    assert np.array_equal(np.sort(np.concatenate(people_blocks)), np.arange(large_problem.H))
+    # Con personas suficientes, cada bloque cubre su demanda por habilidad
+    for projects, people in zip(project_blocks, people_blocks):
+        demand = large_problem.R[:, projects].sum(axis=1)
+        staffed = np.bincount(large_problem.skill_of_person[people], minlength=large_problem.K)
+        assert np.all(staffed >= np.ceil(demand - 1e-9))
+
+
+def test_merged_solution_is_feasible_and_consistent(large_problem):
+    result = run_decomposition(large_problem, n_blocks=3, algo_params={"max_iterations": 200},
+                               n_workers=1, verbose=False)
+    evaluation = large_problem.evaluate_solution(result.X)
+    assert result.feasible and evaluation["feasible"]
+    assert float(result.F) == pytest.approx(evaluation["efficiency"])
+    assert result.extra["n_blocks"] == 3
+
+
+def test_gap_against_monolithic_is_small(large_problem):
+    report = compare_with_monolithic(large_problem, algo_params={"max_iterations": 300},
+                                     n_blocks=2, n_workers=1, verbose=False)
+    assert report["Decomposition_Feasible"]
+    assert report["Gap"] == pytest.approx(
+        (report["Monolithic_Eff"] - report["Decomposition_Eff"]) / report["Monolithic_Eff"])
+    # Con bloques guiados por las comunidades de S la pérdida de calidad es acotada
+    assert report["Gap"] < 0.05
@@ -0,0 +1,89 @@
+"""Tests de reproducibilidad y reanudación del GA (y su variante memética)."""
+import numpy as np
+import pytest
+
+from Algorithm.GA import iter_mtfp_ga, run_mtfp_ga
+
+
+def finish(gen):
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
+
+
+@pytest.mark.parametrize("memetic_rate", [0.0, 0.3], ids=["ga", "memetic"])
+def test_same_seed_same_run(small_problem, memetic_rate):
+    a = run_mtfp_ga(small_problem, pop_size=20, n_gen=8, seed=11, verbose=False, memetic_rate=memetic_rate)
+    b = run_mtfp_ga(small_problem, pop_size=20, n_gen=8, seed=11, verbose=False, memetic_rate=memetic_rate)
+    assert np.array_equal(a.X, b.X)
+    assert a.history == b.history
+    assert a.extra["nfe"] == b.extra["nfe"]
+
+
+@pytest.mark.parametrize("memetic_rate", [0.0, 0.3], ids=["ga", "memetic"])
+def test_resume_equals_uninterrupted(small_problem, tmp_path, memetic_rate):
+    kwargs = dict(pop_size=20, n_gen=15, seed=3, verbose=False, memetic_rate=memetic_rate)
+    reference = run_mtfp_ga(small_problem, **kwargs)
+
+    path = str(tmp_path / "ga.ckpt")
+    # Corrida interrumpida a mitad de la generación 6, con un checkpoint escrito
+    # antes de cada generación (como si el proceso muriera)
+    def crash(algorithm):
+        if algorithm.n_iter == 6:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        finish(iter_mtfp_ga(small_problem, checkpoint_path=path, checkpoint_interval=0.0,
+                            callback=crash, **kwargs))
+    assert (tmp_path / "ga.ckpt").exists()
+
+    resumed = finish(iter_mtfp_ga(small_problem, checkpoint_path=path, checkpoint_interval=0.0, **kwargs))
+
+    assert np.array_equal(resumed.X, reference.X)
+    assert float(resumed.F) == float(reference.F)
+    assert resumed.history == reference.history
+    assert resumed.extra["nfe"] == reference.extra["nfe"]
+    if memetic_rate:
+        for key in ("ls_nfe", "refinements", "refinement_improvements"):
+            assert resumed.extra[key] == reference.extra[key]
+    assert not (tmp_path / "ga.ckpt").exists()
+
+
+def test_duplicate_elimination_matches_permuted_twins():
+    from pymoo.core.population import Population
+    from Algorithm.GA import ZobristDuplicateElimination
+    from Algorithm.LS import LS
+    from Algorithm.test_MTFP import twin_rich_problem, permute_twins
+
+    problem = twin_rich_problem(seed=5)
+    rng = np.random.default_rng(0)
+    X = np.array([LS(problem, seed=s)._construct_feasible_solution() for s in range(6)])
+    X = np.unique(np.array([problem.canonical_form(x) for x in X]), axis=0)
+    twins = np.array([permute_twins(problem, x, rng) for x in X])
+
+    elimination = ZobristDuplicateElimination(problem)
+    kept = elimination.do(Population.new(X=np.vstack([X, twins])))
+    assert len(kept) == len(X)
+    assert len(elimination.do(Population.new(X=twins), Population.new(X=X))) == 0
+
+
+@pytest.mark.parametrize("lamarckian", [True, False], ids=["lamarckian", "baldwinian"])
+def test_reported_efficiency_is_reached_by_reported_allocation(small_problem, lamarckian):
+    gen = iter_mtfp_ga(small_problem, pop_size=20, n_gen=10, seed=5, verbose=False,
+                       memetic_rate=0.5, lamarckian=lamarckian)
+    events = []
+    while True:
+        try:
+            events.append(next(gen))
+        except StopIteration as stop:
+            result = stop.value
+            break
+
+    assert result.extra["refinement_improvements"] > 0
+    for event in events:
+        assert np.isclose(small_problem.evaluate_solution(event.X)['efficiency'], event.efficiency)
+    final = small_problem.evaluate_solution(result.X)
+    assert np.isclose(final['efficiency'], result.F)
+    assert final['feasible'] == result.feasible
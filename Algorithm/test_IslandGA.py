@@ -0,0 +1,32 @@
+"""Tests del GA de islas (migración, reproducibilidad) y de la medición de speedup."""
+import numpy as np
+
+from Algorithm.IslandGA import run_mtfp_island_ga, measure_island_speedup
+
+
+def test_islands_exchange_migrants_and_return_a_feasible_result(small_problem):
+    result = run_mtfp_island_ga(small_problem, n_islands=2, pop_size=20, n_gen=12,
+                                migration_interval=2, n_migrants=2, topology="ring", seed=3, verbose=False)
+    assert result.feasible
+    assert small_problem.evaluate_solution(result.X)["efficiency"] == float(result.F)
+    assert result.extra["failed_islands"] == []
+    assert len(result.extra["island_best"]) == 2
+    assert sum(result.extra["immigrants"]) > 0
+
+
+def test_same_seed_same_islands(small_problem):
+    # Sin migración cada isla es determinista; con ella, lo que llega en cada
+    # generación depende del ritmo de los procesos
+    kwargs = dict(n_islands=2, pop_size=20, n_gen=8, topology="none", seed=11, verbose=False)
+    a = run_mtfp_island_ga(small_problem, **kwargs)
+    b = run_mtfp_island_ga(small_problem, **kwargs)
+    assert np.array_equal(a.X, b.X)
+    assert a.extra["island_best"] == b.extra["island_best"]
+    assert a.history == b.history
+
+
+def test_measure_island_speedup_reports_one_row_per_core_count(small_problem):
+    rows = measure_island_speedup(small_problem, core_counts=(1, 2), total_pop_size=20, n_gen=3, verbose=False)
+    assert [row["Islands"] for row in rows] == [1, 2]
+    assert rows[0]["Speedup"] == 1.0 and rows[0]["Parallel_Efficiency"] == 1.0
+    assert all(row["NFE"] > 0 and row["Time"] > 0 for row in rows)
@@ -0,0 +1,365 @@
+"""Tests de las actualizaciones en caliente de la instancia (MTFP.add_person, ...)."""
+import numpy as np
+import pytest
+
+from Algorithm.MTFP import MTFP, MultiScenarioMTFP, create_mtfp_problem, sample_scenarios, zobrist_collision_rate
+from Algorithm.LS import LS
+
+
+def twin_rich_problem(seed=0, H=40, P=3, K=4):
+    """Instancia con muchas personas intercambiables: pocas relaciones en S."""
+    rng = np.random.default_rng(seed)
+    skill_of_person = rng.integers(0, K, size=H)
+    S = np.eye(H)
+    for _ in range(H // 2):
+        i, j = rng.choice(H, size=2, replace=False)
+        S[i, j] = S[j, i] = rng.choice([-1.0, 1.0])
+    counts = np.bincount(skill_of_person, minlength=K)
+    R = np.zeros((K, P))
+    for k in range(K):
+        R[k] = np.floor(counts[k] * 0.6 / P * 4) / 4
+    return MTFP(H, P, K, S, R, skill_of_person)
+
+
+def rebuilt(problem):
+    """La misma instancia construida desde cero con sus datos actuales."""
+    return MTFP(problem.H, problem.P, problem.K, problem.S.copy(), problem.R.copy(),
+                problem.skill_of_person.copy(), project_weights=problem.w,
+                dedication_levels=problem.levels, candidate_list_size=problem.candidate_list_size)
+
+
+def candidate_strengths(problem, lists):
+    rows = np.arange(problem.H)[:, None]
+    return np.where(lists >= 0, problem.S[rows, np.where(lists >= 0, lists, 0)], 0.0)
+
+
+def assert_same_derived_state(problem, fresh):
+    assert problem.n_var == fresh.n_var and problem.n_ieq_constr == fresh.n_ieq_constr
+    for a, b in zip(problem.skill_groups, fresh.skill_groups):
+        assert np.array_equal(a, b)
+    assert np.allclose(problem.total_req_per_project, fresh.total_req_per_project)
+    assert problem.grid_units == fresh.grid_units
+    if fresh.grid_units is not None:
+        for name in ("S_int", "R_units", "T_units", "_skill_order", "_skill_starts", "_staffed_skills"):
+            assert np.array_equal(getattr(problem, name), getattr(fresh, name)), name
+    assert np.array_equal(problem.zobrist, fresh.zobrist)
+    # Listas de candidatos: mismas fuerzas (los empates pueden ordenarse distinto)
+    for name in ("positive_candidates", "negative_candidates"):
+        assert np.array_equal(candidate_strengths(problem, getattr(problem, name)),
+                              candidate_strengths(fresh, getattr(fresh, name))), name
+    partition = {frozenset(c.tolist()) for c in problem.symmetry_classes}
+    assert partition == {frozenset(c.tolist()) for c in fresh.symmetry_classes}
+    assert np.array_equal(problem.class_of_person >= 0, fresh.class_of_person >= 0)
+
+
+def test_updates_match_a_rebuilt_instance():
+    problem = twin_rich_problem()
+    assert problem.symmetry_classes  # La instancia de prueba tiene gemelos
+
+    problem.add_person(1)
+    assert_same_derived_state(problem, rebuilt(problem))
+
+    affinities = np.zeros(problem.H)
+    affinities[[0, 5]] = [1.0, -1.0]
+    problem.add_person(2, affinities)
+    assert_same_derived_state(problem, rebuilt(problem))
+
+    problem.patch_affinity([(3, 7, 1.0), (3, 9, -1.0)])
+    assert_same_derived_state(problem, rebuilt(problem))
+
+    problem.patch_affinity([(3, 7, 0.0), (3, 9, 0.0)])  # Puede devolver gemelos
+    assert_same_derived_state(problem, rebuilt(problem))
+
+    problem.update_requirement(0, 1, problem.R[0, 1] + 0.25)
+    assert_same_derived_state(problem, rebuilt(problem))
+
+    problem.remove_person(0)
+    assert_same_derived_state(problem, rebuilt(problem))
+
+    problem.remove_person(problem.H - 1)
+    assert_same_derived_state(problem, rebuilt(problem))
+
+
+def rebuilt_scenarios(problem):
+    """El mismo MultiScenarioMTFP construido desde cero con sus escenarios actuales."""
+    return MultiScenarioMTFP(rebuilt(problem), requirements=problem.R_scenarios, affinities=problem.S_scenarios,
+                             probabilities=problem.probabilities, objective=problem.objective,
+                             feasibility=problem.feasibility)
+
+
+def assert_same_scenarios(problem, fresh, rng):
+    assert_same_derived_state(problem, fresh)
+    X = rng.integers(0, len(problem.levels), size=(8, problem.n_var))
+    F, G = problem.evaluate(X, return_values_of=["F", "G"])
+    F_fresh, G_fresh = fresh.evaluate(X, return_values_of=["F", "G"])
+    assert np.allclose(F, F_fresh) and np.allclose(G, G_fresh)
+    scenarios = problem.evaluate_scenarios(X)
+    for s in range(problem.n_scenarios):
+        standalone = problem.scenario(s)
+        expected = [standalone.evaluate_solution(x)['efficiency'] for x in X]
+        assert np.allclose(scenarios['efficiency'][:, s], expected)
+
+
+@pytest.mark.parametrize("feasibility", ["nominal", "all"])
+def test_scenario_updates_reach_every_scenario(feasibility):
+    base = twin_rich_problem(seed=3)
+    requirements, affinities = sample_scenarios(base, 3, requirement_noise=0.25, affinity_flip=0.02, seed=3)
+    problem = MultiScenarioMTFP(base, requirements, affinities, feasibility=feasibility)
+    rng = np.random.default_rng(0)
+
+    scenario_rows = rng.integers(-1, 2, size=(3, problem.H)).astype(float)
+    problem.add_person(1, scenario_rows[0], scenario_affinities=scenario_rows)
+    assert np.array_equal(problem.S_scenarios[:, -1, :-1], scenario_rows)
+    assert_same_scenarios(problem, rebuilt_scenarios(problem), rng)
+
+    deviation = problem.R_scenarios[:, 2, 0] - problem.R[2, 0]
+    problem.update_requirement(2, 0, problem.R[2, 0] + 0.5)
+    assert np.allclose(problem.R_scenarios[:, 2, 0] - problem.R[2, 0], deviation)
+    problem.update_requirement(0, 1, 1.0, scenario_values=[0.75, 1.0, 1.25])
+    assert np.array_equal(problem.R_scenarios[:, 0, 1], [0.75, 1.0, 1.25])
+    assert_same_scenarios(problem, rebuilt_scenarios(problem), rng)
+
+    deviation = problem.S_scenarios[:, 3, 7] - problem.S[3, 7]
+    problem.patch_affinity([(3, 7, problem.S[3, 7] + 1.0), (4, 4, 2.0)])
+    assert np.allclose(problem.S_scenarios[:, 3, 7] - problem.S[3, 7], deviation)
+    assert np.allclose(problem.S_scenarios[:, 7, 3], problem.S_scenarios[:, 3, 7])
+    assert np.all(problem.S_scenarios[:, 4, 4] == 2.0)
+    assert_same_scenarios(problem, rebuilt_scenarios(problem), rng)
+
+    removed = problem.S_scenarios[:, 1:, 1:].copy()
+    problem.remove_person(0)
+    assert np.array_equal(problem.S_scenarios, removed)
+    assert_same_scenarios(problem, rebuilt_scenarios(problem), rng)
+
+
+def test_leaving_the_grid_falls_back_to_float():
+    problem = twin_rich_problem(seed=1)
+    problem.update_requirement(1, 0, 0.3)
+    assert problem.grid_units is None
+    assert_same_derived_state(problem, rebuilt(problem))
+
+    problem = twin_rich_problem(seed=1)
+    problem.patch_affinity([(0, 1, 0.5)])
+    assert problem.grid_units is None
+    assert_same_derived_state(problem, rebuilt(problem))
+
+
+def test_changes_since_reports_only_feasibility_changes():
+    problem = twin_rich_problem(seed=2)
+    version = problem.version
+    i, j = problem.skill_groups[0][0], problem.skill_groups[1][0]
+
+    problem.patch_affinity([(i, j, -1.0)])
+    assert problem.changes_since(version) == set()
+
+    problem.update_requirement(3, 2, problem.R[3, 2])
+    assert problem.changes_since(version) == {3}
+
+
+@pytest.mark.parametrize("update", ["requirement", "remove", "add", "affinity"])
+def test_warm_start_repairs_to_a_feasible_solution(update):
+    problem = create_mtfp_problem(n_people=40, n_projects=4, n_skills=4, seed=21)[0]
+    previous = LS(problem, seed=0).solve(max_iterations=200, verbose=False).X.astype(int)
+    version = problem.version
+
+    if update == "requirement":
+        k = int(np.argmax(problem.R.sum(axis=1)))
+        problem.update_requirement(k, 0, problem.R[k, 0] + 0.5)
+    elif update == "remove":
+        person = int(np.flatnonzero(problem.get_allocation_matrix(previous).sum(axis=1))[0])
+        problem.remove_person(person)
+    elif update == "add":
+        problem.add_person(0, np.where(np.arange(problem.H) % 3 == 0, 1.0, 0.0))
+    else:
+        problem.patch_affinity([(0, 1, -problem.S[0, 1] or 1.0)])
+
+    X = LS(problem, seed=0).warm_start_solution(previous, version)
+    assert problem.is_feasible(X)
+
+    # Los grupos de habilidad no afectados quedan intactos
+    untouched = set(range(problem.K)) - problem.changes_since(version)
+    old = problem.transfer_solution(previous, version).reshape(problem.H, problem.P)
+    for k in untouched:
+        rows = problem.skill_groups[k]
+        assert np.array_equal(X.reshape(problem.H, problem.P)[rows], old[rows])
+
+
+def brute_force_marginals(problem, A):
+    """removal_delta y el mejor sustituto por (i, l), reevaluando e_l desde cero."""
+    H, P = A.shape
+    removal = np.zeros((H, P))
+    best_sub = np.full((H, P), -1)
+    sub_delta = np.full((H, P), np.nan)
+    for l in range(P):
+        base = problem._calculate_project_efficiency(A[:, l], l)
+        for i in np.flatnonzero(A[:, l] > 0):
+            a = A[i, l]
+            without = A[:, l].copy()
+            without[i] = 0.0
+            removal[i, l] = problem._calculate_project_efficiency(without, l) - base
+            best = -np.inf
+            for j in problem.skill_groups[problem.skill_of_person[i]]:
+                target = A[j, l] + a
+                if (j == i or A[j].sum() + a > 1.0 + 1e-9
+                        or not np.isclose(target, problem.levels).any()):
+                    continue
+                x = without.copy()
+                x[j] = target
+                delta = problem._calculate_project_efficiency(x, l) - base
+                if delta > best + 1e-12:
+                    best, best_sub[i, l], sub_delta[i, l] = delta, j, delta
+    return removal, best_sub, sub_delta
+
+
+@pytest.mark.parametrize("levels", [None, [0.0, 0.5, 1.0], [0.0, 0.3, 0.7, 1.0]],
+                         ids=["quarters", "halves", "uneven"])
+def test_marginal_analysis_matches_brute_force(levels):
+    base = create_mtfp_problem(n_people=30, n_projects=3, n_skills=3, seed=4)[0]
+    problem = MTFP(base.H, base.P, base.K, base.S, base.R, base.skill_of_person,
+                   dedication_levels=None if levels is None else np.array(levels))
+    # Asignaciones aleatorias (no necesariamente factibles) con capacidad ≤ 1
+    rng = np.random.default_rng(0)
+    idx = rng.integers(0, len(problem.levels), size=(problem.H, problem.P))
+    idx[rng.random((problem.H, problem.P)) < 0.5] = 0
+    while True:
+        over = problem.levels[idx].sum(axis=1) > 1.0
+        if not over.any():
+            break
+        idx[over, rng.integers(0, problem.P)] = 0
+    X = idx.ravel()
+    A = problem.get_allocation_matrix(X)
+
+    result = problem.marginal_analysis(X)
+    removal, best_sub, sub_delta = brute_force_marginals(problem, A)
+
+    assert np.allclose(result['removal_delta'], removal)
+    assert np.allclose(result['marginal_contribution'], -removal)
+    assert np.allclose(result['removal_delta_global'], removal * problem.w)
+    found = best_sub >= 0
+    assert np.array_equal(result['best_substitute'] >= 0, found)
+    assert np.all(np.isnan(result['substitute_delta'][~found]))
+    # Ante empates basta con que el sustituto elegido logre el mismo delta
+    i, l = np.nonzero(found)
+    assert np.allclose(result['substitute_delta'][i, l], sub_delta[i, l])
+    assert np.all(problem.skill_of_person[result['best_substitute'][i, l]] == problem.skill_of_person[i])
+
+    # SA precalculado da lo mismo
+    cached = problem.marginal_analysis(X, SA=problem.S @ A)
+    assert np.allclose(cached['substitute_delta'][found], result['substitute_delta'][found])
+
+
+@pytest.mark.parametrize("levels, requirement_step", [
+    (None, 1.0),
+    ([0.0, 0.5, 1.0], 0.5),
+    ([0.0, 0.125, 0.25, 0.5, 0.75, 1.0], 0.125),
+], ids=["quarters", "halves", "eighths"])
+def test_integer_kernel_matches_float_path(levels, requirement_step):
+    base = create_mtfp_problem(n_people=30, n_projects=4, n_skills=3, seed=8)[0]
+    R = np.round(base.R * np.random.default_rng(1).uniform(0.5, 1.0, size=base.R.shape)
+                 / requirement_step) * requirement_step
+    kwargs = dict(dedication_levels=None if levels is None else np.array(levels))
+    exact = MTFP(base.H, base.P, base.K, base.S, R, base.skill_of_person, **kwargs)
+    plain = MTFP(base.H, base.P, base.K, base.S, R, base.skill_of_person, integer_kernel=False, **kwargs)
+    assert exact.grid_units is not None and plain.grid_units is None
+
+    rng = np.random.default_rng(2)
+    X = rng.integers(0, len(exact.levels), size=(50, exact.n_var))
+    X[rng.random(X.shape) < 0.7] = 0
+    # Más soluciones factibles que el muestreo al azar
+    X = np.vstack([X, [LS(exact, seed=s)._construct_feasible_solution() for s in range(10)]])
+
+    out_exact, out_plain = {}, {}
+    exact._evaluate(X, out_exact)
+    plain._evaluate(X, out_plain)
+    assert np.allclose(out_exact["F"], out_plain["F"], rtol=0, atol=1e-12)
+    assert np.allclose(out_exact["G"], out_plain["G"], rtol=0, atol=1e-9)
+    assert np.array_equal(out_exact["G"] <= 0, out_plain["G"] <= 0)
+    assert [exact.is_feasible(x) for x in X] == [plain.is_feasible(x) for x in X]
+
+    # La evaluación incremental coincide con la completa en ambos caminos
+    for problem, out in ((exact, out_exact), (plain, out_plain)):
+        state = problem.incremental_state(X[-1])
+        rows = problem.skill_groups[0]
+        X_new = X[-2].copy().reshape(problem.H, problem.P)
+        X_new[np.setdiff1d(np.arange(problem.H), rows)] = X[-1].reshape(problem.H, problem.P)[
+            np.setdiff1d(np.arange(problem.H), rows)]
+        eff, _, _ = problem.delta_efficiency(state, rows, X_new.ravel())
+        full = {}
+        problem._evaluate(X_new.reshape(1, -1), full)
+        assert eff == pytest.approx(-full["F"][0, 0], abs=1e-12)
+
+
+def test_off_grid_instance_uses_float_path():
+    base = create_mtfp_problem(n_people=20, n_projects=3, n_skills=2, seed=9)[0]
+    R = base.R.copy()
+    R[0, 0] += 0.1
+    assert MTFP(base.H, base.P, base.K, base.S, R, base.skill_of_person).grid_units is None
+    S = base.S.copy()
+    S[0, 1] = S[1, 0] = 0.5
+    assert MTFP(base.H, base.P, base.K, S, base.R, base.skill_of_person).grid_units is None
+
+
+def test_zobrist_collisions_stay_at_the_birthday_bound(small_problem):
+    # 64 bits: con 20000 soluciones se esperan ~1e-11 colisiones
+    report = zobrist_collision_rate(small_problem, n_solutions=20000, bits=64, seed=0)
+    assert report['collisions'] == 0
+    assert report['expected_collisions'] < 1e-6
+
+    # Truncando a 24 bits las colisiones aparecen, y en la cantidad esperada
+    report = zobrist_collision_rate(small_problem, n_solutions=20000, bits=24, seed=0)
+    expected = report['expected_collisions']
+    assert 5 < expected < 20
+    assert expected / 3 <= report['collisions'] <= expected * 3
+
+
+def test_incremental_fingerprint_equals_full_recomputation(medium_problem):
+    solver = LS(medium_problem, seed=0)
+    X = solver._construct_feasible_solution()
+    fingerprint = medium_problem.fingerprint(X)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        k = int(rng.integers(0, medium_problem.K))
+        X_new = solver._reassign_skill_group(X, k)
+        fingerprint = medium_problem.update_fingerprint(fingerprint, X, X_new, medium_problem.skill_groups[k])
+        assert fingerprint == medium_problem.fingerprint(X_new)
+        X = X_new
+    assert medium_problem.fingerprints(X[None])[0] == fingerprint
+
+
+def permute_twins(problem, X, rng):
+    """Misma solución con las filas de cada clase de gemelos permutadas al azar."""
+    alloc = np.asarray(X, dtype=int).reshape(problem.H, problem.P).copy()
+    for members in problem.symmetry_classes:
+        alloc[members] = alloc[rng.permutation(members)]
+    return alloc.reshape(-1)
+
+
+def test_canonical_form_preserves_objective_and_constraints():
+    problem = twin_rich_problem(seed=3)
+    assert problem.symmetry_classes
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, len(problem.levels), size=(30, problem.n_var))
+    X[rng.random(X.shape) < 0.6] = 0
+    X = np.vstack([X, [LS(problem, seed=s)._construct_feasible_solution() for s in range(10)]])
+
+    canonical = np.array([problem.canonical_form(x) for x in X])
+    out, out_canonical = {}, {}
+    problem._evaluate(X, out)
+    problem._evaluate(canonical, out_canonical)
+    assert np.array_equal(out["F"], out_canonical["F"])
+    # Requerimientos idénticos; las capacidades se permutan junto con las filas
+    H = problem.H
+    assert np.array_equal(out["G"][:, H:], out_canonical["G"][:, H:])
+    assert np.array_equal(np.sort(out["G"][:, :H], axis=1), np.sort(out_canonical["G"][:, :H], axis=1))
+
+    for x, c in zip(X, canonical):
+        assert np.array_equal(problem.canonical_form(c), c)  # Idempotente
+        twin = permute_twins(problem, x, rng)
+        assert np.array_equal(problem.canonical_form(twin), c)
+        assert problem.canonical_fingerprints(twin[None])[0] == problem.canonical_fingerprints(x[None])[0]
+        # Solo se reordenan filas dentro de cada clase
+        rows, rows_c = x.reshape(problem.H, problem.P), c.reshape(problem.H, problem.P)
+        for members in problem.symmetry_classes:
+            assert sorted(map(tuple, rows[members])) == sorted(map(tuple, rows_c[members]))
+        loners = problem.class_of_person < 0
+        assert np.array_equal(rows[loners], rows_c[loners])
@@ -0,0 +1,154 @@
+"""Tests de la API anytime (iter_solve / cancel / solve) de los solvers."""
+import time
+import asyncio
+
+import numpy as np
+import pytest
+
+from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
+from Algorithm.LS import LS
+from Algorithm.TabuSearch import TabuSearch
+from Algorithm.VNS import VNS
+from Algorithm.HillClimbing import HillClimbing
+from Algorithm.RandomSearch import RandomSearch
+from Algorithm.GRASP import GRASP
+from SolutionResult import SolutionResult, ImprovementEvent
+
+
+SOLVERS = [
+    (LS, {"max_iterations": 300}),
+    (TabuSearch, {"max_iterations": 40, "n_candidates": 5}),
+    (VNS, {"max_iterations": 30, "ls_max_iterations": 10}),
+    (HillClimbing, {"max_iterations": 40, "sample_size": 5}),
+    (RandomSearch, {"budget_nfe": 200}),
+    (GRASP, {"n_constructions": 10, "ls_max_iterations": 10}),
+]
+
+
+def drain(gen):
+    events = []
+    while True:
+        try:
+            events.append(next(gen))
+        except StopIteration as stop:
+            return events, stop.value
+
+
+@pytest.mark.parametrize("solver_cls, params", SOLVERS, ids=[s[0].__name__ for s in SOLVERS])
+def test_events_are_strict_improvements_in_order(small_problem, solver_cls, params):
+    events, result = drain(solver_cls(small_problem, seed=3).iter_solve(verbose=False, **params))
+
+    assert events and all(isinstance(e, ImprovementEvent) for e in events)
+    efficiencies = [e.efficiency for e in events]
+    assert all(b > a for a, b in zip(efficiencies, efficiencies[1:]))
+    assert all(b.nfe >= a.nfe for a, b in zip(events, events[1:]))
+    assert all(b.elapsed >= a.elapsed for a, b in zip(events, events[1:]))
+
+    # El resultado final es el último mejor emitido, y cada evento trae su X real
+    assert isinstance(result, SolutionResult)
+    assert float(result.F) == pytest.approx(efficiencies[-1])
+    assert np.array_equal(result.X, events[-1].X)
+    for e in events:
+        assert small_problem.evaluate_solution(e.X)["efficiency"] == pytest.approx(e.efficiency)
+
+
+@pytest.mark.parametrize("solver_cls, params", SOLVERS, ids=[s[0].__name__ for s in SOLVERS])
+def test_solve_equals_draining_iter_solve(small_problem, solver_cls, params):
+    _, drained = drain(solver_cls(small_problem, seed=5).iter_solve(verbose=False, **params))
+    solved = solver_cls(small_problem, seed=5).solve(verbose=False, **params)
+    assert np.array_equal(drained.X, solved.X)
+    assert float(drained.F) == float(solved.F)
+
+
+def test_cancel_returns_best_so_far_and_closes(small_problem):
+    gen = TabuSearch(small_problem, seed=1).iter_solve(max_iterations=10000, n_candidates=5, verbose=False)
+    first = next(gen)
+
+    result = MTFP_BaseSolver.cancel(gen)
+
+    assert isinstance(result, SolutionResult)
+    assert float(result.F) == pytest.approx(first.efficiency)
+    assert np.array_equal(result.X, first.X)
+    with pytest.raises(StopIteration):
+        next(gen)
+
+
+def test_include_allocation_matches_X(small_problem):
+    event = next(LS(small_problem, seed=2).iter_solve(max_iterations=10, include_allocation=True, verbose=False))
+    assert np.array_equal(event.allocation, small_problem.get_allocation_matrix(event.X))
+
+
+def test_stop_check_ends_the_run_between_events(small_problem):
+    solver = LS(small_problem, seed=4)
+    calls = {"n": 0}
+
+    def stop_check():
+        calls["n"] += 1
+        return calls["n"] > 25
+
+    solver.stop_check = stop_check
+    result = solver.solve(max_iterations=100000, verbose=False)
+    assert calls["n"] == 26
+    assert len(result.history) <= 27
+
+
+@pytest.mark.parametrize("affinity_bias", [0.0, 1.0], ids=["random", "affinity_biased"])
+def test_reassign_skill_group_returns_canonical_feasible_group(monkeypatch, affinity_bias):
+    from Algorithm.test_MTFP import twin_rich_problem
+
+    problem = twin_rich_problem(seed=4)
+    solver = MTFP_BaseSolver(problem, seed=0, affinity_bias=affinity_bias)
+    X = solver._construct_feasible_solution()
+
+    # Contar las veces que la reasignación ordena candidatos por afinidad
+    scored = []
+    candidate_affinity = problem.candidate_affinity
+    monkeypatch.setattr(problem, "candidate_affinity",
+                        lambda people, team: scored.append(len(people)) or candidate_affinity(people, team))
+    for k in range(problem.K):
+        X_new = solver._reassign_skill_group(X, k)
+        # Canónica en el grupo reasignado, con la misma eficiencia que su versión sin ordenar
+        assert np.array_equal(problem.canonical_form(X_new, skills=[k]), X_new)
+        shuffled = X_new.copy()
+        rng = np.random.default_rng(k)
+        alloc = shuffled.reshape(problem.H, problem.P)
+        for members in problem.symmetry_classes:
+            alloc[members] = alloc[rng.permutation(members)]
+        assert solver._get_efficiency_fast(shuffled) == solver._get_efficiency_fast(X_new)
+        # Factible, y el resto de los grupos queda intacto
+        assert problem.is_feasible(X_new)
+        others = problem.skill_of_person != k
+        assert np.array_equal(X_new.reshape(problem.H, problem.P)[others], X.reshape(problem.H, problem.P)[others])
+        X = X_new
+    # Con affinity_bias=1 cada proyecto con requerimiento pasa por el orden por afinidad
+    assert len(scored) == (np.count_nonzero(problem.R) if affinity_bias else 0)
+
+
+@pytest.mark.parametrize("solver_cls, params", SOLVERS, ids=[s[0].__name__ for s in SOLVERS])
+def test_expired_deadline_still_returns_a_solution(small_problem, solver_cls, params):
+    solver = solver_cls(small_problem, seed=6)
+    solver.deadline = time.time() - 1
+    result = solver.solve(verbose=False, **params)
+    assert result.X is not None
+    assert small_problem.evaluate_solution(result.X)["efficiency"] == pytest.approx(float(result.F))
+
+
+def test_grasp_events_count_local_search_evaluations(small_problem):
+    solver = GRASP(small_problem, seed=7)
+    events, result = drain(solver.iter_solve(n_constructions=10, ls_max_iterations=20, verbose=False))
+    assert events[0].nfe > 1  # La LS de la primera construcción ya evaluó vecinos
+    assert events[-1].nfe <= result.extra["nfe"] == solver.total_nfe()
+
+
+def test_aiter_solve_exposes_the_final_result(small_problem):
+    async def consume(solver):
+        return [event async for event in solver.aiter_solve(max_iterations=300, verbose=False)]
+
+    solver = LS(small_problem, seed=8)
+    events = asyncio.run(consume(solver))
+    expected_events, expected = drain(LS(small_problem, seed=8).iter_solve(max_iterations=300, verbose=False))
+
+    assert [e.efficiency for e in events] == [e.efficiency for e in expected_events]
+    assert isinstance(solver.last_result, SolutionResult)
+    assert np.array_equal(solver.last_result.X, expected.X)
+    assert float(solver.last_result.F) == float(expected.F)
@@ -0,0 +1,37 @@
+"""Tests del multi-arranque paralelo cooperativo (políticas y presupuesto de iteraciones)."""
+import pytest
+
+from Algorithm.MultiStart import run_parallel_multistart
+
+N_STARTS, ITERATIONS = 6, 200
+
+
+def multistart(problem, **kwargs):
+    params = dict(algo_type="LS", n_starts=N_STARTS, n_workers=2, trajectory_iterations=ITERATIONS,
+                  sync_iterations=20, seed=1, poll_interval=0.1, verbose=False)
+    params.update(kwargs)
+    return run_parallel_multistart(problem, **params)
+
+
+@pytest.mark.parametrize("policy", ["adopt", "cancel", "independent"])
+def test_every_start_is_run_once_within_its_iteration_budget(small_problem, policy):
+    result = multistart(small_problem, policy=policy)
+
+    assert result.feasible and result.extra["failed_workers"] == []
+    assert result.extra["starts"] == N_STARTS
+    # LS: una evaluación por iteración más la de la solución inicial de cada iter_solve
+    # (una por arranque y otra por cada adopción)
+    assert result.extra["nfe"] <= N_STARTS * (ITERATIONS + 1) + result.extra["adopted"]
+    if policy == "independent":
+        assert result.extra["adopted"] == result.extra["cancelled"] == 0
+        assert result.extra["nfe"] == N_STARTS * (ITERATIONS + 1)
+    elif policy == "cancel":
+        assert result.extra["adopted"] == 0
+    else:
+        assert result.extra["cancelled"] == 0
+
+
+def test_target_efficiency_stops_every_worker(small_problem):
+    result = multistart(small_problem, n_starts=1000, target_efficiency=0.5)
+    assert result.extra["target_reached"] and float(result.F) >= 0.5
+    assert result.extra["starts"] < 1000
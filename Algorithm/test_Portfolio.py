@@ -0,0 +1,64 @@
+"""Tests del portafolio: cancelación por objetivo, plazo de gracia y miembros caídos."""
+import os
+import time
+import multiprocessing
+
+import pytest
+
+from Algorithm import Portfolio
+from Algorithm.LS import LS
+from Algorithm.Portfolio import run_portfolio
+
+
+class StubbornSolver(LS):
+    """Miembro que reporta una solución y luego ignora la cancelación."""
+    def iter_solve(self, verbose=False, **kwargs):
+        X = self._construct_feasible_solution()
+        yield self._improvement_event(time.time(), 0, self._get_efficiency_fast(X), X)
+        time.sleep(60)
+
+
+class CrashingSolver(LS):
+    """Miembro cuyo proceso muere sin enviar su resultado."""
+    def iter_solve(self, verbose=False, **kwargs):
+        os._exit(3)
+        yield
+
+
+# Los miembros de prueba llegan a los procesos hijos solo si estos heredan el módulo (fork)
+needs_fork = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="los miembros de prueba se registran en el proceso padre")
+
+
+def test_target_cancels_the_other_members(small_problem):
+    start = time.time()
+    result = run_portfolio(small_problem, members={"LS": {"max_iterations": 10**6},
+                                                   "Tabu": {"max_iterations": 10**6, "n_candidates": 5}},
+                           target_efficiency=0.5, grace_seconds=5.0, verbose=False)
+    assert result.extra["target_reached"] and float(result.F) >= 0.5
+    assert time.time() - start < 30.0  # Sin la cancelación, cada miembro correría 10^6 iteraciones
+    traces = result.extra["portfolio_traces"]
+    assert set(traces) == {"LS", "Tabu"} and any(traces.values())
+    assert result.extra["portfolio_winner"] in traces
+    assert all(b[1] > a[1] for trace in traces.values() for a, b in zip(trace, trace[1:]))
+
+
+@needs_fork
+def test_unresponsive_member_is_terminated_after_the_grace_period(small_problem, monkeypatch):
+    monkeypatch.setitem(Portfolio.PORTFOLIO_SOLVERS, "Stubborn", StubbornSolver)
+    start = time.time()
+    result = run_portfolio(small_problem, members={"LS": {"max_iterations": 10**6}, "Stubborn": {}},
+                           max_time_seconds=1.0, grace_seconds=0.5, verbose=False)
+    assert time.time() - start < 15.0  # Stubborn duerme 60 s: solo terminarlo explica el tiempo
+    assert result.extra["portfolio_traces"]["Stubborn"]
+    assert result.feasible
+
+
+@needs_fork
+def test_dead_member_is_discarded(small_problem, monkeypatch):
+    monkeypatch.setitem(Portfolio.PORTFOLIO_SOLVERS, "Crashing", CrashingSolver)
+    result = run_portfolio(small_problem, members={"LS": {"max_iterations": 500}, "Crashing": {}},
+                           verbose=False)
+    assert result.extra["portfolio_winner"] == "LS"
+    assert result.extra["portfolio_member_best"]["Crashing"] is None
+    assert result.feasible
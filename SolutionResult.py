@@ -111,6 +111,34 @@ class SolutionResult:
         )
 
 
+class ImprovementEvent:
+    """
+    Evento emitido por los iter_solve() de los solvers cada vez que mejora el mejor global.
+    'allocation' (matriz H x P) solo se incluye si se pidió include_allocation=True.
+    """
+    def __init__(self, elapsed, nfe, efficiency, iteration, X=None, allocation=None):
+        self.elapsed = elapsed
+        self.nfe = nfe
+        self.efficiency = float(efficiency)
+        self.iteration = iteration
+        self.X = X
+        self.allocation = allocation
+
+    def to_serializable_dict(self):
+        return {
+            "elapsed": self.elapsed,
+            "nfe": self.nfe,
+            "efficiency": self.efficiency,
+            "iteration": self.iteration,
+            "X": self.X,
+            "allocation": self.allocation
+        }
+
+    def __repr__(self):
+        return (f"ImprovementEvent(t={self.elapsed:.2f}s, nfe={self.nfe}, "
+                f"iter={self.iteration}, eff={self.efficiency:.4f})")
+
+
 def compare_solutions_side_by_side(solutions_dict):
     """
     Compare multiple SolutionResult objects in a clear table format.
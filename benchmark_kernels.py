@@ -0,0 +1,274 @@
+"""
+Micro-benchmarks de los kernels calientes de MTFP, separados de la elección de algoritmo.
+
+Uso:
+    python benchmark_kernels.py                              # grilla completa -> results/benchmarks/
+    python benchmark_kernels.py --grid quick                 # solo BASE_CASE..STRESS_TEST
+    python benchmark_kernels.py --save-baseline results/benchmarks/baseline.json
+    python benchmark_kernels.py --baseline results/benchmarks/baseline.json --tolerance 0.25
+    python benchmark_kernels.py --imports                    # solo el presupuesto de importación
+
+Con --baseline, cada kernel se compara por mediana contra la línea base y se marca
+como regresión si es más lento que (1 + tolerance); el proceso termina con código 1
+si hay alguna regresión.
+
+Con --imports se mide el tiempo de importación (python -X importtime, en un proceso
+nuevo) de los módulos que cargan los workers y se verifica que no arrastren
+matplotlib, pandas ni los algoritmos de pymoo; termina con código 1 si alguno
+excede su presupuesto.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+import numpy as np
+
+from Algorithm.MTFP import create_mtfp_problem, MultiScenarioMTFP, sample_scenarios
+from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
+from Algorithm.GA import MTFPDecompositionSampling, MTFPSkillMutation, MTFPSkillCrossover
+
+
+# Desde BASE_CASE hasta 10x STRESS_TEST (en personas y también en proyectos/habilidades)
+GRIDS = {
+    "quick": [
+        {"name": "BASE_CASE", "n_people": 20, "n_projects": 3, "n_skills": 2},
+        {"name": "PAPER_MAX", "n_people": 100, "n_projects": 10, "n_skills": 10},
+        {"name": "STRESS_TEST", "n_people": 200, "n_projects": 20, "n_skills": 20},
+    ],
+}
+GRIDS["full"] = GRIDS["quick"] + [
+    {"name": "STRESS_x5", "n_people": 1000, "n_projects": 20, "n_skills": 20},
+    {"name": "STRESS_x10", "n_people": 2000, "n_projects": 20, "n_skills": 20},
+    {"name": "STRESS_x10_WIDE", "n_people": 2000, "n_projects": 200, "n_skills": 200},
+]
+
+
+# Presupuesto de importación (ms, acumulado incluyendo numpy) de lo que carga un worker
+IMPORT_BUDGETS_MS = {
+    "SolutionResult": 250,
+    "Algorithm.MTFP": 300,
+    "Algorithm.LS": 300,
+    "Algorithm.TabuSearch": 300,
+    "Algorithm.VNS": 300,
+    "Algorithm.GRASP": 350,
+    "run": 400,
+}
+# Módulos que los solvers de trayectoria no deben importar
+HEAVY_MODULES = ["matplotlib", "pandas", "tqdm", "pymoo.algorithms", "pymoo.optimize"]
+
+
+def measure_import(module, repeats=5):
+    """
+    Tiempo de importación de 'module' (ms, mediana de procesos nuevos) y los
+    módulos pesados que arrastra.
+    """
+    times = []
+    for _ in range(repeats):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              capture_output=True, text=True, check=True)
+        # Última línea: el propio módulo, con el tiempo acumulado en microsegundos
+        times.append(int(proc.stderr.strip().splitlines()[-1].split("|")[1]) / 1000.0)
+
+    probe = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    loaded = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout.strip()
+    return {"median_ms": float(np.median(times)), "heavy_modules": [m for m in loaded.split(",") if m]}
+
+
+def check_import_budgets(budgets=None, repeats=5, verbose=True):
+    """Retorna filas {module, median_ms, budget_ms, heavy_modules, ok}."""
+    rows = []
+    for module, budget in (budgets or IMPORT_BUDGETS_MS).items():
+        stats = measure_import(module, repeats)
+        ok = stats["median_ms"] <= budget and not stats["heavy_modules"]
+        rows.append({"module": module, "budget_ms": budget, "ok": ok, **stats})
+        if verbose:
+            extra = f"  arrastra: {stats['heavy_modules']}" if stats["heavy_modules"] else ""
+            print(f"   {module:<25} {stats['median_ms']:8.1f} ms / {budget} ms {'✅' if ok else '❌'}{extra}")
+    return rows
+
+
+def time_kernel(func, min_time=0.05, repeats=5, max_number=10000, max_time=5.0):
+    """
+    Tiempo por llamada de 'func' (segundos): ajusta el número de llamadas por
+    repetición para que cada una dure al menos 'min_time' y retorna estadísticas
+    sobre hasta 'repeats' repeticiones (menos si el kernel excede 'max_time' en total).
+    """
+    budget_start = time.perf_counter()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= max_number:
+            break
+        number = min(max_number, max(number * 2, int(number * min_time / max(elapsed, 1e-9))))
+
+    samples = [elapsed / number]
+    for _ in range(repeats - 1):
+        if time.perf_counter() - budget_start > max_time:
+            break
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {
+        "median": float(np.median(samples)),
+        "min": float(np.min(samples)),
+        "max": float(np.max(samples)),
+        "number": number,
+        "repeats": len(samples)
+    }
+
+
+def benchmark_instance(spec, positive_ratio=0.3, pop_size=100, seed=12345, min_time=0.05, repeats=5):
+    """Mide todos los kernels sobre una instancia. Retorna {kernel: estadísticas}."""
+    params = dict(n_people=spec["n_people"], n_projects=spec["n_projects"],
+                  n_skills=spec["n_skills"], positive_ratio=positive_ratio)
+
+    timings = {}
+    # La generación se mide una sola vez por repetición (es la más lenta en instancias grandes)
+    timings["create_mtfp_problem"] = time_kernel(lambda: create_mtfp_problem(**params, seed=seed),
+                                                 min_time=0, repeats=min(repeats, 3))
+    problem = create_mtfp_problem(**params, seed=seed)[0]
+
+    solver = MTFP_BaseSolver(problem, seed=seed)
+    np.random.seed(seed)
+    # Hasta 10 soluciones distintas repetidas: el costo de los kernels no depende de la diversidad
+    distinct = [solver._construct_feasible_solution() for _ in range(min(pop_size, 10))]
+    population = np.array([distinct[i % len(distinct)] for i in range(pop_size)])
+    X = population[0]
+    allocation = problem.get_allocation_matrix(X)
+    out = {}
+
+    kernels = {
+        "_evaluate_single": lambda: problem._evaluate(X.reshape(1, -1), out),
+        "_evaluate_batch": lambda: problem._evaluate(population, out),
+        "_calculate_constraints": lambda: problem._calculate_constraints(allocation),
+        "_calculate_global_efficiency": lambda: problem._calculate_global_efficiency(allocation),
+        "_reassign_skill_group": lambda: solver._reassign_skill_group(X, int(solver.rng.integers(problem.K))),
+        "_encode": lambda: solver._encode(allocation),
+        "_decode": lambda: problem._decode(X),
+        "_decode_batch": lambda: problem._decode(population),
+        "ga_sampling": lambda: MTFPDecompositionSampling(problem)._do(problem, pop_size),
+        "ga_mutation": lambda: MTFPSkillMutation(problem, prob=1.0)._do(problem, population),
+        "ga_crossover": lambda: MTFPSkillCrossover(problem, prob=1.0)._do(
+            problem, np.stack([population[: pop_size // 2], population[pop_size // 2:]])),
+    }
+    # Una asignación evaluada en 16 escenarios de R (y de S hasta 1000 personas: la pila ocupa N*H^2)
+    requirements, affinities = sample_scenarios(problem, 16, requirement_noise=0.5,
+                                                affinity_flip=0.1 if problem.H <= 1000 else 0.0, seed=seed)
+    scenarios_R = MultiScenarioMTFP(problem, requirements=requirements)
+    kernels["scenarios_R16_batched"] = lambda: scenarios_R._evaluate(X.reshape(1, -1), out)
+    if affinities is not None:
+        scenarios_S = MultiScenarioMTFP(problem, affinities=affinities)
+        kernels["scenarios_S16_batched"] = lambda: scenarios_S._evaluate(X.reshape(1, -1), out)
+
+    for name, func in kernels.items():
+        timings[name] = time_kernel(func, min_time=min_time, repeats=repeats)
+    return timings
+
+
+def environment_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit or None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+
+def compare_with_baseline(current, baseline, tolerance=0.25):
+    """
+    Compara medianas instancia a instancia y kernel a kernel.
+    Retorna filas {instance, kernel, baseline, current, ratio, regression}.
+    """
+    rows = []
+    for instance, kernels in current["results"].items():
+        base_kernels = baseline["results"].get(instance, {})
+        for kernel, stats in kernels.items():
+            if kernel not in base_kernels:
+                continue
+            ratio = stats["median"] / base_kernels[kernel]["median"]
+            rows.append({
+                "instance": instance,
+                "kernel": kernel,
+                "baseline": base_kernels[kernel]["median"],
+                "current": stats["median"],
+                "ratio": ratio,
+                "regression": ratio > 1 + tolerance
+            })
+    return rows
+
+
+def run_benchmarks(grid="full", pop_size=100, min_time=0.05, repeats=5, verbose=True):
+    report = {"environment": environment_info(), "pop_size": pop_size, "results": {}}
+    for spec in GRIDS[grid]:
+        label = f"{spec['name']}_P{spec['n_people']}_Pr{spec['n_projects']}_Sk{spec['n_skills']}"
+        if verbose:
+            print(f"⏱️  {label}...")
+        report["results"][label] = benchmark_instance(spec, pop_size=pop_size, min_time=min_time, repeats=repeats)
+        if verbose:
+            for kernel, stats in report["results"][label].items():
+                print(f"   {kernel:<30} {stats['median'] * 1e3:10.3f} ms")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmarks de los kernels de MTFP")
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="full")
+    parser.add_argument("--pop-size", type=int, default=100)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Archivo JSON (por defecto results/benchmarks/kernels_<fecha>.json)")
+    parser.add_argument("--save-baseline", default=None, help="Guardar además el resultado como línea base")
+    parser.add_argument("--baseline", default=None, help="Línea base JSON contra la cual comparar")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Holgura relativa antes de marcar regresión")
+    parser.add_argument("--imports", action="store_true", help="Solo verificar el presupuesto de importación")
+    args = parser.parse_args()
+
+    if args.imports:
+        print("⏱️  Tiempo de importación (proceso nuevo):")
+        failures = [r for r in check_import_budgets(repeats=args.repeats) if not r["ok"]]
+        if failures:
+            print(f"\n❌ {len(failures)} módulos exceden su presupuesto.")
+            sys.exit(1)
+        print("\n✅ Importaciones dentro del presupuesto.")
+        sys.exit(0)
+
+    report = run_benchmarks(args.grid, args.pop_size, args.min_time, args.repeats)
+
+    output = args.output or os.path.join("results", "benchmarks", f"kernels_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    for path in filter(None, (output, args.save_baseline)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Guardado: {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare_with_baseline(report, baseline, args.tolerance)
+        regressions = [r for r in rows if r["regression"]]
+
+        print(f"\n📊 Comparación con {args.baseline} (tolerancia {args.tolerance:.0%}):")
+        for r in rows:
+            flag = "❌ REGRESIÓN" if r["regression"] else ("✅" if r["ratio"] < 1 else "  ")
+            print(f"   {r['instance']:<40} {r['kernel']:<30} x{r['ratio']:.2f} {flag}")
+
+        if regressions:
+            print(f"\n❌ {len(regressions)} regresiones detectadas.")
+            sys.exit(1)
+        print("\n✅ Sin regresiones.")
@@ -0,0 +1,24 @@
+"""
+Configuración de pytest: los tests viven junto al código (Algorithm/test_<Módulo>.py
+y test_<script>.py en la raíz) e importan los módulos igual que los scripts.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Algorithm.MTFP import create_mtfp_problem  # noqa: E402
+
+
+@pytest.fixture
+def small_problem():
+    """Instancia BASE_CASE (20 personas, 3 proyectos, 2 habilidades)."""
+    return create_mtfp_problem(n_people=20, n_projects=3, n_skills=2, seed=12345)[0]
+
+
+@pytest.fixture
+def medium_problem():
+    """Instancia intermedia (60 personas, 6 proyectos, 5 habilidades)."""
+    return create_mtfp_problem(n_people=60, n_projects=6, n_skills=5, seed=7)[0]
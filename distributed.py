@@ -0,0 +1,402 @@
+"""
+Ejecución distribuida del benchmark: un coordinador con la lista de tareas y
+workers en cualquier número de nodos que las piden por TCP.
+
+Uso:
+    # Nodo coordinador (dueño de las tareas y de los resultados), escuchando en la
+    # interfaz de la red privada del clúster
+    python distributed.py coordinator --host 10.0.0.5 --port 6000 --authkey "$MTFP_AUTHKEY" --experiments STRESS_TEST
+    # En cada nodo de cómputo (uno por núcleo, o --processes N)
+    python distributed.py worker --host 10.0.0.5 --port 6000 --authkey "$MTFP_AUTHKEY" --processes 8
+    # Prueba local: coordinador + N procesos worker en localhost (clave aleatoria)
+    python distributed.py local --workers 4 --experiments BASE_CASE --runs 3 --budget 2000
+
+Seguridad: los mensajes son pickles, así que quien conozca la clave puede ejecutar
+código en el coordinador y en los workers. No hay clave por defecto: --authkey (o la
+variable de entorno MTFP_AUTHKEY) es obligatoria para los workers y para un
+coordinador que escuche fuera de loopback; un coordinador en 127.0.0.1 sin clave
+genera una aleatoria y la muestra. Escuchar en 0.0.0.0 expone el puerto en todas las
+interfaces: usar la IP de una red de confianza o un túnel SSH.
+
+Protocolo (multiprocessing.connection, autenticado con authkey):
+    worker -> ("get",)                         coordinador -> ("task", ...) | ("wait", s) | ("done",)
+    worker -> ("heartbeat", clave)             extiende el lease de la tarea
+    worker -> ("result", clave, resultado)     resultado de execute_algorithm_task
+
+Cada tarea (algoritmo, instancia, semilla, run, parámetros) tiene una clave
+idempotente. Una tarea entregada queda en lease; si el worker se desconecta o
+deja de enviar heartbeats por 'lease_timeout' segundos vuelve a la cola. Si una
+tarea se completa dos veces, solo cuenta el primer resultado. Los resultados se
+agregan a 'results_path' a medida que llegan: al relanzar el coordinador las
+tareas ya resueltas no se repiten, y los workers conectados se reconectan solos
+(reenviando el resultado que no alcanzaron a entregar).
+"""
+import os
+import time
+import json
+import pickle
+import socket
+import hashlib
+import argparse
+import ipaddress
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import Listener, Client, AuthenticationError
+
+from Algorithm.MTFP import create_mtfp_problem
+from SolutionResult import SolutionResult
+from run import EXPERIMENTS, build_benchmark_tasks, execute_algorithm_task, finalize_experiment
+
+
+def is_loopback(host):
+    """True si 'host' solo es accesible desde la propia máquina (127.0.0.0/8, ::1)."""
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def task_key(exp_name, algo_type, seed, run_id, params):
+    """Clave idempotente de una tarea (independiente del orden y del nodo que la ejecute)."""
+    canonical = json.dumps([exp_name, algo_type, int(seed), int(run_id), params], sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=12).hexdigest()
+
+
+class Coordinator:
+    """
+    Dueño de la lista de tareas. Atiende a cada worker en un hilo y reencola las
+    tareas cuyo lease vence (worker caído o sin heartbeats).
+    """
+    def __init__(self, experiments, n_runs=None, budget_nfe=None, master_seed=42, host="127.0.0.1", port=6000,
+                 authkey=None, lease_timeout=60.0, results_path=None, verbose=True):
+        if not authkey:
+            raise ValueError("authkey es obligatoria (sin ella cualquiera podría enviar pickles al coordinador)")
+        self.lease_timeout = lease_timeout
+        self.verbose = verbose
+        self.lock = threading.Condition()
+        self.instances = {}    # nombre del experimento -> MTFP
+        self.tasks = {}        # clave -> (experimento, algoritmo, semilla, run, parámetros)
+        self.queue = deque()
+        self.leases = {}       # clave -> (id de conexión, vencimiento)
+        self.results = {}      # clave -> dict serializable del SolutionResult
+        self.sent_instances = {}  # id de conexión -> experimentos ya enviados
+        self.stats = {"dispatched": 0, "requeued": 0, "duplicates": 0, "workers": 0}
+
+        self.experiments = []
+        for exp in experiments:
+            exp = dict(exp, n_runs=n_runs or exp["n_runs"], budget_nfe=budget_nfe or exp["budget_nfe"])
+            self.experiments.append(exp)
+            problem = create_mtfp_problem(**exp["params"], seed=12345)[0]
+            self.instances[exp["name"]] = problem
+            for algo_type, _, seed, run_id, params in build_benchmark_tasks(
+                    problem, exp["n_runs"], exp["budget_nfe"], master_seed):
+                key = task_key(exp["name"], algo_type, seed, run_id, params)
+                self.tasks[key] = (exp["name"], algo_type, seed, run_id, params)
+
+        self.results_path = results_path
+        if results_path and os.path.exists(results_path):
+            with open(results_path, "rb") as f:
+                while True:
+                    try:
+                        key, result = pickle.load(f)
+                    except EOFError:
+                        break
+                    if key in self.tasks:
+                        self.results[key] = result
+        self.queue.extend(k for k in self.tasks if k not in self.results)
+
+        self.listener = Listener((host, port), authkey=authkey)
+        self.address = self.listener.address
+        self._closed = False
+
+    # --- Estado ---
+    def remaining(self):
+        return len(self.tasks) - len(self.results)
+
+    def _next_task(self, conn_id):
+        with self.lock:
+            if not self.remaining():
+                return ("done",)
+            if not self.queue:
+                return ("wait", 1.0)  # Todo entregado: puede reencolarse algo si un worker cae
+            key = self.queue.popleft()
+            exp_name, algo_type, seed, run_id, params = self.tasks[key]
+            self.leases[key] = (conn_id, time.time() + self.lease_timeout)
+            sent = self.sent_instances.setdefault(conn_id, set())
+            problem = None if exp_name in sent else self.instances[exp_name]
+            sent.add(exp_name)
+            self.stats["dispatched"] += 1
+            return ("task", key, exp_name, problem, (algo_type, seed, run_id, params))
+
+    def _record(self, key, result):
+        with self.lock:
+            self.leases.pop(key, None)
+            if key not in self.tasks:
+                return  # Resultado pendiente de otra corrida del coordinador
+            if key in self.results:
+                self.stats["duplicates"] += 1
+                return
+            if key in self.queue:  # Reencolada pero ya resuelta por el worker original
+                self.queue.remove(key)
+            self.results[key] = result
+            if self.results_path:
+                with open(self.results_path, "ab") as f:
+                    pickle.dump((key, result), f)
+            if self.verbose:
+                done = len(self.results)
+                print(f"[Coordinator] {done}/{len(self.tasks)} tareas ({self.tasks[key][1]}, {self.tasks[key][0]})")
+            self.lock.notify_all()
+
+    def _requeue(self, keys, reason):
+        for key in keys:
+            self.leases.pop(key, None)
+            if key not in self.results and key not in self.queue:
+                self.queue.appendleft(key)
+                self.stats["requeued"] += 1
+        if keys and self.verbose:
+            print(f"[Coordinator] Reencoladas {len(keys)} tareas ({reason})")
+
+    # --- Red ---
+    def _serve_connection(self, conn, conn_id):
+        with self.lock:
+            self.stats["workers"] += 1
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] == "get":
+                    conn.send(self._next_task(conn_id))
+                elif message[0] == "heartbeat":
+                    with self.lock:
+                        if message[1] in self.leases:
+                            self.leases[message[1]] = (conn_id, time.time() + self.lease_timeout)
+                elif message[0] == "result":
+                    self._record(message[1], message[2])
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            with self.lock:
+                self._requeue([k for k, (c, _) in self.leases.items() if c == conn_id], "worker desconectado")
+                self.sent_instances.pop(conn_id, None)
+
+    def _accept_loop(self):
+        conn_id = 0
+        while not self._closed:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                if self._closed:
+                    return
+                continue  # Autenticación fallida u otra conexión inválida
+            conn_id += 1
+            threading.Thread(target=self._serve_connection, args=(conn, conn_id), daemon=True).start()
+
+    def _lease_monitor(self):
+        while not self._closed:
+            time.sleep(min(1.0, self.lease_timeout / 4))
+            with self.lock:
+                now = time.time()
+                self._requeue([k for k, (_, expiry) in self.leases.items() if expiry < now], "lease vencido")
+
+    def run(self, finalize=True, results_dir="results"):
+        """Atiende workers hasta completar todas las tareas. Retorna {experimento: [SolutionResult]}."""
+        if self.verbose:
+            print(f"[Coordinator] {len(self.tasks)} tareas ({len(self.results)} ya resueltas) "
+                  f"en {self.address[0]}:{self.address[1]}")
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        threading.Thread(target=self._lease_monitor, daemon=True).start()
+
+        with self.lock:
+            while self.remaining():
+                self.lock.wait(timeout=1.0)
+        # Margen para que los workers reciban ("done",) antes de cerrar
+        time.sleep(min(2.0, self.lease_timeout))
+        self.close()
+
+        grouped = {exp["name"]: [] for exp in self.experiments}
+        for key, result in self.results.items():
+            if result is not None:
+                grouped[self.tasks[key][0]].append(SolutionResult.from_serializable_dict(result))
+        if finalize:
+            os.makedirs(results_dir, exist_ok=True)
+            for exp in self.experiments:
+                finalize_experiment(exp, self.instances[exp["name"]], grouped[exp["name"]], results_dir)
+        if self.verbose:
+            print(f"[Coordinator] Fin: {self.stats}")
+        return grouped
+
+    def close(self):
+        self._closed = True
+        self.listener.close()
+
+
+def _connect(host, port, authkey, retry_seconds):
+    """Conexión al coordinador, reintentando cada segundo durante 'retry_seconds'."""
+    deadline = time.time() + retry_seconds
+    while True:
+        try:
+            return Client((host, port), authkey=authkey)
+        except (ConnectionRefusedError, OSError):
+            if time.time() > deadline:
+                raise
+            time.sleep(1.0)
+
+
+def run_worker(host, port, authkey=None, heartbeat_interval=10.0, retry_seconds=30.0, verbose=True):
+    """
+    Worker: pide tareas al coordinador, las ejecuta con execute_algorithm_task y
+    envía el resultado. Un hilo envía heartbeats mientras la tarea corre.
+
+    Si la conexión se cae antes de recibir ("done",) (p.ej. el coordinador se
+    reinició), se reconecta durante 'retry_seconds' y entrega primero el resultado
+    que quedó pendiente; si el coordinador no vuelve, el worker termina.
+    """
+    if not authkey:
+        raise ValueError("authkey es obligatoria")
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    instances = {}
+    pending = None  # (clave, resultado) aún no entregado
+    n_done = 0
+    n_sessions = 0
+
+    while True:
+        try:
+            conn = _connect(host, port, authkey, retry_seconds)
+        except (ConnectionRefusedError, OSError):
+            if n_sessions == 0:
+                raise
+            if verbose:
+                print(f"[Worker {name}] El coordinador no volvió en {retry_seconds:.0f}s")
+            break
+        n_sessions += 1
+        send_lock = threading.Lock()
+
+        def send(message):
+            with send_lock:
+                conn.send(message)
+
+        try:
+            if pending is not None:
+                send(("result",) + pending)
+                pending = None
+                n_done += 1
+            while True:
+                send(("get",))
+                message = conn.recv()
+                if message[0] == "done":
+                    break
+                if message[0] == "wait":
+                    time.sleep(message[1])
+                    continue
+
+                _, key, exp_name, problem, (algo_type, seed, run_id, params) = message
+                if problem is not None:
+                    instances[exp_name] = problem
+
+                stop = threading.Event()
+
+                def heartbeat():
+                    try:
+                        while not stop.wait(heartbeat_interval):
+                            send(("heartbeat", key))
+                    except (EOFError, OSError):
+                        pass  # La conexión cayó: lo detecta el hilo principal
+
+                beat = threading.Thread(target=heartbeat, daemon=True)
+                beat.start()
+                try:
+                    result = execute_algorithm_task((algo_type, instances[exp_name], seed, run_id, params))
+                finally:
+                    stop.set()
+                    beat.join()
+                pending = (key, result)
+                send(("result", key, result))
+                pending = None
+                n_done += 1
+        except (EOFError, OSError):
+            if verbose:
+                print(f"[Worker {name}] Conexión perdida; reconectando...")
+            continue
+        finally:
+            conn.close()
+        break
+
+    if verbose:
+        print(f"[Worker {name}] {n_done} tareas completadas")
+    return n_done
+
+
+def _start_workers(n, host, port, authkey, heartbeat_interval, retry_seconds=30.0, verbose=True):
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=run_worker, args=(host, port, authkey, heartbeat_interval, retry_seconds, verbose))
+               for _ in range(n)]
+    for w in workers:
+        w.start()
+    return workers
+
+
+def _select_experiments(names):
+    if not names:
+        return EXPERIMENTS
+    by_name = {exp["name"]: exp for exp in EXPERIMENTS}
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        raise SystemExit(f"Experimentos desconocidos: {unknown}. Opciones: {list(by_name)}")
+    return [by_name[n] for n in names]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark distribuido (coordinador / workers)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for cmd in ("coordinator", "worker", "local"):
+        p = sub.add_parser(cmd)
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=6000 if cmd != "local" else 0)
+        p.add_argument("--authkey", default=os.environ.get("MTFP_AUTHKEY"),
+                       help="Clave compartida (por defecto $MTFP_AUTHKEY); obligatoria fuera de loopback")
+        p.add_argument("--heartbeat", type=float, default=10.0, help="Intervalo de heartbeat (s)")
+        if cmd in ("coordinator", "local"):
+            p.add_argument("--experiments", nargs="+", default=None)
+            p.add_argument("--runs", type=int, default=None, help="Sobrescribe n_runs de los experimentos")
+            p.add_argument("--budget", type=int, default=None, help="Sobrescribe budget_nfe de los experimentos")
+            p.add_argument("--lease-timeout", type=float, default=60.0)
+            p.add_argument("--results-path", default=None, help="Registro de resultados para reanudar")
+            p.add_argument("--results-dir", default="results")
+        if cmd == "worker":
+            p.add_argument("--processes", type=int, default=1)
+            p.add_argument("--retry", type=float, default=30.0,
+                           help="Segundos reintentando la conexión (al inicio o si el coordinador se reinicia)")
+        if cmd == "local":
+            p.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    if args.authkey:
+        authkey = args.authkey.encode()
+    elif args.command == "worker":
+        raise SystemExit("El worker necesita la clave del coordinador: --authkey o $MTFP_AUTHKEY")
+    elif args.command == "coordinator" and not is_loopback(args.host):
+        raise SystemExit(f"Escuchar en {args.host} sin --authkey expondría el coordinador a cualquiera "
+                         f"que alcance el puerto: define --authkey o $MTFP_AUTHKEY")
+    else:
+        authkey = os.urandom(16).hex().encode()
+        if args.command == "coordinator":
+            print(f"[Coordinator] Clave generada (para los workers): --authkey {authkey.decode()}")
+
+    if args.command == "worker":
+        if args.processes == 1:
+            run_worker(args.host, args.port, authkey, args.heartbeat, args.retry)
+        else:
+            for w in _start_workers(args.processes, args.host, args.port, authkey, args.heartbeat, args.retry):
+                w.join()
+    else:
+        coordinator = Coordinator(_select_experiments(args.experiments), args.runs, args.budget,
+                                  host=args.host, port=args.port, authkey=authkey,
+                                  lease_timeout=args.lease_timeout, results_path=args.results_path)
+        workers = []
+        if args.command == "local":
+            host, port = coordinator.address
+            workers = _start_workers(args.workers, host, port, authkey, args.heartbeat)
+        coordinator.run(results_dir=args.results_dir)
+        for w in workers:
+            w.join()
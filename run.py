@@ -5,19 +5,20 @@ from Algorithm.MTFP_BaseSolver import MTFP_BaseSolver
 from Algorithm.TabuSearch import TabuSearch
 from Algorithm.VNS import VNS
 from Algorithm.HillClimbing import HillClimbing
-from Algorithm.GA import run_mtfp_ga
 from Algorithm.RandomSearch import RandomSearch
 from Algorithm.Greedy import Greedy
+from Algorithm.GRASP import GRASP
+from Algorithm.Workers import WarmPool
+from Algorithm.Memory import MemoryTracker, payload_mb, estimate_task_memory_mb, available_memory_mb
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from tqdm import tqdm
 #from tqdm.contrib.concurrent import process_map
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import as_completed
 
 #from joblib import Parallel, delayed
 import multiprocessing
+import contextlib
+import os
 
 
 def generate_reproducible_seeds(master_seed, n_runs):
@@ -39,6 +40,8 @@ def results_to_dataframe(results_list):
     """
     Convierte una lista de objetos SolutionResult en un DataFrame para análisis.
     """
+    import pandas as pd
+
     data = []
     for res in results_list:
         # Asegurar que F sea un escalar para el DataFrame
@@ -50,6 +53,8 @@ def results_to_dataframe(results_list):
             "Seed": res.extra.get("Seed"),
             "Efficiency": f_scalar,
             "Time": res.execution_time,
+            "Peak_RSS_MB": res.extra.get("peak_rss_mb"),
+            "Payload_MB": res.extra.get("payload_mb"),
             "Feasible": res.feasible
         })
     return pd.DataFrame(data)
@@ -64,62 +69,105 @@ def execute_algorithm_task(task_data):
     algo_type, problem, seed, run_id, params = task_data
     
     result = None
+    solver = None
+
+    # Checkpoints opcionales: si la tarea muere, al relanzarla se reanuda desde el snapshot
+    ckpt = {}
+    if params.get('checkpoint_dir'):
+        os.makedirs(params['checkpoint_dir'], exist_ok=True)
+        ckpt = {
+            'checkpoint_path': os.path.join(params['checkpoint_dir'], f"{algo_type}_run{run_id}_seed{seed}.ckpt"),
+            'checkpoint_interval': params.get('checkpoint_interval', 300.0)
+        }
     
+    # Memoria: pico de RSS siempre (barato); tracemalloc solo con 'trace_memory'
+    memory = MemoryTracker(trace=params.get('trace_memory', False)) if params.get('track_memory', True) else None
+
     try:
-        if algo_type == "GA":
-            # Ejecutar GA
-            result = run_mtfp_ga(
-                problem, 
-                pop_size=params['pop_size'], 
-                n_gen=params['n_gen'], 
-                seed=seed, 
-                verbose=False
-            )
+        with memory or contextlib.nullcontext():
+            if algo_type == "GA":
+                # Ejecutar GA (pymoo se importa solo en los workers que corren el GA)
+                from Algorithm.GA import run_mtfp_ga
+                result = run_mtfp_ga(
+                    problem, 
+                    pop_size=params['pop_size'], 
+                    n_gen=params['n_gen'], 
+                    seed=seed, 
+                    verbose=False,
+                    crossover_prob=params.get('crossover_prob', 0.9),
+                    mutation_prob=params.get('mutation_prob', 0.2),
+                    memetic_rate=params.get('memetic_rate', 0.0),
+                    memetic_steps=params.get('memetic_steps', 20),
+                    lamarckian=params.get('lamarckian', True),
+                    **ckpt
+                )
             
-        elif algo_type == "Tabu":
-            solver = TabuSearch(problem, seed=seed)
-            result = solver.solve(
-                max_iterations=params['iter'], 
-                n_candidates=params['candidates'], 
-                verbose=False
-            )
+            elif algo_type == "Tabu":
+                solver = TabuSearch(problem, seed=seed)
+                result = solver.solve(
+                    max_iterations=params['iter'], 
+                    n_candidates=params['candidates'], 
+                    tabu_size=params.get('tabu_size'),
+                    verbose=False,
+                    **ckpt
+                )
             
-        elif algo_type == "LS":
-            solver = LS(problem, seed=seed)
-            result = solver.solve(
-                max_iterations=params['iter'], 
-                verbose=False
-            )
+            elif algo_type == "LS":
+                solver = LS(problem, seed=seed)
+                result = solver.solve(
+                    max_iterations=params['iter'], 
+                    verbose=False,
+                    **ckpt
+                )
             
-        elif algo_type == "VNS":
-                    solver = VNS(problem, seed=seed)
-                    result = solver.solve(
-                        max_iterations=params['iter'],      
-                        ls_max_iterations=params['ls_iter'],
-                        verbose=False
-                    )
+            elif algo_type == "VNS":
+                        solver = VNS(problem, seed=seed)
+                        result = solver.solve(
+                            max_iterations=params['iter'],      
+                            ls_max_iterations=params['ls_iter'],
+                            verbose=False,
+                            **ckpt
+                        )
             
 
-        elif algo_type == "Random":
-            solver = RandomSearch(problem, seed=seed)
-            result = solver.solve(
-                budget_nfe=params['budget_nfe'], 
-                verbose=False
-            )
+            elif algo_type == "Random":
+                solver = RandomSearch(problem, seed=seed)
+                result = solver.solve(
+                    budget_nfe=params['budget_nfe'], 
+                    verbose=False,
+                    **ckpt
+                )
 
-        elif algo_type == "HillClimbing":
-            solver = HillClimbing(problem, seed=seed)
-            result = solver.solve(
-                max_iterations=params['iter'], 
-                sample_size=params['sample_size'], 
-                verbose=False
-            )
+            elif algo_type == "GRASP":
+                solver = GRASP(problem, seed=seed)
+                result = solver.solve(
+                    n_constructions=params['constructions'],
+                    alpha=params.get('alpha', 0.3),
+                    ls_max_iterations=params.get('ls_iter', 0),
+                    verbose=False
+                )
+
+            elif algo_type == "HillClimbing":
+                solver = HillClimbing(problem, seed=seed)
+                result = solver.solve(
+                    max_iterations=params['iter'], 
+                    sample_size=params['sample_size'], 
+                    verbose=False,
+                    **ckpt
+                )
             
         # Inyectar metadatos para trazabilidad
         if result:
             result.extra.update({"Run": run_id, "Seed": seed})
+            if solver is not None:
+                result.extra.setdefault("nfe", solver.total_nfe())
+            if memory is not None:
+                result.extra.update(memory.report())
             
-        return result.to_serializable_dict()
+        payload = result.to_serializable_dict()
+        if memory is not None:
+            payload["extra"]["payload_mb"] = payload_mb(payload)
+        return payload
 
     except Exception as e:
         #print(f"Error en Run {run_id} ({algo_type}): {e}")
@@ -130,8 +178,12 @@ def execute_algorithm_task(task_data):
     
 
 
-def run_parallel_benchmark(problem, n_runs=30, budget_nfe=50000, master_seed=42):
-    
+def build_benchmark_tasks(problem, n_runs=30, budget_nfe=50000, master_seed=42,
+                          checkpoint_dir=None, checkpoint_interval=300.0):
+    """
+    Lista de tareas (Tipo, Problema, Semilla, ID, Parámetros) del benchmark:
+    cada algoritmo con el mismo presupuesto NFE y las mismas semillas por run.
+    """
     # 1. Preparar Semillas
     run_seeds = generate_reproducible_seeds(master_seed, n_runs)
     
@@ -163,6 +215,11 @@ def run_parallel_benchmark(problem, n_runs=30, budget_nfe=50000, master_seed=42)
     params_hc = {'sample_size': hc_sample_size, 'iter': budget_nfe // hc_sample_size}
     
     
+    # Checkpoints (opcional): se agregan a los parámetros de todas las tareas
+    if checkpoint_dir:
+        for params in (params_ga, params_tabu, params_ls, params_vns, params_random, params_hc):
+            params.update({'checkpoint_dir': checkpoint_dir, 'checkpoint_interval': checkpoint_interval})
+
     # 3. Crear la Lista de Tareas (Queue de trabajo)
     tasks = []
     
@@ -179,19 +236,42 @@ def run_parallel_benchmark(problem, n_runs=30, budget_nfe=50000, master_seed=42)
         tasks.append(("Random", problem, seed, run_id, params_random))
         tasks.append(("HillClimbing", problem, seed, run_id, params_hc)) 
         
-    total_tasks = len(tasks)
-    n_cores = multiprocessing.cpu_count()
-    print(f"🚀 Lanzando {total_tasks} tareas en {n_cores} núcleos de CPU...")
-    
-    # Usar ProcessPoolExecutor para progreso uniforme por tarea completada
+    return tasks
+
+
+def execute_pooled_task(problem, algo_type, seed, run_id, params):
+    """execute_algorithm_task para WarmPool: la instancia llega desde la caché del worker."""
+    return execute_algorithm_task((algo_type, problem, seed, run_id, params))
+
+
+def submit_benchmark(pool, problem, n_runs=30, budget_nfe=50000, master_seed=42,
+                     checkpoint_dir=None, checkpoint_interval=300.0, heavy_memory_mb=512.0):
+    """
+    Encola las tareas del benchmark en un WarmPool y retorna sus futures sin esperar.
+    Las tareas cuya memoria estimada supera 'heavy_memory_mb' pasan por el presupuesto
+    de memoria del pool (WarmPool.submit_budgeted) para no correr demasiadas a la vez.
+    """
+    tasks = build_benchmark_tasks(problem, n_runs, budget_nfe, master_seed,
+                                  checkpoint_dir, checkpoint_interval)
+    futures = []
+    for algo_type, _, seed, run_id, params in tasks:
+        cost = estimate_task_memory_mb(algo_type, problem, params)
+        if cost > heavy_memory_mb:
+            futures.append(pool.submit_budgeted(cost, execute_pooled_task, problem, algo_type, seed, run_id, params))
+        else:
+            futures.append(pool.submit(execute_pooled_task, problem, algo_type, seed, run_id, params))
+    return futures
+
+
+def collect_benchmark(futures):
+    """Espera los futures de submit_benchmark y reconstruye los SolutionResult."""
+    from tqdm import tqdm
+
     raw_dicts = []
-    with ProcessPoolExecutor(max_workers=n_cores) as executor:
-        futures = {executor.submit(execute_algorithm_task, task): task for task in tasks}
-        with tqdm(total=total_tasks, desc="Procesando tareas") as pbar:
-            for future in as_completed(futures):
-                result = future.result()
-                raw_dicts.append(result)
-                pbar.update(1)
+    with tqdm(total=len(futures), desc="Procesando tareas") as pbar:
+        for future in as_completed(futures):
+            raw_dicts.append(future.result())
+            pbar.update(1)
     
     print("🔄 Reconstruyendo objetos SolutionResult...")
     all_results = []
@@ -206,11 +286,30 @@ def run_parallel_benchmark(problem, n_runs=30, budget_nfe=50000, master_seed=42)
     return all_results
 
 
+def run_parallel_benchmark(problem, n_runs=30, budget_nfe=50000, master_seed=42,
+                           checkpoint_dir=None, checkpoint_interval=300.0, n_workers=None, pool=None):
+    """
+    Benchmark completo de una instancia. Con 'pool' (WarmPool) reutiliza sus workers
+    y no lo cierra; si no, crea uno propio para esta llamada.
+    """
+    if pool is None:
+        with WarmPool(max_workers=n_workers) as own_pool:
+            return run_parallel_benchmark(problem, n_runs, budget_nfe, master_seed,
+                                          checkpoint_dir, checkpoint_interval, pool=own_pool)
+
+    futures = submit_benchmark(pool, problem, n_runs, budget_nfe, master_seed,
+                               checkpoint_dir, checkpoint_interval)
+    print(f"🚀 Lanzando {len(futures)} tareas en {pool.max_workers} núcleos de CPU...")
+    return collect_benchmark(futures)
+
+
 def plot_convergence_curves(results_list, title="Convergencia Promedio", filename=None):
     """
     Grafica la evolución promedio de la eficiencia con intervalo de confianza (std).
     Maneja automáticamente algoritmos deterministas (líneas planas) y estocásticos (curvas).
     """
+    import matplotlib.pyplot as plt
+
     # 1. Obtener nombres únicos de algoritmos y ordenarlos
     algos = sorted(list(set(r.method for r in results_list)))
     
@@ -299,100 +398,129 @@ def plot_convergence_curves(results_list, title="Convergencia Promedio", filenam
         plt.savefig(filename, dpi=300, bbox_inches='tight')
     #plt.show()
 
+
+# --- DEFINICIÓN DE EXPERIMENTOS ---
+EXPERIMENTS = [
+    {
+        "name": "BASE_CASE",
+        "desc": "Instancia pequeña para validación preliminar",
+        "params": {
+            "n_people": 20,
+            "n_projects": 3,
+            "n_skills": 2,
+            "positive_ratio": 0.3
+        },
+        "budget_nfe": 20000,      # Presupuesto menor para el caso fácil
+        "n_runs": 30
+    },
+    {
+        "name": "PAPER_MAX",
+        "desc": "Replicación del caso más grande de Gutiérrez et al. (2016)",
+        "params": {
+            "n_people": 100,
+            "n_projects": 10,
+            "n_skills": 10,
+            "positive_ratio": 0.3
+        },
+        "budget_nfe": 50000,
+        "n_runs": 30
+    },
+    {
+        "name": "STRESS_TEST",
+        "desc": "Prueba de escalabilidad (Doble tamaño)",
+        "params": {
+            "n_people": 200,
+            "n_projects": 20,
+            "n_skills": 20,
+            "positive_ratio": 0.3
+        },
+        "budget_nfe": 100000,     # Presupuesto alto
+        "n_runs": 30              # Menos runs si tarda mucho
+    }
+]
+
+
+def finalize_experiment(exp, problem, results, results_dir="results"):
+    """
+    Cierra un experimento: agrega el baseline Greedy y guarda tablas (raw y
+    summary) y el gráfico de convergencia en 'results_dir'. Retorna el summary.
+    """
+    # 3. Greedy Baseline
+    print("Ejecutando Greedy Baseline...")
+    greedy_solver = Greedy(problem)
+    greedy_result = greedy_solver.solve()
+    greedy_result.extra.update({"Run": 0, "Seed": 0})
+    results.append(greedy_result)
+
+    # 4. Guardar Datos (Tablas)
+    df = results_to_dataframe(results)
+    summary = df.groupby("Algorithm").agg(
+        Mean_Eff=('Efficiency', 'mean'),
+        Std_Eff=('Efficiency', 'std'),
+        Best_Eff=('Efficiency', 'max'),
+        Avg_Time=('Time', 'mean'),
+        Max_Peak_RSS_MB=('Peak_RSS_MB', 'max'),
+        Avg_Payload_MB=('Payload_MB', 'mean'),
+        Feasible_Rate=('Feasible', 'mean')
+    ).sort_values(by="Mean_Eff", ascending=False)
+
+    base_name = f"{results_dir}/MTFP_{exp['name']}_P{exp['params']['n_people']}_Pr{exp['params']['n_projects']}_Sk{exp['params']['n_skills']}_Pos{exp['params']['positive_ratio']}"
+    df.to_csv(f"{base_name}_raw.csv", index=False)
+    summary.to_csv(f"{base_name}_summary.csv")
+
+    print(f"\n📊 Resultados {exp['name']}:")
+    print(summary)
+
+    # 5. Generar y Guardar Gráfico
+    plot_convergence_curves(
+        results, 
+        title=f"Convergencia: {exp['name']} (N={exp['params']['n_people']})", filename=f"{base_name}_plot.png"
+    )
+    return summary
+
+
 if __name__ == "__main__":
     
     # --- 1. DEFINICIÓN DE EXPERIMENTOS ---
-    experiments = [
-        {
-            "name": "BASE_CASE",
-            "desc": "Instancia pequeña para validación preliminar",
-            "params": {
-                "n_people": 20,
-                "n_projects": 3,
-                "n_skills": 2,
-                "positive_ratio": 0.3
-            },
-            "budget_nfe": 20000,      # Presupuesto menor para el caso fácil
-            "n_runs": 30
-        },
-        {
-            "name": "PAPER_MAX",
-            "desc": "Replicación del caso más grande de Gutiérrez et al. (2016)",
-            "params": {
-                "n_people": 100,
-                "n_projects": 10,
-                "n_skills": 10,
-                "positive_ratio": 0.3
-            },
-            "budget_nfe": 50000,
-            "n_runs": 30
-        },
-        {
-            "name": "STRESS_TEST",
-            "desc": "Prueba de escalabilidad (Doble tamaño)",
-            "params": {
-                "n_people": 200,
-                "n_projects": 20,
-                "n_skills": 20,
-                "positive_ratio": 0.3
-            },
-            "budget_nfe": 100000,     # Presupuesto alto
-            "n_runs": 30              # Menos runs si tarda mucho
-        }
-    ]
+    experiments = EXPERIMENTS
 
     #experiments1 = experiments[0:1]
     #experiments2 = experiments[1:2]
     #experiments3 = experiments[2:3]
 
+    # Un solo pool para todos los experimentos: las tareas de todos se encolan de
+    # una vez, así el siguiente experimento avanza mientras terminan los rezagados
+    # Las tareas pesadas en memoria (GA con historial) comparten el 80% de la RAM libre
+    memory_budget = available_memory_mb()
+    pool = WarmPool(max_workers=multiprocessing.cpu_count(),
+                    memory_budget_mb=0.8 * memory_budget if memory_budget else None)
+    pending = []
     for exp in experiments:
-        print("\n" + "="*80)
-        print(f"🧪 EJECUTANDO: {exp['name']}")
-        print(f"📝 {exp['desc']}")
-        print("="*80)
-        
         # 1. Crear Problema
         problem, _, _, _, _, _ = create_mtfp_problem(
             **exp['params'],
             seed=12345 
         )
-        
-        # 2. Benchmark Paralelo
-        results = run_parallel_benchmark(
+        futures = submit_benchmark(
+            pool,
             problem, 
             n_runs=exp['n_runs'], 
             budget_nfe=exp['budget_nfe'], 
             master_seed=42
         )
+        pending.append((exp, problem, futures))
+
+    for exp, problem, futures in pending:
+        print("\n" + "="*80)
+        print(f"🧪 EJECUTANDO: {exp['name']}")
+        print(f"📝 {exp['desc']}")
+        print("="*80)
         
-        # 3. Greedy Baseline
-        print("Ejecutando Greedy Baseline...")
-        greedy_solver = Greedy(problem)
-        greedy_result = greedy_solver.solve()
-        greedy_result.extra.update({"Run": 0, "Seed": 0})
-        results.append(greedy_result)
-        
-        # 4. Guardar Datos (Tablas)
-        df = results_to_dataframe(results)
-        summary = df.groupby("Algorithm").agg(
-            Mean_Eff=('Efficiency', 'mean'),
-            Std_Eff=('Efficiency', 'std'),
-            Best_Eff=('Efficiency', 'max'),
-            Avg_Time=('Time', 'mean'),
-            Feasible_Rate=('Feasible', 'mean')
-        ).sort_values(by="Mean_Eff", ascending=False)
-        
-        base_name = f"results/MTFP_{exp['name']}_P{exp['params']['n_people']}_Pr{exp['params']['n_projects']}_Sk{exp['params']['n_skills']}_Pos{exp['params']['positive_ratio']}"
-        df.to_csv(f"{base_name}_raw.csv", index=False)
-        summary.to_csv(f"{base_name}_summary.csv")
-        
-        print(f"\n📊 Resultados {exp['name']}:")
-        print(summary)
+        # 2. Benchmark Paralelo (resultados de las tareas ya encoladas)
+        results = collect_benchmark(futures)
+        pool.release(problem)
         
-        # 5. Generar y Guardar Gráfico
-        plot_convergence_curves(
-            results, 
-            title=f"Convergencia: {exp['name']} (N={exp['params']['n_people']})", filename=f"{base_name}_plot.png"
-        )
+        finalize_experiment(exp, problem, results)
 
+    pool.shutdown()
     print("\n✅ TODO FINALIZADO EXITOSAMENTE.")
\ No newline at end of file
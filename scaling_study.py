@@ -0,0 +1,300 @@
+"""
+Estudio de escalabilidad fuerte y débil del benchmark paralelo (run_parallel_benchmark).
+
+Uso:
+    python scaling_study.py                                  # fuerte + débil + barrido de instancias
+    python scaling_study.py --mode strong --workers 1 2 4 8 --budget 5000
+    python scaling_study.py --mode instances --algorithms LS Tabu
+
+- Fuerte: misma lista de tareas, variando el número de workers (speedup = T1 / Tp).
+- Débil: tareas proporcionales al número de workers (eficiencia = T1 / Tp).
+- Instancias: barrido de H, P, K y densidad de afinidad con todos los workers.
+
+Por tarea se mide el tamaño y tiempo de pickle/unpickle (ida y vuelta), la latencia
+desde el submit hasta que el worker la toma y el tiempo de cómputo; por punto, el
+throughput (evaluaciones/s, tareas/h), la eficiencia paralela y la cola de rezagados.
+Tablas CSV y gráficos PNG en results/scaling/.
+
+Los hilos de BLAS se fijan en 1 por defecto (antes de importar numpy) para que los
+workers no compitan entre sí; exportar OMP_NUM_THREADS/OPENBLAS_NUM_THREADS/MKL_NUM_THREADS
+para medir otro valor.
+"""
+import os
+
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import time
+import pickle
+import argparse
+import multiprocessing
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from Algorithm.MTFP import create_mtfp_problem
+from Algorithm.Workers import solver_executor
+from run import build_benchmark_tasks, execute_algorithm_task
+
+
+INSTANCE_GRID = [
+    {"n_people": 20, "n_projects": 3, "n_skills": 2, "positive_ratio": 0.3},
+    {"n_people": 100, "n_projects": 10, "n_skills": 10, "positive_ratio": 0.3},
+    {"n_people": 100, "n_projects": 10, "n_skills": 10, "positive_ratio": 0.1},
+    {"n_people": 100, "n_projects": 10, "n_skills": 10, "positive_ratio": 0.6},
+    {"n_people": 200, "n_projects": 20, "n_skills": 20, "positive_ratio": 0.3},
+    {"n_people": 400, "n_projects": 20, "n_skills": 20, "positive_ratio": 0.3},
+]
+
+
+def _timed_task(payload, submitted_at):
+    """
+    Trabajador: deserializa la tarea, la ejecuta con execute_algorithm_task y
+    serializa el resultado, midiendo cada etapa.
+    """
+    started_at = time.time()
+    start = time.perf_counter()
+    task = pickle.loads(payload)
+    unpickle_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = execute_algorithm_task(task)
+    compute_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result_payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    result_pickle_time = time.perf_counter() - start
+
+    return result_payload, {
+        "algorithm": task[0],
+        "queue_latency": started_at - submitted_at,
+        "unpickle_time": unpickle_time,
+        "compute_time": compute_time,
+        "result_pickle_time": result_pickle_time,
+        "result_bytes": len(result_payload),
+        "pid": os.getpid()
+    }
+
+
+def run_scaling_point(tasks, n_workers):
+    """
+    Ejecuta 'tasks' en un pool de 'n_workers' y retorna (métricas del punto, filas por tarea).
+    El arranque del pool se mide aparte y no entra en el tiempo de pared.
+    """
+    pickled = []
+    pickle_times = []
+    for task in tasks:
+        start = time.perf_counter()
+        pickled.append(pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL))
+        pickle_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    executor = solver_executor(max_workers=n_workers)
+    # Forzar el arranque de los workers antes de medir
+    for f in [executor.submit(time.sleep, 0) for _ in range(n_workers)]:
+        f.result()
+    pool_startup = time.perf_counter() - start
+
+    rows = []
+    nfe_total = 0
+    submit_time = 0.0
+    wall_start = time.perf_counter()
+    try:
+        futures = {}
+        for i, payload in enumerate(pickled):
+            start = time.perf_counter()
+            futures[executor.submit(_timed_task, payload, time.time())] = i
+            submit_time += time.perf_counter() - start
+
+        for future in as_completed(futures):
+            result_payload, row = future.result()
+            start = time.perf_counter()
+            result = pickle.loads(result_payload)
+            row["result_unpickle_time"] = time.perf_counter() - start
+            row["finished_at"] = time.perf_counter() - wall_start
+            row["task_bytes"] = len(pickled[futures[future]])
+            row["task_pickle_time"] = pickle_times[futures[future]]
+            row["nfe"] = (result or {}).get("extra", {}).get("nfe", 0)
+            nfe_total += row["nfe"]
+            rows.append(row)
+    finally:
+        executor.shutdown()
+    wall = time.perf_counter() - wall_start
+
+    compute = np.array([r["compute_time"] for r in rows])
+    finished = np.sort([r["finished_at"] for r in rows])
+    # Cola de rezagados: tiempo desde que queda menos trabajo que workers hasta el final
+    tail_start = finished[-n_workers - 1] if len(finished) > n_workers else 0.0
+    overhead = sum(r["task_pickle_time"] + r["unpickle_time"] + r["result_pickle_time"] + r["result_unpickle_time"]
+                   for r in rows)
+
+    metrics = {
+        "workers": n_workers,
+        "tasks": len(tasks),
+        "wall_time": wall,
+        "pool_startup": pool_startup,
+        "compute_time_sum": float(compute.sum()),
+        "nfe": int(nfe_total),
+        "evals_per_s": nfe_total / wall if wall > 0 else np.nan,
+        "tasks_per_h": len(tasks) / wall * 3600 if wall > 0 else np.nan,
+        "utilization": float(compute.sum()) / (wall * n_workers) if wall > 0 else np.nan,
+        "submit_time": submit_time,
+        "serialization_time": overhead,
+        "task_bytes_mean": float(np.mean([r["task_bytes"] for r in rows])),
+        "result_bytes_mean": float(np.mean([r["result_bytes"] for r in rows])),
+        "queue_latency_p50": float(np.median([r["queue_latency"] for r in rows])),
+        "straggler_ratio": float(compute.max() / np.median(compute)) if len(compute) else np.nan,
+        "tail_time": wall - tail_start
+    }
+    return metrics, rows
+
+
+def _problem_tasks(instance, n_runs, budget_nfe, algorithms, seed=12345):
+    problem = create_mtfp_problem(**instance, seed=seed)[0]
+    tasks = build_benchmark_tasks(problem, n_runs=n_runs, budget_nfe=budget_nfe)
+    return [t for t in tasks if not algorithms or t[0] in algorithms]
+
+
+def strong_scaling(instance, workers, n_runs, budget_nfe, algorithms, verbose=True):
+    """Misma carga total para cada número de workers."""
+    tasks = _problem_tasks(instance, n_runs, budget_nfe, algorithms)
+    records = []
+    for p in workers:
+        metrics, _ = run_scaling_point(tasks, p)
+        records.append(metrics)
+        if verbose:
+            print(f"[strong] workers={p:3d}  wall={metrics['wall_time']:8.2f}s  "
+                  f"evals/s={metrics['evals_per_s']:10.0f}  utilización={metrics['utilization']:.2f}")
+    df = pd.DataFrame(records)
+    base = df.loc[df["workers"] == df["workers"].min(), "wall_time"].iloc[0] * df["workers"].min()
+    df["speedup"] = base / df["wall_time"]
+    df["parallel_efficiency"] = df["speedup"] / df["workers"]
+    return df
+
+
+def weak_scaling(instance, workers, runs_per_worker, budget_nfe, algorithms, verbose=True):
+    """Carga proporcional al número de workers (runs_per_worker runs por worker)."""
+    records = []
+    for p in workers:
+        tasks = _problem_tasks(instance, runs_per_worker * p, budget_nfe, algorithms)
+        metrics, _ = run_scaling_point(tasks, p)
+        records.append(metrics)
+        if verbose:
+            print(f"[weak]   workers={p:3d}  tareas={len(tasks):4d}  wall={metrics['wall_time']:8.2f}s  "
+                  f"evals/s={metrics['evals_per_s']:10.0f}")
+    df = pd.DataFrame(records)
+    base = df.loc[df["workers"] == df["workers"].min(), "wall_time"].iloc[0]
+    df["parallel_efficiency"] = base / df["wall_time"]
+    return df
+
+
+def instance_sweep(instances, n_workers, n_runs, budget_nfe, algorithms, verbose=True):
+    """Throughput y overhead del pool a lo largo de H, P, K y densidad de afinidad."""
+    records = []
+    for instance in instances:
+        metrics, rows = run_scaling_point(_problem_tasks(instance, n_runs, budget_nfe, algorithms), n_workers)
+        metrics.update(instance)
+        # Overhead relativo: serialización frente a cómputo
+        metrics["serialization_share"] = metrics["serialization_time"] / max(metrics["compute_time_sum"], 1e-12)
+        records.append(metrics)
+        if verbose:
+            print(f"[instances] H={instance['n_people']:4d} P={instance['n_projects']:3d} "
+                  f"K={instance['n_skills']:3d} dens={instance['positive_ratio']:.1f}  "
+                  f"evals/s={metrics['evals_per_s']:10.0f}  tarea={metrics['task_bytes_mean'] / 1024:8.1f} KiB")
+    return pd.DataFrame(records)
+
+
+def plot_scaling(strong=None, weak=None, filename=None):
+    """Speedup y eficiencia paralela frente al número de workers."""
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    if strong is not None and len(strong):
+        axes[0].plot(strong["workers"], strong["speedup"], marker="o", label="Fuerte")
+        axes[0].plot(strong["workers"], strong["workers"], linestyle="--", color="gray", label="Ideal")
+        axes[1].plot(strong["workers"], strong["parallel_efficiency"], marker="o", label="Fuerte")
+    if weak is not None and len(weak):
+        axes[1].plot(weak["workers"], weak["parallel_efficiency"], marker="s", label="Débil")
+    axes[0].set_xlabel("Workers")
+    axes[0].set_ylabel("Speedup")
+    axes[1].set_xlabel("Workers")
+    axes[1].set_ylabel("Eficiencia paralela")
+    axes[1].set_ylim(0, 1.1)
+    for ax in axes:
+        ax.legend(frameon=False)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    plt.tight_layout()
+    if filename:
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+
+def plot_instance_sweep(df, filename=None):
+    """Throughput (evaluaciones/s) y fracción de serialización por tamaño de instancia."""
+    labels = [f"{r.n_people}x{r.n_projects}x{r.n_skills}\n{r.positive_ratio:.1f}" for r in df.itertuples()]
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    axes[0].bar(labels, df["evals_per_s"])
+    axes[0].set_ylabel("Evaluaciones / s")
+    axes[1].bar(labels, df["serialization_share"] * 100)
+    axes[1].set_ylabel("Serialización (% del cómputo)")
+    for ax in axes:
+        ax.tick_params(axis="x", labelsize=8)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+    plt.tight_layout()
+    if filename:
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+    plt.close(fig)
+
+
+def default_workers():
+    n = multiprocessing.cpu_count()
+    workers = [1]
+    while workers[-1] * 2 <= n:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != n:
+        workers.append(n)
+    return workers
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estudio de escalabilidad del benchmark paralelo")
+    parser.add_argument("--mode", choices=["strong", "weak", "instances", "all"], default="all")
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--budget", type=int, default=5000, help="Presupuesto NFE por tarea")
+    parser.add_argument("--runs", type=int, default=4, help="Runs (fuerte/instancias) o runs por worker (débil)")
+    parser.add_argument("--algorithms", nargs="+", default=None,
+                        help="Subconjunto de algoritmos (GA, Tabu, LS, VNS, Random, HillClimbing)")
+    parser.add_argument("--n-people", type=int, default=100)
+    parser.add_argument("--n-projects", type=int, default=10)
+    parser.add_argument("--n-skills", type=int, default=10)
+    parser.add_argument("--positive-ratio", type=float, default=0.3)
+    parser.add_argument("--output-dir", default=os.path.join("results", "scaling"))
+    args = parser.parse_args()
+
+    workers = args.workers or default_workers()
+    instance = {"n_people": args.n_people, "n_projects": args.n_projects,
+                "n_skills": args.n_skills, "positive_ratio": args.positive_ratio}
+    os.makedirs(args.output_dir, exist_ok=True)
+    base_name = os.path.join(args.output_dir, f"scaling_{time.strftime('%Y%m%d_%H%M%S')}")
+    print(f"🧵 BLAS: OMP={os.environ['OMP_NUM_THREADS']} OPENBLAS={os.environ['OPENBLAS_NUM_THREADS']} "
+          f"MKL={os.environ['MKL_NUM_THREADS']}; workers={workers}")
+
+    strong = weak = None
+    if args.mode in ("strong", "all"):
+        strong = strong_scaling(instance, workers, args.runs, args.budget, args.algorithms)
+        strong.to_csv(f"{base_name}_strong.csv", index=False)
+    if args.mode in ("weak", "all"):
+        weak = weak_scaling(instance, workers, args.runs, args.budget, args.algorithms)
+        weak.to_csv(f"{base_name}_weak.csv", index=False)
+    if strong is not None or weak is not None:
+        plot_scaling(strong, weak, filename=f"{base_name}_plot.png")
+    if args.mode in ("instances", "all"):
+        sweep = instance_sweep(INSTANCE_GRID, max(workers), args.runs, args.budget, args.algorithms)
+        sweep.to_csv(f"{base_name}_instances.csv", index=False)
+        plot_instance_sweep(sweep, filename=f"{base_name}_instances.png")
+
+    print(f"💾 Resultados en {base_name}_*")
@@ -0,0 +1,593 @@
+"""
+Servicio local HTTP/JSON (asyncio) para resolver instancias MTFP desde otros sistemas.
+
+Uso:
+    python solver_service.py serve --port 8765 --workers 4
+    python solver_service.py loadtest --requests 200 --concurrency 20 --distinct 10
+    python solver_service.py loadtest --url http://127.0.0.1:8765 ...   # contra un servicio ya levantado
+
+API (cuerpos JSON):
+    POST /jobs                  {"instance": {...}, "algorithm": "LS", "params": {...},
+                                 "seed": 42, "deadline": 30, "wait": false}
+                                -> 202 {"job_id", "status", "cached"} (o el resultado con "wait": true)
+    GET  /jobs/<id>             estado y, si terminó, el resultado
+    GET  /jobs/<id>/events      progreso en streaming (NDJSON por chunks) hasta que termina
+    GET  /health                contadores del servicio
+
+"instance" = {"affinity_matrix": HxH, "requirements": KxP, "skill_of_person": H,
+              "project_weights": P (opcional), "dedication_levels": (opcional)}.
+
+Los trabajos se ejecutan en un pool de procesos (solver_executor). Las solicitudes
+idénticas (misma instancia, algoritmo, parámetros y semilla) se deduplican por hash:
+si el trabajo está en curso se retorna el mismo job_id y, si ya terminó, el
+resultado en caché. Cada trabajo tiene un plazo (MTFP_BaseSolver.deadline): al
+cumplirse la búsqueda termina con lo mejor hallado y, si aun así el worker no
+responde a tiempo, se entrega el mejor resultado parcial reportado por el progreso
+y el worker se mata: el pool se reemplaza por uno nuevo y los trabajos que corrían
+en el anterior se reintentan con el plazo que les queda.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import hashlib
+import signal
+import asyncio
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse
+
+import numpy as np
+
+from Algorithm.MTFP import MTFP, create_mtfp_problem
+from Algorithm.LS import LS
+from Algorithm.TabuSearch import TabuSearch
+from Algorithm.VNS import VNS
+from Algorithm.HillClimbing import HillClimbing
+from Algorithm.RandomSearch import RandomSearch
+from Algorithm.Greedy import Greedy
+from Algorithm.GRASP import GRASP
+from Algorithm.Workers import solver_executor, solver_context
+
+
+SERVICE_SOLVERS = {
+    "LS": LS,
+    "Tabu": TabuSearch,
+    "VNS": VNS,
+    "HillClimbing": HillClimbing,
+    "Random": RandomSearch,
+    "Greedy": Greedy,
+    "GRASP": GRASP,
+}
+
+HTTP_STATUS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+# ============================================================================
+# INSTANCIAS Y TRABAJOS
+# ============================================================================
+
+def to_json(obj):
+    """Convierte recursivamente tipos numpy a tipos nativos de JSON."""
+    if isinstance(obj, dict):
+        return {str(k): to_json(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_json(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return to_json(obj.tolist())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, float) and not np.isfinite(obj):
+        return None
+    return obj
+
+
+def instance_to_json(problem):
+    """Instancia MTFP -> diccionario JSON (formato de la API)."""
+    return {
+        "affinity_matrix": problem.S.tolist(),
+        "requirements": problem.R.tolist(),
+        "skill_of_person": problem.skill_of_person.tolist(),
+        "project_weights": problem.w.tolist(),
+        "dedication_levels": problem.levels.tolist(),
+    }
+
+
+def instance_from_json(data):
+    """Diccionario JSON -> instancia MTFP (valida dimensiones a través del constructor)."""
+    S = np.asarray(data["affinity_matrix"], dtype=float)
+    R = np.asarray(data["requirements"], dtype=float)
+    skill_of_person = np.asarray(data["skill_of_person"], dtype=int)
+    weights = data.get("project_weights")
+    levels = data.get("dedication_levels")
+    return MTFP(
+        n_people=S.shape[0],
+        n_projects=R.shape[1],
+        n_skills=R.shape[0],
+        affinity_matrix=S,
+        requirements=R,
+        skill_of_person=skill_of_person,
+        project_weights=None if weights is None else np.asarray(weights, dtype=float),
+        dedication_levels=None if levels is None else np.asarray(levels, dtype=float)
+    )
+
+
+def request_key(instance, algorithm, params, seed):
+    """Hash de la solicitud: instancias, algoritmos, parámetros y semillas idénticos comparten resultado."""
+    canonical = json.dumps({"instance": instance, "algorithm": algorithm, "params": params, "seed": seed},
+                           sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _solve_job(job_id, instance, algorithm, params, seed, deadline_at, progress_queue):
+    """
+    Trabajador: resuelve la instancia con iter_solve y publica en 'progress_queue'
+    su PID (para poder matarlo si no respeta el plazo) y cada mejora. Al vencer
+    el plazo la búsqueda termina con lo mejor hallado.
+    """
+    progress_queue.put(("started", job_id, os.getpid()))
+    problem = instance_from_json(instance)
+    solver = SERVICE_SOLVERS[algorithm](problem, seed=seed)
+    solver.deadline = deadline_at  # Los bucles de búsqueda terminan solos al vencer el plazo
+    gen = solver.iter_solve(verbose=False, **params)
+    try:
+        event = next(gen)
+        while True:
+            progress_queue.put(("event", job_id, {"elapsed": event.elapsed, "nfe": event.nfe,
+                                                  "efficiency": event.efficiency, "iteration": event.iteration,
+                                                  "X": event.X.tolist()}))
+            event = gen.send(time.time() >= deadline_at)
+    except StopIteration as stop:
+        result = stop.value
+
+    return to_json({
+        "method": result.method,
+        "efficiency": float(np.asarray(result.F).item()),
+        "feasible": bool(result.feasible),
+        "X": result.X,
+        "allocation": problem.get_allocation_matrix(result.X),
+        "execution_time": result.execution_time,
+        "nfe": solver.total_nfe(),
+        "stopped_by_deadline": time.time() >= deadline_at,
+    })
+
+
+class Job:
+    def __init__(self, key, algorithm, deadline):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.algorithm = algorithm
+        self.deadline = deadline
+        self.status = "queued"
+        self.created = time.time()
+        self.finished = None
+        self.events = []
+        self.result = None
+        self.error = None
+        self.pid = None  # Worker que lo está resolviendo
+        self.executor = None  # Pool en el que corre
+        self.changed = asyncio.Event()  # Se activa y reinicia en cada cambio
+
+    def notify(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def done(self):
+        return self.status in ("done", "failed", "timeout")
+
+    def to_dict(self):
+        return to_json({
+            "job_id": self.id,
+            "status": self.status,
+            "algorithm": self.algorithm,
+            "deadline": self.deadline,
+            "elapsed": (self.finished or time.time()) - self.created,
+            "progress": self.events[-1] if self.events else None,
+            "result": self.result,
+            "error": self.error,
+        })
+
+
+# ============================================================================
+# SERVICIO
+# ============================================================================
+
+class SolverService:
+    """
+    Cola de trabajos sobre un pool de procesos, con deduplicación por hash y caché
+    LRU de resultados ('cache_size' trabajos terminados; los que están en curso
+    nunca se descartan).
+    """
+    def __init__(self, n_workers=None, cache_size=1000, default_deadline=60.0, deadline_grace=5.0):
+        self.n_workers = n_workers
+        self.executor = solver_executor(max_workers=n_workers)
+        self.manager = solver_context().Manager()
+        self.progress_queue = self.manager.Queue()
+        self.cache_size = cache_size
+        self.default_deadline = default_deadline
+        self.deadline_grace = deadline_grace
+        self.jobs = {}
+        self.by_key = OrderedDict()  # hash de la solicitud -> job_id (en curso o en caché)
+        self.stats = {"submitted": 0, "deduplicated": 0, "cache_hits": 0, "completed": 0,
+                      "failed": 0, "timeouts": 0, "killed_workers": 0, "retries": 0}
+        self.loop = None
+        self._reader = None
+
+    # --- Progreso: un hilo reenvía la cola del Manager al event loop ---
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._reader = threading.Thread(target=self._read_progress, daemon=True)
+        self._reader.start()
+
+    def _read_progress(self):
+        while True:
+            try:
+                item = self.progress_queue.get()
+            except (EOFError, OSError):
+                return  # Manager cerrado
+            if item is None:
+                return
+            self.loop.call_soon_threadsafe(self._on_progress, *item)
+
+    def _on_progress(self, kind, job_id, payload):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        if kind == "started":
+            job.pid = payload
+            if job.status == "timeout":
+                self._kill_worker(job)  # Venció antes de que el worker empezara
+            return
+        if job.done():
+            return
+        job.status = "running"
+        job.events.append(payload)
+        job.notify()
+
+    def close(self):
+        self.progress_queue.put(None)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.manager.shutdown()
+
+    # --- Trabajos ---
+    def submit(self, request):
+        """Registra (o reutiliza) un trabajo. Retorna (job, cached)."""
+        instance = request["instance"]
+        algorithm = request.get("algorithm", "LS")
+        params = request.get("params", {})
+        seed = int(request.get("seed", 42))
+        deadline = float(request.get("deadline", self.default_deadline))
+        if algorithm not in SERVICE_SOLVERS:
+            raise ValueError(f"Algoritmo no soportado '{algorithm}'. Opciones: {list(SERVICE_SOLVERS)}")
+
+        self.stats["submitted"] += 1
+        key = request_key(instance, algorithm, params, seed)
+        existing = self.jobs.get(self.by_key.get(key))
+        if existing is not None and existing.status not in ("failed", "timeout"):
+            self.by_key.move_to_end(key)
+            self.stats["cache_hits" if existing.done() else "deduplicated"] += 1
+            return existing, existing.done()
+
+        job = Job(key, algorithm, deadline)
+        self.jobs[job.id] = job
+        self.by_key[key] = job.id
+        self._evict()
+        asyncio.ensure_future(self._run(job, instance, algorithm, params, seed))
+        return job, False
+
+    def _evict(self):
+        """
+        Descarta los trabajos terminados más antiguos mientras haya más de
+        'cache_size': primero los reemplazados por un reintento (fallidos o
+        vencidos), luego en orden LRU. Los trabajos en curso no se tocan.
+        """
+        if len(self.jobs) <= self.cache_size:
+            return
+        cached = set(self.by_key.values())
+        order = [job_id for job_id in self.jobs if job_id not in cached] + list(self.by_key.values())
+        for job_id in order:
+            if len(self.jobs) <= self.cache_size:
+                break
+            job = self.jobs.get(job_id)
+            if job is None or not job.done():
+                continue
+            del self.jobs[job_id]
+            if self.by_key.get(job.key) == job_id:
+                del self.by_key[job.key]
+
+    def _kill_worker(self, job):
+        """
+        Mata el worker de un trabajo vencido y reemplaza el pool: un ProcessPoolExecutor
+        con un worker muerto queda inutilizable (BrokenProcessPool en sus trabajos,
+        que _run reintenta en el pool nuevo).
+        """
+        if self.executor is job.executor:
+            self.executor = solver_executor(max_workers=self.n_workers)
+            job.executor.shutdown(wait=False, cancel_futures=True)
+        try:
+            os.kill(job.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            self.stats["killed_workers"] += 1
+        except (ProcessLookupError, PermissionError):
+            pass  # Terminó justo ahora
+
+    async def _run(self, job, instance, algorithm, params, seed):
+        deadline_at = time.time() + job.deadline
+        while True:
+            job.executor = self.executor
+            future = job.executor.submit(_solve_job, job.id, instance, algorithm, params, seed,
+                                         deadline_at, self.progress_queue)
+            result = asyncio.wrap_future(future)
+            try:
+                timeout = max(deadline_at + self.deadline_grace - time.time(), 0.0)
+                job.result = await asyncio.wait_for(asyncio.shield(result), timeout)
+                job.status = "done"
+                self.stats["completed"] += 1
+            except asyncio.TimeoutError:
+                # El worker no respetó el plazo: se entrega lo mejor reportado y se libera
+                # su lugar. Si seguía en la cola basta con cancelarlo; si ya se despachó
+                # pero aún no reporta su PID, se lo mata al reportarlo (_on_progress)
+                if not future.cancel():
+                    result.add_done_callback(lambda f: f.cancelled() or f.exception())  # Nadie la espera ya
+                    if job.pid is not None:
+                        self._kill_worker(job)
+                job.status = "timeout"
+                job.result = dict(job.events[-1], partial=True) if job.events else None
+                self.stats["timeouts"] += 1
+            except (BrokenProcessPool, asyncio.CancelledError):
+                # Se reemplazó el pool por otro trabajo vencido: reintentar en el nuevo
+                if not (future.done() and (future.cancelled()
+                                           or isinstance(future.exception(), BrokenProcessPool))):
+                    raise
+                job.pid = None
+                self.stats["retries"] += 1
+                continue
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                self.stats["failed"] += 1
+            break
+        job.finished = time.time()
+        job.notify()
+        self._evict()
+
+    async def wait(self, job):
+        while not job.done():
+            await job.changed.wait()
+        return job
+
+    def health(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {**self.stats, "jobs": counts}
+
+    # --- HTTP ---
+    async def handle(self, reader, writer):
+        try:
+            request = await _read_request(reader)
+            if request is None:
+                return
+            method, path, body = request
+            parts = [p for p in urlparse(path).path.split("/") if p]
+
+            if method == "POST" and parts == ["jobs"]:
+                try:
+                    data = json.loads(body or b"{}")
+                    if not isinstance(data, dict):
+                        raise ValueError("El cuerpo debe ser un objeto JSON")
+                    job, cached = self.submit(data)
+                except json.JSONDecodeError as e:
+                    return await _send_json(writer, 400, {"error": f"JSON inválido: {e}"})
+                except (KeyError, ValueError, TypeError) as e:
+                    return await _send_json(writer, 400, {"error": str(e)})
+                if data.get("wait"):
+                    await self.wait(job)
+                    return await _send_json(writer, 200, dict(job.to_dict(), cached=cached))
+                return await _send_json(writer, 202, {"job_id": job.id, "status": job.status, "cached": cached})
+
+            if method == "GET" and parts == ["health"]:
+                return await _send_json(writer, 200, self.health())
+
+            job = self.jobs.get(parts[1]) if len(parts) >= 2 and parts[0] == "jobs" else None
+            if method == "GET" and job is not None and len(parts) == 2:
+                return await _send_json(writer, 200, job.to_dict())
+            if method == "GET" and job is not None and parts[2:] == ["events"]:
+                return await self._stream_events(writer, job)
+
+            await _send_json(writer, 404, {"error": f"Ruta no encontrada: {method} {path}"})
+        except Exception as e:
+            await _send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            writer.close()
+
+    async def _stream_events(self, writer, job):
+        """Progreso como NDJSON con Transfer-Encoding: chunked hasta que el trabajo termina."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        sent = 0
+        while True:
+            changed = job.changed
+            for event in job.events[sent:]:
+                _write_chunk(writer, json.dumps(to_json(event)).encode() + b"\n")
+            sent = len(job.events)
+            if job.done():
+                _write_chunk(writer, json.dumps(job.to_dict()).encode() + b"\n")
+                break
+            await writer.drain()
+            await changed.wait()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    method, path, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, value = header.decode("latin-1").split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return method, path, body
+
+
+async def _send_json(writer, status, payload):
+    body = json.dumps(to_json(payload)).encode()
+    writer.write(f"HTTP/1.1 {status} {HTTP_STATUS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+
+
+def _write_chunk(writer, data):
+    writer.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+
+
+async def start_service(host="127.0.0.1", port=8765, **service_kwargs):
+    """Levanta el servicio en el event loop actual. Retorna (servicio, servidor asyncio)."""
+    service = SolverService(**service_kwargs)
+    service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    return service, server
+
+
+# ============================================================================
+# PRUEBA DE CARGA
+# ============================================================================
+
+async def http_request(host, port, method, path, payload=None):
+    """Cliente mínimo: una solicitud por conexión. Retorna (status, JSON)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, data = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(data) if data else None
+
+
+async def load_test(host, port, n_requests=200, concurrency=20, n_distinct=10, algorithm="LS",
+                    params=None, deadline=30.0, instance_params=None, seed=0):
+    """
+    Envía 'n_requests' solicitudes (wait=true) con 'concurrency' clientes simultáneos
+    sobre 'n_distinct' instancias distintas (el resto son repeticiones que deben
+    resolverse por deduplicación o caché). Retorna throughput y latencias.
+    """
+    instance_params = instance_params or {"n_people": 20, "n_projects": 3, "n_skills": 2}
+    params = params if params is not None else {"max_iterations": 500}
+    instances = [instance_to_json(create_mtfp_problem(**instance_params, seed=seed + i)[0])
+                 for i in range(n_distinct)]
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(n_distinct, size=n_requests)
+
+    latencies, statuses, cached = [], [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        nonlocal cached
+        payload = {"instance": instances[picks[i]], "algorithm": algorithm, "params": params,
+                   "seed": 42, "deadline": deadline, "wait": True}
+        async with semaphore:
+            start = time.perf_counter()
+            status, data = await http_request(host, port, "POST", "/jobs", payload)
+            latencies.append(time.perf_counter() - start)
+        statuses.append(data["status"] if status == 200 else f"http_{status}")
+        cached += bool(data.get("cached")) if status == 200 else 0
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    wall = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    return {
+        "requests": n_requests,
+        "concurrency": concurrency,
+        "distinct_instances": n_distinct,
+        "wall_time": wall,
+        "throughput_rps": n_requests / wall,
+        "latency_p50": float(np.percentile(latencies, 50)),
+        "latency_p95": float(np.percentile(latencies, 95)),
+        "latency_p99": float(np.percentile(latencies, 99)),
+        "latency_max": float(latencies.max()),
+        "cached_responses": cached,
+        "statuses": {s: statuses.count(s) for s in set(statuses)},
+    }
+
+
+async def _serve(args):
+    service, server = await start_service(args.host, args.port, n_workers=args.workers,
+                                          cache_size=args.cache_size, default_deadline=args.deadline)
+    print(f"🚀 Servicio MTFP en http://{args.host}:{args.port} ({service.executor._max_workers} workers)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+async def _load_test(args):
+    service = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port
+    else:
+        # Servicio propio en un puerto libre del mismo proceso
+        service, server = await start_service(args.host, 0, n_workers=args.workers, cache_size=args.cache_size)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    try:
+        report = await load_test(host, port, args.requests, args.concurrency, args.distinct,
+                                 algorithm=args.algorithm, params={"max_iterations": args.iterations},
+                                 deadline=args.deadline,
+                                 instance_params={"n_people": args.n_people, "n_projects": args.n_projects,
+                                                  "n_skills": args.n_skills})
+        if service is not None:
+            report["service"] = service.health()
+    finally:
+        if service is not None:
+            server.close()
+            service.close()
+
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de solvers MTFP")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=None)
+    serve.add_argument("--cache-size", type=int, default=1000)
+    serve.add_argument("--deadline", type=float, default=60.0, help="Plazo por defecto (s)")
+
+    load = sub.add_parser("loadtest")
+    load.add_argument("--url", default=None, help="Servicio ya levantado; si no, se levanta uno local")
+    load.add_argument("--host", default="127.0.0.1")
+    load.add_argument("--workers", type=int, default=None)
+    load.add_argument("--cache-size", type=int, default=1000)
+    load.add_argument("--requests", type=int, default=200)
+    load.add_argument("--concurrency", type=int, default=20)
+    load.add_argument("--distinct", type=int, default=10)
+    load.add_argument("--algorithm", choices=sorted(SERVICE_SOLVERS), default="LS")
+    load.add_argument("--iterations", type=int, default=500)
+    load.add_argument("--deadline", type=float, default=30.0)
+    load.add_argument("--n-people", type=int, default=20)
+    load.add_argument("--n-projects", type=int, default=3)
+    load.add_argument("--n-skills", type=int, default=2)
+
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args) if args.command == "serve" else _load_test(args))
+    except KeyboardInterrupt:
+        sys.exit(0)
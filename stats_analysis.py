@@ -1,8 +1,14 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import shapiro, wilcoxon
+from scipy.stats import shapiro, wilcoxon, friedmanchisquare, rankdata, studentized_range
 import glob
 import os
+import time
+import pickle
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
 
 NAME_MAPPING = {
     "Variable Neighborhood Search": "VNS",
@@ -14,7 +20,7 @@ NAME_MAPPING = {
     "Greedy": "Greedy"
 }
 
-def normalize_deterministic_algorithms(df):
+def normalize_deterministic_algorithms(df, verbose=True):
     """
     Normaliza algoritmos deterministas (como Greedy) que solo tienen 1 ejecución.
     Replica su resultado para todas las semillas presentes en el experimento.
@@ -35,7 +41,7 @@ def normalize_deterministic_algorithms(df):
         # Si es Greedy o determinista (ej. 1 sola fila, o todas iguales)
         # Asumimos que si tiene menos del 50% de las semillas, es un baseline determinista
         if len(algo_data) < len(all_seeds) * 0.5:
-            print(f"   ℹ️  Normalizando '{algo}': Replicando valor único para {len(all_seeds)} semillas.")
+            if verbose: print(f"   ℹ️  Normalizando '{algo}': Replicando valor único para {len(all_seeds)} semillas.")
             
             # Tomamos el valor de eficiencia (asumimos que es el primero)
             base_eff = algo_data.iloc[0]['Efficiency']
@@ -60,6 +66,17 @@ def normalize_deterministic_algorithms(df):
     
     return df
 
+def wilcoxon_greater(a, b):
+    """
+    p-value del test de Wilcoxon pareado H1: a > b.
+    Si las muestras son idénticas (o todas las diferencias son cero) retorna 1.0.
+    """
+    try:
+        return float(wilcoxon(a, b, alternative='greater')[1])
+    except ValueError:
+        return 1.0
+
+
 def analyze_statistical_significance(file_path):
     print(f"\n{'='*80}")
     print(f"📊 ANALIZANDO ARCHIVO: {os.path.basename(file_path)}")
@@ -172,10 +189,237 @@ def analyze_statistical_significance(file_path):
         print(r"    \end{tabular}")
         print(r"\end{table}")
 
+# ============================================================================
+# MOTOR DE ANÁLISIS: muchos archivos en paralelo, con caché y reporte consolidado
+# ============================================================================
+
+CACHE_DIR = os.path.join("results", ".cache", "stats")
+
+
+def file_hash(file_path):
+    """Huella del contenido del archivo (la caché se invalida si cambia el CSV)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_pivot(file_path, cache_dir=CACHE_DIR):
+    """
+    Tabla Seed x Algorithm (Efficiency) ya normalizada y sin semillas incompletas.
+    Se guarda en 'cache_dir' con la huella del archivo como clave.
+    """
+    key = file_hash(file_path)
+    cache_path = os.path.join(cache_dir, f"{key}.pkl") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+
+    df = normalize_deterministic_algorithms(pd.read_csv(file_path), verbose=False)
+    pivot = df.pivot_table(index='Seed', columns='Algorithm', values='Efficiency', aggfunc='first').dropna()
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(pivot, f)
+        os.replace(tmp_path, cache_path)
+    return pivot
+
+
+def nemenyi_critical_difference(k, n, alpha=0.05):
+    """Diferencia crítica de rangos medios de Nemenyi (k algoritmos, n bloques)."""
+    q_alpha = studentized_range.ppf(1 - alpha, k, np.inf) / np.sqrt(2)
+    return float(q_alpha * np.sqrt(k * (k + 1) / (6.0 * n)))
+
+
+def holm_correction(p_values):
+    """p-values ajustados de Holm-Bonferroni (mismo orden que la entrada)."""
+    p = np.asarray(p_values, dtype=float)
+    m = len(p)
+    order = np.argsort(p)
+    adjusted = np.empty(m)
+    adjusted[order] = np.minimum(1.0, np.maximum.accumulate((m - np.arange(m)) * p[order]))
+    return adjusted
+
+
+def analyze_file(file_path, cache_dir=CACHE_DIR, alpha=0.05):
+    """
+    Estadística de un archivo *_raw.csv: medias, rangos medios, Friedman, diferencia
+    crítica de Nemenyi y Wilcoxon de todos los pares (con corrección de Holm).
+    """
+    pivot = load_pivot(file_path, cache_dir)
+    algorithms = pivot.columns.tolist()
+    values = pivot.values
+    n, k = values.shape
+
+    # Rango 1 = mayor eficiencia
+    ranks = np.apply_along_axis(lambda row: rankdata(-row), 1, values).mean(axis=0) if n else np.full(k, np.nan)
+    try:
+        friedman_p = float(friedmanchisquare(*values.T)[1]) if k >= 3 and n >= 2 else np.nan
+    except ValueError:
+        friedman_p = 1.0
+
+    pairs = []
+    for a, b in combinations(range(k), 2):
+        pairs.append({
+            "Algorithm_A": algorithms[a],
+            "Algorithm_B": algorithms[b],
+            "p_A_greater": wilcoxon_greater(values[:, a], values[:, b]),
+            "p_B_greater": wilcoxon_greater(values[:, b], values[:, a])
+        })
+    if pairs:
+        # Dos hipótesis unilaterales por par: Holm sobre el total
+        adjusted = holm_correction([p[key] for p in pairs for key in ("p_A_greater", "p_B_greater")])
+        for i, p in enumerate(pairs):
+            p["p_A_greater_holm"], p["p_B_greater_holm"] = adjusted[2 * i], adjusted[2 * i + 1]
+
+    return {
+        "file": os.path.basename(file_path),
+        "instance": os.path.basename(file_path).replace("_raw.csv", ""),
+        "algorithms": algorithms,
+        "values": values,
+        "mean_rank": ranks,
+        "friedman_p": friedman_p,
+        "nemenyi_cd": nemenyi_critical_difference(k, n, alpha) if k >= 2 and n else np.nan,
+        "pairs": pairs
+    }
+
+
+def bootstrap_mean_ci(columns, n_boot=2000, confidence=0.95, seed=0, chunk=256):
+    """
+    Intervalos bootstrap (percentil) de la media para muchas muestras a la vez.
+    columns: lista de arrays 1D (longitudes distintas). Retorna (low, high) por muestra.
+    Todas las muestras se remuestrean juntas sobre una matriz con relleno NaN.
+    """
+    rng = np.random.default_rng(seed)
+    lengths = np.array([len(c) for c in columns])
+    n_max = int(lengths.max()) if len(columns) else 0
+    data = np.full((n_max, len(columns)), np.nan)
+    for j, c in enumerate(columns):
+        data[:len(c), j] = c
+
+    low = np.empty(len(columns))
+    high = np.empty(len(columns))
+    q = [(1 - confidence) / 2 * 100, (1 + confidence) / 2 * 100]
+    for start in range(0, len(columns), chunk):
+        cols = np.arange(start, min(start + chunk, len(columns)))
+        n_cols = lengths[cols]
+        # Índices uniformes en [0, n_j) para cada columna: (n_boot, n_max, c)
+        idx = (rng.random((n_boot, n_max, len(cols))) * n_cols).astype(int)
+        samples = data[idx, cols]
+        # Solo las primeras n_j filas de cada columna forman parte del remuestreo
+        mask = np.arange(n_max)[:, None] < n_cols[None, :]
+        means = np.where(mask, samples, 0.0).sum(axis=1) / np.maximum(n_cols, 1)
+        low[cols], high[cols] = np.percentile(means, q, axis=0)
+    return low, high
+
+
+def analyze_all(files, n_workers=None, cache_dir=CACHE_DIR, alpha=0.05, n_boot=2000, seed=0):
+    """
+    Analiza todos los archivos en paralelo y consolida. Retorna (summary, pairwise):
+    summary con una fila por (instancia, algoritmo) y pairwise con todos los pares.
+    """
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        analyses = list(executor.map(analyze_file, files, [cache_dir] * len(files), [alpha] * len(files)))
+
+    columns, rows, pair_rows = [], [], []
+    for a in analyses:
+        best = a["algorithms"][int(np.argmin(a["mean_rank"]))] if a["algorithms"] else None
+        pairs_by_name = {(p["Algorithm_A"], p["Algorithm_B"]): p for p in a["pairs"]}
+        for j, algo in enumerate(a["algorithms"]):
+            data = a["values"][:, j]
+            columns.append(data)
+            # ¿El mejor (por rango) domina significativamente a este algoritmo?
+            if algo == best:
+                p_vs_best = np.nan
+            elif (best, algo) in pairs_by_name:
+                p_vs_best = pairs_by_name[(best, algo)]["p_A_greater_holm"]
+            else:
+                p_vs_best = pairs_by_name[(algo, best)]["p_B_greater_holm"]
+            rows.append({
+                "Instance": a["instance"],
+                "Algorithm": algo,
+                "N": len(data),
+                "Mean_Eff": data.mean() if len(data) else np.nan,
+                "Std_Eff": data.std(ddof=1) if len(data) > 1 else np.nan,
+                "Mean_Rank": a["mean_rank"][j],
+                "Friedman_p": a["friedman_p"],
+                "Nemenyi_CD": a["nemenyi_cd"],
+                "Best": algo == best,
+                "p_vs_Best_Holm": p_vs_best,
+                # Nemenyi: diferencia de rango medio frente al mejor mayor que la CD
+                "Nemenyi_Worse": bool(a["mean_rank"][j] - a["mean_rank"].min() > a["nemenyi_cd"])
+            })
+        for p in a["pairs"]:
+            pair_rows.append({"Instance": a["instance"], **p})
+
+    summary = pd.DataFrame(rows)
+    if len(columns):
+        summary["CI_Low"], summary["CI_High"] = bootstrap_mean_ci(columns, n_boot=n_boot, seed=seed)
+    return summary, pd.DataFrame(pair_rows)
+
+
+def summary_to_latex(summary, alpha=0.05):
+    """Tabla LaTeX consolidada: media (IC bootstrap) y rango medio por instancia y algoritmo."""
+    lines = [
+        r"\begin{table}[htbp]",
+        r"    \caption{Mean efficiency (bootstrap 95\% CI) and Friedman mean rank. Bold: best mean rank;"
+        r" $^\dagger$: significantly worse than the best (Wilcoxon, Holm-corrected).}",
+        r"    \label{tab:consolidated_results}",
+        r"    \centering",
+        r"    \begin{tabular}{llccc}",
+        r"        \toprule",
+        r"        \textbf{Instance} & \textbf{Algorithm} & \textbf{Mean (CI)} & \textbf{Rank} & \textbf{Friedman $p$} \\",
+        r"        \midrule",
+    ]
+    for instance, group in summary.groupby("Instance", sort=False):
+        for i, r in enumerate(group.sort_values("Mean_Rank").itertuples()):
+            name = NAME_MAPPING.get(r.Algorithm, r.Algorithm)
+            cell = f"{r.Mean_Eff:.4f} ({r.CI_Low:.4f}--{r.CI_High:.4f})"
+            if r.Best:
+                cell = f"\\textbf{{{cell}}}"
+            elif r.p_vs_Best_Holm < alpha:
+                cell += r"$^\dagger$"
+            inst = instance.replace("_", r"\_") if i == 0 else ""
+            fp = ("< 0.001" if r.Friedman_p < 0.001 else f"{r.Friedman_p:.3f}") if i == 0 and not np.isnan(r.Friedman_p) else ""
+            lines.append(f"        {inst} & {name} & {cell} & {r.Mean_Rank:.2f} & {fp} \\\\")
+        lines.append(r"        \midrule")
+    lines[-1] = r"        \bottomrule"
+    lines += [r"    \end{tabular}", r"\end{table}"]
+    return "\n".join(lines)
+
+
 if __name__ == "__main__":
-    raw_files = glob.glob("results/*_raw.csv")
+    parser = argparse.ArgumentParser(description="Análisis estadístico de los resultados *_raw.csv")
+    parser.add_argument("--pattern", default="results/*_raw.csv")
+    parser.add_argument("--per-file", action="store_true", help="Reporte detallado archivo por archivo (serial)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bootstrap", type=int, default=2000)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--output", default=os.path.join("results", "stats_consolidated"),
+                        help="Prefijo de los archivos del reporte (.csv, _pairwise.csv, .tex)")
+    args = parser.parse_args()
+
+    raw_files = sorted(glob.glob(args.pattern))
     if not raw_files:
         print("❌ No se encontraron archivos.")
-    else:
+    elif args.per_file:
         for f in raw_files:
-            analyze_statistical_significance(f)
\ No newline at end of file
+            analyze_statistical_significance(f)
+    else:
+        start = time.time()
+        summary, pairwise = analyze_all(raw_files, n_workers=args.workers, alpha=args.alpha,
+                                        cache_dir=None if args.no_cache else CACHE_DIR, n_boot=args.bootstrap)
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        summary.to_csv(f"{args.output}.csv", index=False)
+        pairwise.to_csv(f"{args.output}_pairwise.csv", index=False)
+        with open(f"{args.output}.tex", "w") as f:
+            f.write(summary_to_latex(summary, args.alpha) + "\n")
+
+        print(summary[["Instance", "Algorithm", "Mean_Eff", "CI_Low", "CI_High", "Mean_Rank", "p_vs_Best_Holm"]]
+              .to_string(index=False))
+        print(f"\n✅ {len(raw_files)} archivos analizados en {time.time() - start:.2f}s. "
+              f"Reporte: {args.output}.csv / .tex")
@@ -0,0 +1,106 @@
+"""Tests del benchmark distribuido: clave obligatoria, workers locales y reconexión."""
+import os
+import sys
+import time
+import signal
+import socket
+import threading
+import subprocess
+import multiprocessing
+from multiprocessing.connection import Client, AuthenticationError
+
+import pytest
+
+from run import EXPERIMENTS
+from distributed import Coordinator, run_worker, _start_workers, is_loopback
+
+BASE_CASE = [exp for exp in EXPERIMENTS if exp["name"] == "BASE_CASE"]
+AUTHKEY = os.urandom(16).hex().encode()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _coordinator_process(port, authkey, results_path, n_runs):
+    Coordinator(BASE_CASE, n_runs=n_runs, budget_nfe=500, port=port, authkey=authkey,
+                results_path=results_path, verbose=False).run(finalize=False)
+
+
+def _connect_with_wrong_key(host, port, outcome):
+    try:
+        Client((host, port), authkey=b"otra-clave")
+    except AuthenticationError:
+        outcome.append("rechazado")
+
+
+def test_authkey_is_mandatory():
+    with pytest.raises(ValueError):
+        Coordinator(BASE_CASE, n_runs=1, budget_nfe=500, port=0, authkey=None, verbose=False)
+    with pytest.raises(ValueError):
+        run_worker("127.0.0.1", 1, authkey=b"")
+
+    assert is_loopback("127.0.0.1") and is_loopback("localhost")
+    assert not is_loopback("0.0.0.0")
+    env = {k: v for k, v in os.environ.items() if k != "MTFP_AUTHKEY"}
+    cli = [sys.executable, "distributed.py"]
+    refused = subprocess.run(cli + ["coordinator", "--host", "0.0.0.0"], capture_output=True, text=True, env=env)
+    assert refused.returncode != 0 and "--authkey" in refused.stderr
+    refused = subprocess.run(cli + ["worker"], capture_output=True, text=True, env=env)
+    assert refused.returncode != 0 and "--authkey" in refused.stderr
+
+
+def test_coordinator_with_local_worker_processes():
+    coordinator = Coordinator(BASE_CASE, n_runs=2, budget_nfe=500, port=0, authkey=AUTHKEY,
+                              lease_timeout=30.0, verbose=False)
+    host, port = coordinator.address
+    workers = _start_workers(3, host, port, AUTHKEY, heartbeat_interval=1.0, verbose=False)
+    # Una clave incorrecta no debe tumbar el bucle de aceptación del coordinador
+    rejected = []
+    intruder = threading.Thread(target=_connect_with_wrong_key, args=(host, port, rejected))
+    intruder.start()
+    grouped = coordinator.run(finalize=False)
+    intruder.join()
+    for w in workers:
+        w.join(timeout=60)
+
+    assert rejected == ["rechazado"]
+    assert all(w.exitcode == 0 for w in workers)
+    assert coordinator.remaining() == 0
+    assert len(grouped["BASE_CASE"]) == len(coordinator.tasks) == 12
+    assert coordinator.stats["workers"] == 3
+    assert coordinator.stats["dispatched"] >= len(coordinator.tasks)
+    assert all(r.feasible for r in grouped["BASE_CASE"] if r.method != "Random Search")
+
+
+def test_workers_reconnect_after_coordinator_restart(tmp_path):
+    port = free_port()
+    results_path = str(tmp_path / "results.pkl")
+    ctx = multiprocessing.get_context("spawn")
+    first = ctx.Process(target=_coordinator_process, args=(port, AUTHKEY, results_path, 4))
+    first.start()
+    workers = _start_workers(2, "127.0.0.1", port, AUTHKEY, heartbeat_interval=1.0,
+                             retry_seconds=60.0, verbose=False)
+
+    # Matar al coordinador a mitad del benchmark
+    start = time.time()
+    while not (os.path.exists(results_path) and os.path.getsize(results_path) > 0):
+        assert time.time() - start < 120, "El primer coordinador no registró resultados"
+        time.sleep(0.1)
+    os.kill(first.pid, signal.SIGKILL)
+    first.join()
+
+    # El coordinador relanzado retoma el registro y los mismos workers terminan el resto
+    second = Coordinator(BASE_CASE, n_runs=4, budget_nfe=500, port=port, authkey=AUTHKEY,
+                         results_path=results_path, verbose=False)
+    resumed = len(second.results)
+    assert 0 < resumed < len(second.tasks)
+    grouped = second.run(finalize=False)
+    for w in workers:
+        w.join(timeout=60)
+
+    assert all(w.exitcode == 0 for w in workers)
+    assert len(grouped["BASE_CASE"]) == len(second.tasks) == 24
+    assert second.stats["workers"] >= 2  # Reconectados
@@ -0,0 +1,109 @@
+"""Tests del servicio HTTP/JSON: errores de entrada, caché, plazos y carga."""
+import asyncio
+
+import pytest
+
+from Algorithm.MTFP import create_mtfp_problem
+from solver_service import start_service, http_request, load_test, instance_to_json
+
+
+def run_with_service(scenario, **service_kwargs):
+    """Levanta el servicio en un puerto libre, corre 'scenario(service, host, port)' y lo apaga."""
+    async def main():
+        service, server = await start_service("127.0.0.1", 0, **service_kwargs)
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            return await scenario(service, host, port)
+        finally:
+            server.close()
+            service.close()
+    return asyncio.run(main())
+
+
+async def raw_post(host, port, body):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"POST /jobs HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+def job_payload(seed=0, n_people=20, **overrides):
+    instance = instance_to_json(create_mtfp_problem(n_people=n_people, n_projects=3, n_skills=2, seed=seed)[0])
+    return {"instance": instance, "algorithm": "LS", "params": {"max_iterations": 100},
+            "seed": 42, "deadline": 30, "wait": True, **overrides}
+
+
+def test_malformed_requests_get_400():
+    async def scenario(service, host, port):
+        assert await raw_post(host, port, b"{not json") == 400
+        assert await raw_post(host, port, b"\xff\xfe") == 400
+        assert await raw_post(host, port, b"[1, 2]") == 400
+        status, _ = await http_request(host, port, "POST", "/jobs", {"algorithm": "LS"})
+        assert status == 400
+        status, _ = await http_request(host, port, "POST", "/jobs", job_payload(algorithm="Nope"))
+        assert status == 400
+        status, health = await http_request(host, port, "GET", "/health")
+        assert status == 200 and health["submitted"] == 0
+
+    run_with_service(scenario, n_workers=1)
+
+
+def test_load_test_deduplicates_and_completes_every_request():
+    async def scenario(service, host, port):
+        return await load_test(host, port, n_requests=24, concurrency=8, n_distinct=3,
+                               params={"max_iterations": 100}, deadline=30.0), service.health()
+
+    report, health = run_with_service(scenario, n_workers=2)
+    assert report["statuses"] == {"done": 24}
+    assert health["submitted"] == 24
+    assert health["completed"] == 3  # Una corrida por instancia distinta
+    assert health["deduplicated"] + health["cache_hits"] == 21
+    assert report["latency_max"] < 30
+
+
+def test_eviction_keeps_running_jobs_and_drops_old_results():
+    async def scenario(service, host, port):
+        # Trabajo largo en curso mientras se llena la caché
+        _, running = await http_request(host, port, "POST", "/jobs",
+                                        job_payload(seed=100, params={"max_iterations": 10 ** 7},
+                                                    deadline=20, wait=False))
+        for seed in range(4):
+            status, data = await http_request(host, port, "POST", "/jobs", job_payload(seed=seed))
+            assert status == 200 and data["status"] == "done"
+        assert running["job_id"] in service.jobs and not service.jobs[running["job_id"]].done()
+        assert len(service.jobs) <= 2 + 1
+        assert set(service.by_key.values()) <= set(service.jobs)
+        # Un resultado descartado se vuelve a calcular
+        status, data = await http_request(host, port, "POST", "/jobs", job_payload(seed=0))
+        assert status == 200 and not data["cached"]
+
+    run_with_service(scenario, n_workers=2, cache_size=2)
+
+
+def test_overdue_worker_is_killed_and_the_pool_keeps_serving():
+    async def scenario(service, host, port):
+        # Trabajo vecino en el mismo pool: se reintenta en el pool nuevo
+        _, neighbour = await http_request(host, port, "POST", "/jobs",
+                                          job_payload(seed=3, algorithm="Random", params={"budget_nfe": 10 ** 9},
+                                                      deadline=8, wait=False))
+        # Instancia grande: recibirla y construirla ya excede el plazo (el solver no alcanza a revisarlo)
+        status, data = await http_request(host, port, "POST", "/jobs", job_payload(seed=1, n_people=1200,
+                                                                                   deadline=0))
+        assert status == 200 and data["status"] == "timeout"
+        # El worker se mata apenas reporta su PID (puede ser después de responder)
+        for _ in range(100):
+            if service.stats["killed_workers"]:
+                break
+            await asyncio.sleep(0.1)
+        assert service.stats["killed_workers"] == 1
+        status, data = await http_request(host, port, "POST", "/jobs", job_payload(seed=2))
+        assert status == 200 and data["status"] == "done" and data["result"]["feasible"]
+
+        job = await service.wait(service.jobs[neighbour["job_id"]])
+        assert job.status == "done" and job.result["feasible"]
+        assert service.stats["retries"] >= 1
+
+    run_with_service(scenario, n_workers=2, deadline_grace=0.05)
@@ -0,0 +1,254 @@
+"""
+Ajuste de parámetros por carreras (F-race / iterated racing) sobre el benchmark.
+
+Uso:
+    python tune_parameters.py --algorithm Tabu
+    python tune_parameters.py --algorithm GA --budget 20000 --max-blocks 30 --iterations 3
+
+Cada configuración candidata se evalúa bloque a bloque (un bloque = instancia + semilla,
+la misma para todas las configuraciones vivas, como en run_parallel_benchmark). Tras
+'min_blocks' bloques, en cada paso:
+
+1. Test de Friedman sobre la matriz bloques x configuraciones vivas (si quedan >= 3).
+2. Si es significativo (o si quedan 2), Wilcoxon pareado de la mejor (rango medio)
+   contra cada una; las que pierden con p < alpha se eliminan.
+
+Las evaluaciones corren en un pool de procesos con execute_algorithm_task. Al final
+se reporta el cómputo ahorrado frente a la evaluación factorial completa
+(todas las configuraciones x todos los bloques). Resultados en results/tuning/.
+"""
+import os
+import time
+import json
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import friedmanchisquare, rankdata
+
+from Algorithm.MTFP import create_mtfp_problem
+from run import execute_algorithm_task, generate_reproducible_seeds
+from stats_analysis import wilcoxon_greater
+
+
+# Valores candidatos por algoritmo (el resto de los parámetros se deriva del presupuesto)
+SEARCH_SPACES = {
+    "Tabu": {"candidates": [10, 20, 40, 80], "tabu_size": [None, 2, 5, 10, 20]},
+    "VNS": {"ls_iter": [10, 25, 50, 100, 200]},
+    "GA": {"pop_size": [50, 100, 200], "crossover_prob": [0.7, 0.9], "mutation_prob": [0.1, 0.2, 0.4]},
+    "HillClimbing": {"sample_size": [10, 20, 40, 80]},
+    "GRASP": {"alpha": [0.1, 0.3, 0.5], "ls_iter": [0, 100, 500]},
+}
+
+
+def build_task_params(algo_type, config, budget_nfe):
+    """Parámetros completos para execute_algorithm_task con el mismo presupuesto NFE."""
+    params = dict(config)
+    if algo_type == "Tabu":
+        params["iter"] = max(1, budget_nfe // params["candidates"])
+    elif algo_type == "VNS":
+        params["iter"] = max(1, budget_nfe // params["ls_iter"])
+    elif algo_type == "GA":
+        params["n_gen"] = max(1, budget_nfe // params["pop_size"])
+    elif algo_type == "HillClimbing":
+        params["iter"] = max(1, budget_nfe // params["sample_size"])
+    elif algo_type == "GRASP":
+        params["constructions"] = max(1, budget_nfe // (1 + params["ls_iter"]))
+    elif algo_type == "LS":
+        params["iter"] = budget_nfe
+    return params
+
+
+def full_grid(space):
+    """Todas las combinaciones del espacio de búsqueda."""
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def config_label(config):
+    return ", ".join(f"{k}={v}" for k, v in sorted(config.items()))
+
+
+def _evaluate(task):
+    """Trabajador: (configuración, bloque) -> (configuración, bloque, eficiencia, tiempo)."""
+    config_id, block_id, algo_type, problem, seed, params = task
+    result = execute_algorithm_task((algo_type, problem, seed, block_id, params))
+    if result is None:
+        return config_id, block_id, -np.inf, 0.0
+    return config_id, block_id, float(np.asarray(result["F"]).item()), result["execution_time"]
+
+
+def race(algo_type, configs, blocks, budget_nfe, executor, min_blocks=5, alpha=0.05, verbose=True):
+    """
+    F-race de 'configs' sobre 'blocks' [(problema, semilla), ...].
+    Retorna (ids vivos ordenados por rango, DataFrame de evaluaciones).
+    """
+    n_configs = len(configs)
+    alive = list(range(n_configs))
+    scores = np.full((len(blocks), n_configs), np.nan)
+    times = np.zeros((len(blocks), n_configs))
+    params = [build_task_params(algo_type, c, budget_nfe) for c in configs]
+
+    def run_blocks(block_ids, config_ids):
+        tasks = [(c, b, algo_type, blocks[b][0], blocks[b][1], params[c]) for b in block_ids for c in config_ids]
+        for c, b, eff, elapsed in executor.map(_evaluate, tasks):
+            scores[b, c], times[b, c] = eff, elapsed
+
+    # Los primeros bloques se lanzan juntos: no se elimina nada antes de min_blocks
+    first = min(min_blocks, len(blocks))
+    run_blocks(range(first), alive)
+    n_done = first
+
+    while True:
+        data = scores[:n_done][:, alive]
+        if len(alive) > 1:
+            # Rango 1 = mayor eficiencia (maximización)
+            ranks = np.apply_along_axis(lambda row: rankdata(-row), 1, data).mean(axis=0)
+            best = alive[int(np.argmin(ranks))]
+
+            test_all = len(alive) == 2
+            if len(alive) >= 3:
+                try:
+                    p_friedman = friedmanchisquare(*data.T)[1]
+                except ValueError:
+                    p_friedman = 1.0
+                test_all = p_friedman < alpha
+
+            if test_all:
+                best_data = scores[:n_done, best]
+                dropped = [c for c in alive if c != best and wilcoxon_greater(best_data, scores[:n_done, c]) < alpha]
+                if dropped:
+                    alive = [c for c in alive if c not in dropped]
+                    if verbose:
+                        print(f"[Race] Bloque {n_done}: eliminadas {len(dropped)}, quedan {len(alive)} "
+                              f"(mejor: {config_label(configs[best])})")
+
+        if len(alive) == 1 or n_done == len(blocks):
+            break
+        run_blocks([n_done], alive)
+        n_done += 1
+
+    final = scores[:n_done][:, alive]
+    order = np.argsort(np.apply_along_axis(lambda row: rankdata(-row), 1, final).mean(axis=0))
+    alive = [alive[i] for i in order]
+
+    rows = [{"Config": c, "Label": config_label(configs[c]), "Block": b,
+             "Efficiency": scores[b, c], "Time": times[b, c]}
+            for b in range(n_done) for c in range(n_configs) if not np.isnan(scores[b, c])]
+    return alive, pd.DataFrame(rows)
+
+
+def _neighbours(config, space, rng, n):
+    """Configuraciones nuevas moviendo un parámetro de 'config' a un valor vecino de la grilla."""
+    out = []
+    names = [k for k in sorted(space) if len(space[k]) > 1]
+    for _ in range(n):
+        new = dict(config)
+        name = names[rng.integers(len(names))]
+        values = space[name]
+        i = values.index(new[name])
+        new[name] = values[int(np.clip(i + rng.choice([-1, 1]), 0, len(values) - 1))]
+        out.append(new)
+    return out
+
+
+def tune(algo_type, problems, budget_nfe=10000, max_blocks=20, min_blocks=5, alpha=0.05,
+         iterations=1, n_initial=None, n_elites=3, n_workers=None, master_seed=42, verbose=True):
+    """
+    Carrera iterada: la primera iteración corre todas las configuraciones (o 'n_initial'
+    muestreadas); las siguientes corren las élites y vecinos de ellas sobre bloques nuevos.
+    Retorna (reporte con la mejor configuración y el cómputo ahorrado, DataFrame de evaluaciones).
+    """
+    if algo_type not in SEARCH_SPACES:
+        raise ValueError(f"Algoritmo no soportado '{algo_type}'. Opciones: {list(SEARCH_SPACES)}")
+    space = SEARCH_SPACES[algo_type]
+    rng = np.random.default_rng(master_seed)
+    n_workers = n_workers or multiprocessing.cpu_count()
+
+    grid = full_grid(space)
+    candidates = grid if n_initial is None or n_initial >= len(grid) else \
+        [grid[i] for i in rng.choice(len(grid), n_initial, replace=False)]
+
+    seeds = generate_reproducible_seeds(master_seed, max_blocks * iterations)
+    all_blocks = [(problems[i % len(problems)], int(s)) for i, s in enumerate(seeds)]
+
+    start_time = time.time()
+    evaluations, full_evaluations, elites = [], 0, []
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        for it in range(iterations):
+            blocks = all_blocks[it * max_blocks:(it + 1) * max_blocks]
+            if verbose:
+                print(f"\n[Race] Iteración {it + 1}/{iterations}: {len(candidates)} configuraciones, "
+                      f"hasta {len(blocks)} bloques")
+            alive, df = race(algo_type, candidates, blocks, budget_nfe, executor, min_blocks, alpha, verbose)
+            df["Iteration"] = it
+            evaluations.append(df)
+            full_evaluations += len(candidates) * len(blocks)
+
+            elites = [candidates[c] for c in alive[:n_elites]]
+            # Siguiente iteración: élites + vecinos (sin duplicados)
+            seen = {config_label(c) for c in elites}
+            candidates = list(elites)
+            for c in _neighbours(elites[0], space, rng, 3 * n_elites):
+                if config_label(c) not in seen:
+                    seen.add(config_label(c))
+                    candidates.append(c)
+
+    df = pd.concat(evaluations, ignore_index=True)
+    used = len(df)
+    # Costo estimado del factorial: tiempo medio por evaluación de cada iteración
+    full_time = sum(d["Time"].mean() * len(d["Config"].unique()) * max_blocks for d in evaluations)
+    report = {
+        "algorithm": algo_type,
+        "best_config": elites[0],
+        "elites": elites,
+        "evaluations": used,
+        "full_factorial_evaluations": full_evaluations,
+        "evaluations_saved": 1 - used / full_evaluations,
+        "cpu_time": float(df["Time"].sum()),
+        "full_factorial_cpu_time_estimate": float(full_time),
+        "wall_time": time.time() - start_time
+    }
+    if verbose:
+        print(f"\n🏆 Mejor configuración ({algo_type}): {config_label(elites[0])}")
+        print(f"   Evaluaciones: {used} de {full_evaluations} del factorial completo "
+              f"({report['evaluations_saved']:.0%} ahorrado)")
+    return report, df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ajuste de parámetros por F-race")
+    parser.add_argument("--algorithm", choices=sorted(SEARCH_SPACES), default="Tabu")
+    parser.add_argument("--budget", type=int, default=10000, help="Presupuesto NFE por ejecución")
+    parser.add_argument("--max-blocks", type=int, default=20, help="Bloques (instancia, semilla) por carrera")
+    parser.add_argument("--min-blocks", type=int, default=5, help="Bloques antes de la primera eliminación")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--n-initial", type=int, default=None, help="Muestrear n configuraciones iniciales")
+    parser.add_argument("--instances", type=int, default=3, help="Instancias distintas (semillas del generador)")
+    parser.add_argument("--n-people", type=int, default=100)
+    parser.add_argument("--n-projects", type=int, default=10)
+    parser.add_argument("--n-skills", type=int, default=10)
+    parser.add_argument("--positive-ratio", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output-dir", default=os.path.join("results", "tuning"))
+    args = parser.parse_args()
+
+    problems = [create_mtfp_problem(n_people=args.n_people, n_projects=args.n_projects, n_skills=args.n_skills,
+                                    positive_ratio=args.positive_ratio, seed=12345 + i)[0]
+                for i in range(args.instances)]
+
+    report, df = tune(args.algorithm, problems, budget_nfe=args.budget, max_blocks=args.max_blocks,
+                      min_blocks=args.min_blocks, alpha=args.alpha, iterations=args.iterations,
+                      n_initial=args.n_initial, n_workers=args.workers)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    base_name = os.path.join(args.output_dir, f"race_{args.algorithm}_P{args.n_people}_Pr{args.n_projects}"
+                                              f"_Sk{args.n_skills}_Pos{args.positive_ratio}")
+    df.to_csv(f"{base_name}_evaluations.csv", index=False)
+    with open(f"{base_name}_report.json", "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Guardado: {base_name}_*")